@@ -0,0 +1,17 @@
+"""Araba öneri sisteminin Streamlit'ten bağımsız hesaplama katmanı."""
+
+from oneri.genisletme import DONANIM_SEVIYELERI, donanim_genislet, temizle
+from oneri.maliyet import isletme_maliyeti_ekle, isletme_maliyeti_hesapla, senaryo_tablosu, yakit_maliyeti_hesapla
+from oneri.indeks import FiltreIndeksi
+from oneri.skor import KRITERLER, agirlik_vektoru, kriter_matrisi, kriter_skorlari_ekle, toplam_skor
+from oneri.siralama import Siralama, en_iyiler, sira_bul
+from oneri.pareto import pareto_cephesi, skyline
+from oneri.benzerlik import BenzerlikIndeksi
+from oneri.katalog import KatalogHatasi, bellek_raporu, csv_oku, kompakt
+from oneri.sahiplik import TcoProjeksiyonu, TcoVarsayimlari
+from oneri.gevsetme import KisitMatrisi
+from oneri.duyarlilik import DuyarlilikAnalizi, agirlik_izgarasi
+from oneri.onbellek import LRUOnbellek
+from oneri.motor import AdayKumesi, OneriMotoru, Sorgu
+from oneri.boru_hatti import Asama, BoruHatti, oneri_hatti
+from oneri.yonetici import KatalogAnligi, KatalogYoneticisi
@@ -0,0 +1,280 @@
+"""Öneri hattının aşama bazında performans ölçümü.
+
+Her katalog boyutu için sentetik bir katalog üretilir ve aşamalar ayrı ayrı
+ölçülür: yükleme (CSV ve ikili), genişletme, indeks, filtreleme, maliyet,
+normalizasyon/skorlama, top-k ve tablo biçimlendirme. Gecikme yüzdelikleri ve
+tepe bellek (tracemalloc) raporlanır, sonuçlar karşılaştırma için JSON olarak saklanır.
+
+    python -m oneri.benchmark --satir 10000 100000 1000000 --cikti bench_sonuclari/yeni.json
+    python -m oneri.benchmark --satir 100000 --karsilastir bench_sonuclari/onceki.json
+
+`--soguk N` yalnızca soğuk başlangıcı ölçer: her tekrar yeni bir Python sürecinde temel
+modüllerin içe aktarılması ve sayfanın ilk rerun'ı (AppTest ile) ayrı ayrı ölçülür.
+
+    python -m oneri.benchmark --soguk 5 --cikti bench_sonuclari/soguk.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from oneri.depo import ikili_oku, ikili_yaz
+from oneri.genisletme import DONANIM_SEVIYELERI, donanim_genislet, temizle
+from oneri.indeks import FiltreIndeksi
+from oneri.katalog import csv_oku, kompakt
+from oneri.maliyet import isletme_maliyeti_ekle
+from oneri.motor import AdayKumesi, Sorgu
+from oneri.sentetik import sentetik_katalog
+from oneri.siralama import Siralama
+from oneri.skor import kriter_matrisi, kriter_skorlari_ekle
+from oneri.tablo import karsilastirma_tablosu
+
+# CSV yüklemesi bu boyuta kadar ölçülür (daha büyük kataloglarda CSV yazmak bile uzun sürer)
+CSV_SATIR_SINIRI = 1_000_000
+
+# Filtreleme ve sonraki aşamalar bu sorgular üzerinde döngüyle ölçülür
+ORNEK_SORGULAR = [
+    Sorgu(butce=3_000_000),
+    Sorgu(butce=2_000_000, kasa_tipi='SUV'),
+    Sorgu(butce=5_000_000, yakit_tipi='Elektrikli', min_guvenlik=4),
+    Sorgu(butce=4_000_000, marka='Toyota', min_beygir_gucu=120),
+    Sorgu(butce=2_500_000, kullanim_amaci='Aile', min_bagaj_hacmi=400, yillik_km=25000),
+]
+
+
+# Soğuk başlangıçta süresi ayrı ölçülen modüller (plotly sayfada ilk grafikte yüklenir)
+SOGUK_MODULLERI = ('numpy', 'pandas', 'streamlit', 'oneri')
+VARSAYILAN_BETIK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit.app.py')
+
+# Yeni süreçte çalıştırılır; ölçümleri tek satır JSON olarak yazdırır
+SOGUK_BETIGI = """
+import importlib, json, logging, sys, time
+logging.disable(logging.WARNING)
+sureler = {}
+for modul in sys.argv[2:]:
+    baslangic = time.perf_counter()
+    importlib.import_module(modul)
+    sureler['import:' + modul] = (time.perf_counter() - baslangic) * 1000
+from streamlit.testing.v1 import AppTest
+from oneri.olcum import soguk_baslangic
+baslangic = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300).run()
+sureler['ilk_rerun'] = (time.perf_counter() - baslangic) * 1000
+sureler.update(soguk_baslangic())
+print(json.dumps(sureler))
+"""
+
+
+def _olc(fonksiyon, tekrar):
+    """Fonksiyonu `tekrar` kez çalıştırıp süreleri (ms) ve son sonucu döndürür."""
+    sureler = []
+    sonuc = None
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        sonuc = fonksiyon()
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+    return sureler, sonuc
+
+
+def _tepe_bellek(fonksiyon):
+    """Fonksiyonun bir çalıştırmasındaki tepe ek bellek (MB)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fonksiyon()
+        _, tepe = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return tepe / 1e6
+
+
+def _ozet(sureler, bellek, satir_giris, satir_cikis):
+    sureler = np.asarray(sureler)
+    return {
+        'tekrar': len(sureler),
+        'ort_ms': float(sureler.mean()),
+        'p50_ms': float(np.percentile(sureler, 50)),
+        'p90_ms': float(np.percentile(sureler, 90)),
+        'p99_ms': float(np.percentile(sureler, 99)),
+        'tepe_bellek_mb': bellek,
+        'satir_giris': int(satir_giris),
+        'satir_cikis': int(satir_cikis),
+    }
+
+
+def asama_olc(fonksiyon, tekrar, satir_giris, bellek=True):
+    sureler, sonuc = _olc(fonksiyon, tekrar)
+    tepe = _tepe_bellek(fonksiyon) if bellek else None
+    return _ozet(sureler, tepe, satir_giris, len(sonuc)), sonuc
+
+
+def _dongu(girdiler, fonksiyon):
+    """Girdiler üzerinde dönerek ölçüm yapan yardımcı; her çağrı bir sonraki girdiyi kullanır."""
+    sayac = iter(range(10 ** 12))
+
+    def calistir():
+        return fonksiyon(girdiler[next(sayac) % len(girdiler)])
+    return calistir
+
+
+def boyut_olc(satir, tekrar, yukleme_tekrari, tohum=0, bellek=True):
+    """Bir katalog boyutu için tüm aşamaları ölçer."""
+    sonuclar = {}
+    katalog = sentetik_katalog(satir, tohum=tohum)
+
+    with tempfile.TemporaryDirectory(prefix='oneri-bench-') as gecici:
+        # load_data: CSV ayrıştırma + doğrulama ve ikili (bellek eşlemeli) açılış
+        if satir <= CSV_SATIR_SINIRI:
+            csv_yolu = os.path.join(gecici, 'katalog.csv')
+            katalog.to_csv(csv_yolu, index=False)
+            sonuclar['yukleme_csv'], _ = asama_olc(lambda: csv_oku(csv_yolu), yukleme_tekrari, satir, bellek)
+        ikili_yolu = os.path.join(gecici, 'katalog.katalog')
+        ikili_yaz(katalog, ikili_yolu)
+        sonuclar['yukleme_ikili'], katalog = asama_olc(lambda: ikili_oku(ikili_yolu), yukleme_tekrari, satir, bellek)
+
+        sonuclar['genisletme'], genis = asama_olc(
+            lambda: kompakt(donanim_genislet(temizle(katalog), DONANIM_SEVIYELERI)), yukleme_tekrari, satir, bellek
+        )
+        sonuclar['indeks'], indeks = asama_olc(lambda: FiltreIndeksi(genis), yukleme_tekrari, len(genis), bellek)
+
+        sonuclar['filtreleme'], _ = asama_olc(
+            _dongu(ORNEK_SORGULAR, lambda sorgu: indeks.filtrele(**sorgu.kisitlar())), tekrar, len(genis), bellek
+        )
+        filtreli = [indeks.filtrele(**sorgu.kisitlar()) for sorgu in ORNEK_SORGULAR]
+        ort_filtreli = int(np.mean([len(df) for df in filtreli]))
+
+        def maliyet(i):
+            sorgu = ORNEK_SORGULAR[i]
+            return isletme_maliyeti_ekle(filtreli[i], sorgu.yillik_km, sorgu.yakit_fiyat, sorgu.elektrik_fiyat)
+        sonuclar['maliyet'], _ = asama_olc(_dongu(range(len(ORNEK_SORGULAR)), maliyet), tekrar, ort_filtreli, bellek)
+        maliyetli = [maliyet(i) for i in range(len(ORNEK_SORGULAR))]
+
+        def skorlama(df):
+            df = kriter_skorlari_ekle(df)
+            return AdayKumesi(df, kriter_matrisi(df))
+        sonuclar['skorlama'], _ = asama_olc(_dongu(maliyetli, lambda df: skorlama(df).df), tekrar, ort_filtreli, bellek)
+        adaylar = [skorlama(df) for df in maliyetli]
+
+        def top_k(i):
+            skorlar = adaylar[i].skorla(ORNEK_SORGULAR[i].agirliklar())
+            return adaylar[i].sirala(skorlar, Siralama(skorlar).ilk(30))
+        sonuclar['top_k'], _ = asama_olc(_dongu(range(len(adaylar)), top_k), tekrar, ort_filtreli, bellek)
+        onerilenler = [top_k(i) for i in range(len(adaylar))]
+
+        sonuclar['tablo'], _ = asama_olc(_dongu(onerilenler, karsilastirma_tablosu), tekrar, 30, bellek)
+    return sonuclar
+
+
+def soguk_baslangic_olc(tekrar, betik=VARSAYILAN_BETIK):
+    """Sayfayı `tekrar` kez yeni bir süreçte açar; ölçüm başına ms cinsinden süre listeleri döner.
+
+    'ilk_rerun_hazir' sürecin başlamasından ilk rerun'ın bitişine kadar geçen süredir
+    (yeni bir işçinin ilk isteğe yanıt verebilmesi); diğerleri bunun parçalarıdır.
+    """
+    olcumler = {}
+    for _ in range(tekrar):
+        sonuc = subprocess.run(
+            [sys.executable, '-c', SOGUK_BETIGI, betik, *SOGUK_MODULLERI],
+            capture_output=True, text=True, check=True
+        )
+        for ad, sure in json.loads(sonuc.stdout.strip().splitlines()[-1]).items():
+            olcumler.setdefault(ad, []).append(sure)
+    return olcumler
+
+
+def soguk_rapor_yaz(olcumler):
+    print(f"\n== Soğuk başlangıç ({len(next(iter(olcumler.values())))} yeni süreç) ==")
+    print(f"{'ölçüm':<24}{'p50 ms':>10}{'maks ms':>10}")
+    for ad, sureler in olcumler.items():
+        print(f"{ad:<24}{np.percentile(sureler, 50):>10.1f}{np.max(sureler):>10.1f}")
+
+
+def ortam():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'makine': platform.machine(),
+        'islemci_sayisi': os.cpu_count(),
+    }
+
+
+def rapor_yaz(sonuclar):
+    for satir, asamalar in sonuclar.items():
+        print(f"\n== {int(satir):,} satır ==")
+        print(f"{'aşama':<15}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'tepe MB':>10}{'giriş':>12}{'çıkış':>12}")
+        for ad, olcum in asamalar.items():
+            bellek = '-' if olcum['tepe_bellek_mb'] is None else f"{olcum['tepe_bellek_mb']:.1f}"
+            print(f"{ad:<15}{olcum['p50_ms']:>10.2f}{olcum['p90_ms']:>10.2f}{olcum['p99_ms']:>10.2f}{bellek:>10}"
+                  f"{olcum['satir_giris']:>12,}{olcum['satir_cikis']:>12,}")
+
+
+def karsilastir(yeni, onceki, esik=1.2):
+    """p50 gecikmesi `esik` katından fazla artan aşamaları listeler ve yazdırır."""
+    gerilemeler = []
+    print("\n== Önceki sonuçlara göre p50 oranı ==")
+    for satir, asamalar in yeni.items():
+        for ad, olcum in asamalar.items():
+            eski = onceki.get(satir, {}).get(ad)
+            if not eski or not eski['p50_ms']:
+                continue
+            oran = olcum['p50_ms'] / eski['p50_ms']
+            isaret = '  << GERİLEME' if oran > esik else ''
+            print(f"{int(satir):>10,} {ad:<15}{oran:>8.2f}x{isaret}")
+            if oran > esik:
+                gerilemeler.append((satir, ad, oran))
+    return gerilemeler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Öneri hattı aşama bazında benchmark.")
+    parser.add_argument('--satir', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--tekrar', type=int, default=20, help="Sorgu aşamaları için tekrar sayısı")
+    parser.add_argument('--yukleme-tekrari', type=int, default=3, help="Yükleme/genişletme/indeks için tekrar sayısı")
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--bellek-yok', action='store_true', help="tracemalloc ile tepe bellek ölçümünü atla")
+    parser.add_argument('--cikti', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--karsilastir', help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    parser.add_argument('--esik', type=float, default=1.2, help="Gerileme sayılacak p50 oranı")
+    parser.add_argument('--soguk', type=int, metavar='N', help="Yalnızca soğuk başlangıcı N yeni süreçte ölç")
+    args = parser.parse_args(argv)
+
+    if args.soguk:
+        olcumler = soguk_baslangic_olc(args.soguk)
+        soguk_rapor_yaz(olcumler)
+        if args.cikti:
+            os.makedirs(os.path.dirname(args.cikti) or '.', exist_ok=True)
+            with open(args.cikti, 'w', encoding='utf-8') as f:
+                json.dump({'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'), 'ortam': ortam(), 'soguk_baslangic': olcumler}, f, indent=1)
+            print(f"\nSonuçlar -> {args.cikti}")
+        return
+
+    sonuclar = {}
+    for satir in args.satir:
+        sonuclar[str(satir)] = boyut_olc(satir, args.tekrar, args.yukleme_tekrari, args.tohum, not args.bellek_yok)
+    rapor_yaz(sonuclar)
+
+    if args.cikti:
+        os.makedirs(os.path.dirname(args.cikti) or '.', exist_ok=True)
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump({'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'), 'ortam': ortam(), 'sonuclar': sonuclar}, f, indent=1)
+        print(f"\nSonuçlar -> {args.cikti}")
+
+    if args.karsilastir:
+        with open(args.karsilastir, encoding='utf-8') as f:
+            onceki = json.load(f)['sonuclar']
+        if karsilastir(sonuclar, onceki, args.esik):
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Katalogda "benzer araçlar" için normalize özellik matrisi ve en yakın komşu araması.
+
+Özellikler z-skoruna çevrilip float32 bir matriste katalog sürümü başına bir kez
+hazırlanır. Sorgular aktif filtrelerden geçen satırlar üzerinde bloklar halinde
+kaba kuvvet uzaklık hesabıyla (‖x‖² − 2·x·q + ‖q‖², tek matris çarpımı) yanıtlanır;
+sonuç filtrelerle birebir uyumludur ve milyon satırda milisaniyeler sürer.
+"""
+
+import numpy as np
+import pandas as pd
+
+BENZERLIK_SUTUNLARI = [
+    'fiyat_tl', 'beygir_gucu', 'tork_nm', 'hizlanma_0_100s', 'bagaj_hacmi_lt', 'gövde_uzunlugu_mm',
+    'guvenlik_skor', 'performans_skor', 'konfor_skor', 'ikinci_el_skor', 'donanim_skor',
+]
+
+# Tek matris çarpımında işlenen aday satırı sayısı
+BLOK = 65_536
+
+
+class BenzerlikIndeksi:
+    """Genişletilmiş katalog üzerinde k-en yakın komşu araması."""
+
+    def __init__(self, df, sutunlar=BENZERLIK_SUTUNLARI):
+        self.sutunlar = list(sutunlar)
+        degerler = df[self.sutunlar].to_numpy(dtype=np.float64)
+        ortalama = np.nanmean(degerler, axis=0)
+        sapma = np.nanstd(degerler, axis=0)
+        sapma[~(sapma > 0)] = 1.0
+        matris = (degerler - ortalama) / sapma
+        matris[np.isnan(matris)] = 0.0  # eksik değer ortalama kabul edilir
+        self.matris = np.ascontiguousarray(matris, dtype=np.float32)
+        self.normlar = np.einsum('ij,ij->i', self.matris, self.matris)
+        # Aynı marka+model'in donanım/seviye varyantlarını ayırt etmek için
+        self.model_kodlari = pd.MultiIndex.from_arrays([df['marka'], df['model']]).factorize()[0]
+
+    def __len__(self):
+        return len(self.matris)
+
+    def komsular(self, konumlar, k=5, adaylar=None, farkli_model=False):
+        """`konumlar`daki her araç için en yakın `k` aracın konumları ve uzaklıkları.
+
+        `adaylar` aranacak satır konumlarıdır (ör. aktif filtrelerin sonucu; None ise tüm
+        katalog). Aracın kendisi sonuçta yer almaz; `farkli_model` ise aynı marka ve
+        modelin diğer donanımları da dışarıda bırakılır. Dönen diziler (sorgu × k)
+        boyutludur; yeterli aday yoksa eksik konumlar -1, uzaklıklar inf olur.
+        """
+        konumlar = np.asarray(konumlar, dtype=np.intp)
+        adaylar = np.arange(len(self)) if adaylar is None else np.asarray(adaylar, dtype=np.intp)
+        sorgu = self.matris[konumlar]
+        sorgu_normlari = self.normlar[konumlar][:, np.newaxis]
+        haric_kodlar = self.model_kodlari[konumlar][:, np.newaxis] if farkli_model else None
+
+        en_iyi_konum = np.full((len(konumlar), 0), -1, dtype=np.intp)
+        en_iyi_uzaklik = np.full((len(konumlar), 0), np.inf, dtype=np.float32)
+        for bas in range(0, len(adaylar), BLOK):
+            blok = adaylar[bas:bas + BLOK]
+            uzaklik = self.normlar[blok] - 2 * (sorgu @ self.matris[blok].T) + sorgu_normlari
+            uzaklik[blok[np.newaxis, :] == konumlar[:, np.newaxis]] = np.inf
+            if haric_kodlar is not None:
+                uzaklik[self.model_kodlari[blok][np.newaxis, :] == haric_kodlar] = np.inf
+            if uzaklik.shape[1] > k:
+                secim = np.argpartition(uzaklik, k - 1, axis=1)[:, :k]
+                uzaklik = np.take_along_axis(uzaklik, secim, axis=1)
+                blok = blok[secim]
+            else:
+                blok = np.broadcast_to(blok, uzaklik.shape)
+            en_iyi_konum = np.concatenate([en_iyi_konum, blok], axis=1)
+            en_iyi_uzaklik = np.concatenate([en_iyi_uzaklik, uzaklik], axis=1)
+
+        sira = np.argsort(en_iyi_uzaklik, axis=1, kind='stable')[:, :k]
+        en_iyi_konum = np.take_along_axis(en_iyi_konum, sira, axis=1)
+        en_iyi_uzaklik = np.take_along_axis(en_iyi_uzaklik, sira, axis=1)
+        en_iyi_konum[~np.isfinite(en_iyi_uzaklik)] = -1
+        # Yuvarlama nedeniyle küçük negatif kareler sıfırlanır
+        return en_iyi_konum, np.sqrt(np.maximum(en_iyi_uzaklik, 0))
@@ -0,0 +1,189 @@
+"""Sorgu alanlarına bağlı aşamalardan oluşan, artımlı hesaplanan öneri hattı.
+
+Her aşama hangi sorgu alanlarını ve hangi aşamaları girdi aldığını bildirir.
+Hat oturum başına tutulur; bir çalıştırmada yalnızca girdileri değişen aşamalar
+yeniden hesaplanır, diğerleri bir önceki çalıştırmadan gelir.
+
+    hat = oneri_hatti(motor)
+    onerilen = hat.calistir(sorgu, 'oneri')
+    tablo = hat.calistir(sorgu, 'tablo', sayfa_no=0, sayfa_boyutu=30)
+    hat.hesaplananlar()   # ör. ['siralama', 'tablo'] (aday ve skorlar oturumdan)
+"""
+
+import time
+from dataclasses import dataclass
+
+from oneri.duyarlilik import DuyarlilikAnalizi
+from oneri.maliyet import isletme_maliyeti_hesapla
+from oneri.motor import AGIRLIK_ALANLARI, ESIKLER, MALIYET_ALANLARI, TEKLI_SECIMLER, AdayKumesi
+from oneri.pareto import dagilim_ornegi, pareto_cephesi
+from oneri.sahiplik import TcoProjeksiyonu
+from oneri.siralama import Siralama
+from oneri.skor import kriter_matrisi, kriter_skorlari_ekle
+from oneri.tablo import sonuc_sayfasi
+
+FILTRE_ALANLARI = ['butce', 'kullanim_amaci', *TEKLI_SECIMLER, *ESIKLER]
+
+# Rapor durumları
+HESAPLANDI = 'hesaplandı'
+OTURUMDAN = 'oturum'
+PAYLASILANDAN = 'paylaşılan'
+
+
+@dataclass(frozen=True)
+class Asama:
+    """Hattın bir aşaması: `hesapla(sorgu, *bagimlilik_degerleri, **secenekler)`.
+
+    `secenekler`, sorguya ait olmayan (ör. yalnızca bir grafiği etkileyen) ve
+    `calistir`a anahtar kelime olarak verilen hashlenebilir girdilerdir.
+    """
+    ad: str
+    hesapla: object
+    alanlar: tuple = ()
+    bagimliliklar: tuple = ()
+    secenekler: tuple = ()
+    paylasilan: bool = False  # sonuç süreç geneli önbellekte de tutulur
+
+
+class BoruHatti:
+    """Aşama grafiğini çekme usulü değerlendirir ve son çıktıları aşama başına saklar.
+
+    Bir aşamanın anahtarı kendi sorgu alanları ile bağımlılıklarının anahtarlarıdır;
+    anahtar bir önceki çalıştırmadakiyle aynıysa aşama hesaplanmaz. `paylasilan`
+    aşamalar oturumda bulunmazsa önce `onbellek`e (ör. tüm oturumların LRU'su) bakılır;
+    orada bulunan bir aşamanın bağımlılıkları hiç hesaplanmaz.
+    """
+
+    def __init__(self, asamalar, onbellek=None, surum=None):
+        self.asamalar = {asama.ad: asama for asama in asamalar}
+        self.onbellek = onbellek
+        self.surum = surum
+        self._bellek = {}
+        self._olcer = None
+        self._secenekler = {}
+        self.rapor = {}
+
+    def calistir(self, sorgu, *adlar, olcer=None, **secenekler):
+        """İstenen aşamaların çıktıları (tek ad verilirse tek değer).
+
+        Yeniden hesaplanan aşamalar `olcer`e (oneri.olcum.Olcer) da kaydedilir.
+        """
+        self.rapor = {}
+        self._olcer = olcer
+        self._secenekler = secenekler
+        anahtarlar = {}
+        degerler = [self._deger(ad, sorgu, anahtarlar) for ad in adlar]
+        return degerler[0] if len(degerler) == 1 else degerler
+
+    def hesaplananlar(self):
+        """Son çalıştırmada yeniden hesaplanan aşamalar (hesaplanma sırasıyla)."""
+        return [ad for ad, (durum, _) in self.rapor.items() if durum == HESAPLANDI]
+
+    def temizle(self):
+        self._bellek.clear()
+
+    def _anahtar(self, ad, sorgu, anahtarlar):
+        if ad not in anahtarlar:
+            asama = self.asamalar[ad]
+            anahtarlar[ad] = (
+                sorgu.alanlar_anahtari(asama.alanlar),
+                tuple(self._secenekler[secenek] for secenek in asama.secenekler),
+                tuple(self._anahtar(b, sorgu, anahtarlar) for b in asama.bagimliliklar),
+            )
+        return anahtarlar[ad]
+
+    def _deger(self, ad, sorgu, anahtarlar):
+        asama = self.asamalar[ad]
+        anahtar = self._anahtar(ad, sorgu, anahtarlar)
+        kayit = self._bellek.get(ad)
+        if kayit is not None and kayit[0] == anahtar:
+            self.rapor.setdefault(ad, (OTURUMDAN, 0.0))
+            return kayit[1]
+
+        paylasim_anahtari = ('hat', ad, anahtar)
+        if asama.paylasilan and self.onbellek is not None:
+            deger = self.onbellek.al(paylasim_anahtari, self.surum)
+            if deger is not None:
+                self._bellek[ad] = (anahtar, deger)
+                self.rapor[ad] = (PAYLASILANDAN, 0.0)
+                return deger
+
+        girdiler = [self._deger(b, sorgu, anahtarlar) for b in asama.bagimliliklar]
+        secenekler = {secenek: self._secenekler[secenek] for secenek in asama.secenekler}
+        baslangic = time.perf_counter()
+        if self._olcer is None:
+            deger = asama.hesapla(sorgu, *girdiler, **secenekler)
+        else:
+            with self._olcer.asama(ad, girdiler[0] if girdiler else None) as olcum:
+                deger = olcum.cikti(asama.hesapla(sorgu, *girdiler, **secenekler))
+        self.rapor[ad] = (HESAPLANDI, (time.perf_counter() - baslangic) * 1000)
+        self._bellek[ad] = (anahtar, deger)
+        if asama.paylasilan and self.onbellek is not None:
+            self.onbellek.koy(paylasim_anahtari, deger, self.surum)
+        return deger
+
+
+def oneri_hatti(motor, onbellek=None, surum=None):
+    """Motorun genişletilmiş kataloğu üzerinde sayfanın kullandığı aşamalar.
+
+    İşletme maliyeti ve çok yıllık TCO sorgu filtrelerinden bağımsız olarak tüm katalog
+    için hesaplanır; filtre değişiklikleri yalnızca satır seçimini ve normalizasyonu yeniler.
+    """
+    genis = motor.genis
+
+    def satirlar(sorgu):
+        return motor.indeks.satirlar(**sorgu.kisitlar())
+
+    def maliyet(sorgu):
+        return isletme_maliyeti_hesapla(genis, sorgu.yillik_km, sorgu.yakit_fiyat, sorgu.elektrik_fiyat)
+
+    def tco(sorgu, tco_varsayimlari):
+        return TcoProjeksiyonu(genis, sorgu.yillik_km, sorgu.yakit_fiyat, sorgu.elektrik_fiyat, tco_varsayimlari)
+
+    def adaylar(sorgu, konumlar, maliyetler):
+        yakit, toplam = maliyetler
+        df = genis.take(konumlar).assign(Yillik_Yakit_Maliyeti=yakit[konumlar], Toplam_Isletme_Maliyeti=toplam[konumlar])
+        df = kriter_skorlari_ekle(df)
+        return AdayKumesi(df, kriter_matrisi(df))
+
+    def skorlar(sorgu, aday_kumesi):
+        return aday_kumesi.skorla(sorgu.agirliklar())
+
+    def oneri(sorgu, aday_kumesi, skor):
+        return aday_kumesi.ilk(skor, sorgu.k)
+
+    def oneri_konumlari(sorgu, konumlar, skor):
+        # Önerilen satırların genişletilmiş katalogdaki konumları (öneri ile aynı sırada)
+        return konumlar[Siralama(skor).ilk(sorgu.k)]
+
+    def siralama(sorgu, skor):
+        # Sayfalar arasında paylaşılır: sıralı ön ek yalnızca derin sayfalarda genişler
+        return Siralama(skor)
+
+    def tablo(sorgu, aday_kumesi, skor, sirali, sayfa_no, sayfa_boyutu):
+        return sonuc_sayfasi(aday_kumesi, skor, sirali, sayfa_no, sayfa_boyutu)
+
+    def pareto(sorgu, aday_kumesi, skor, pareto_boyutlari):
+        df = aday_kumesi.df.assign(Toplam_Skor=skor)
+        cephe = pareto_cephesi(df, pareto_boyutlari)
+        if pareto_boyutlari:
+            cephe = cephe.sort_values(list(pareto_boyutlari[:1]), kind='stable')
+        return cephe, dagilim_ornegi(df, cephe), len(df)
+
+    def duyarlilik(sorgu, aday_kumesi):
+        # Tüm ağırlık ızgarası üzerinde: ağırlık değişiklikleri yeniden hesaplatmaz
+        return DuyarlilikAnalizi(aday_kumesi.matris)
+
+    return BoruHatti([
+        Asama('satirlar', satirlar, tuple(FILTRE_ALANLARI)),
+        Asama('maliyet', maliyet, tuple(MALIYET_ALANLARI), paylasilan=True),
+        Asama('adaylar', adaylar, bagimliliklar=('satirlar', 'maliyet')),
+        Asama('tco', tco, tuple(MALIYET_ALANLARI), secenekler=('tco_varsayimlari',), paylasilan=True),
+        Asama('skorlar', skorlar, tuple(AGIRLIK_ALANLARI), ('adaylar',)),
+        Asama('oneri', oneri, ('k',), ('adaylar', 'skorlar'), paylasilan=True),
+        Asama('oneri_konumlari', oneri_konumlari, ('k',), ('satirlar', 'skorlar')),
+        Asama('siralama', siralama, bagimliliklar=('skorlar',)),
+        Asama('tablo', tablo, bagimliliklar=('adaylar', 'skorlar', 'siralama'), secenekler=('sayfa_no', 'sayfa_boyutu')),
+        Asama('pareto', pareto, bagimliliklar=('adaylar', 'skorlar'), secenekler=('pareto_boyutlari',)),
+        Asama('duyarlilik', duyarlilik, bagimliliklar=('adaylar',)),
+    ], onbellek=onbellek, surum=surum)
@@ -0,0 +1,134 @@
+"""Önceden doğrulanmış katalogun bellek eşlemeli (.npy) ikili formatı.
+
+Her sütun ayrı bir .npy dosyasıdır; kategorik sütunlar için kod dizisi ve
+değer sözlüğü saklanır. Okuma `np.load(mmap_mode='r')` ile yapıldığından
+açılış neredeyse anlıktır ve aynı makinedeki işlemler aynı fiziksel sayfaları paylaşır.
+
+Dönüştürücü:
+
+    python -m oneri.depo arabalar.csv            # arabalar.katalog/ dizinini üretir
+"""
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from oneri.katalog import csv_oku
+
+FORMAT_SURUMU = 1
+META_DOSYASI = 'meta.json'
+
+
+def ikili_dizin(file_path):
+    """CSV dosyasının yanındaki ikili katalog dizininin yolu."""
+    return os.path.splitext(file_path)[0] + '.katalog'
+
+
+def _kaynak_bilgisi(file_path):
+    bilgi = os.stat(file_path)
+    return {'dosya': os.path.basename(file_path), 'mtime_ns': bilgi.st_mtime_ns, 'boyut': bilgi.st_size}
+
+
+def ikili_yaz(df, dizin, kaynak=None):
+    """DataFrame'i sütun başına bir .npy dosyası olarak yazar (geçici dizin + yeniden adlandırma)."""
+    gecici = dizin + '.tmp'
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+
+    sutunlar = []
+    for i, col in enumerate(df.columns):
+        seri = df[col]
+        if isinstance(seri.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(gecici, f'{i}.npy'), seri.cat.codes.to_numpy())
+            with open(os.path.join(gecici, f'{i}.json'), 'w', encoding='utf-8') as f:
+                json.dump([str(deger) for deger in seri.cat.categories], f, ensure_ascii=False)
+            sutunlar.append({'ad': col, 'tip': 'kategorik'})
+        else:
+            np.save(os.path.join(gecici, f'{i}.npy'), seri.to_numpy())
+            sutunlar.append({'ad': col, 'tip': 'sayisal'})
+
+    meta = {'format': FORMAT_SURUMU, 'satir': len(df), 'sutunlar': sutunlar, 'kaynak': kaynak}
+    with open(os.path.join(gecici, META_DOSYASI), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+
+    # Eski dizini açık tutan işlemlerin eşlemeleri silinen dosyalar üzerinden geçerli kalır
+    shutil.rmtree(dizin, ignore_errors=True)
+    os.replace(gecici, dizin)
+
+
+def meta_oku(dizin):
+    with open(os.path.join(dizin, META_DOSYASI), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def ikili_oku(dizin, meta=None):
+    """İkili katalogu kopyalamadan bellek eşlemeli bir DataFrame olarak açar."""
+    meta = meta or meta_oku(dizin)
+    veriler = {}
+    for i, sutun in enumerate(meta['sutunlar']):
+        dizi = np.load(os.path.join(dizin, f'{i}.npy'), mmap_mode='r')
+        if sutun['tip'] == 'kategorik':
+            with open(os.path.join(dizin, f'{i}.json'), encoding='utf-8') as f:
+                sozluk = json.load(f)
+            dizi = pd.Categorical.from_codes(dizi, categories=sozluk)
+        veriler[sutun['ad']] = dizi
+    return pd.DataFrame(veriler, copy=False)
+
+
+def ikili_guncel_mi(file_path, meta):
+    """İkili katalog, CSV'nin şu anki haline göre üretilmiş mi?"""
+    if meta.get('format') != FORMAT_SURUMU:
+        return False
+    try:
+        return meta.get('kaynak') == _kaynak_bilgisi(file_path)
+    except OSError:
+        # CSV yoksa ikili katalog tek kaynaktır
+        return True
+
+
+def katalog_oku(file_path):
+    """Güncel bir ikili katalog varsa onu eşler, yoksa CSV'yi okur."""
+    dizin = ikili_dizin(file_path)
+    if os.path.isdir(dizin):
+        meta = meta_oku(dizin)
+        if ikili_guncel_mi(file_path, meta):
+            return ikili_oku(dizin, meta)
+    return csv_oku(file_path)
+
+
+def katalog_surumu(file_path):
+    """CSV ve (varsa) ikili katalogun değişiklik zamanı/boyutundan katalog sürümü üretir."""
+    surum = []
+    for yol in (file_path, os.path.join(ikili_dizin(file_path), META_DOSYASI)):
+        try:
+            bilgi = os.stat(yol)
+            surum.append((bilgi.st_mtime_ns, bilgi.st_size))
+        except OSError:
+            surum.append(None)
+    return tuple(surum)
+
+
+def donustur(file_path, dizin=None):
+    """CSV'yi bir kez doğrulayıp ikili formata yazar; yazılan dizini döndürür."""
+    dizin = dizin or ikili_dizin(file_path)
+    df = csv_oku(file_path)
+    ikili_yaz(df, dizin, kaynak=_kaynak_bilgisi(file_path))
+    return dizin
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="arabalar.csv dosyasını bellek eşlemeli ikili katalog formatına dönüştürür.")
+    parser.add_argument('csv', nargs='?', default='arabalar.csv')
+    parser.add_argument('--cikti', help="Çıktı dizini (varsayılan: <csv adı>.katalog)")
+    args = parser.parse_args(argv)
+
+    dizin = donustur(args.csv, args.cikti)
+    meta = meta_oku(dizin)
+    print(f"{meta['satir']} satır, {len(meta['sutunlar'])} sütun -> {dizin}")
+
+
+if __name__ == '__main__':
+    main()
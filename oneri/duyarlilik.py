@@ -0,0 +1,141 @@
+"""Ağırlık duyarlılığı: önerilerin kriter ağırlıklarındaki değişikliklere karşı kararlılığı.
+
+Kaydırıcıların alabileceği tüm ağırlık vektörleri (5 kriter × 1-5 = 3125 vektör) için
+aday kümesinin ilk k aracı tek bir toplu hesapla bulunur. Ağırlıklar negatif olmadığından
+bir satır bloğunun sütun bazında en büyük değerleriyle hesaplanan skor, bloktaki her aracın
+skorunun üst sınırıdır. Adaylar benzer kriter değerleri bir arada olacak şekilde
+(Morton sırası) bloklara ayrılır; birkaç uç ağırlık vektörünün ilk k'sından her ağırlık
+vektörü için k'ncı skora bir alt sınır çıkarılır ve hiçbir vektörde bu sınıra ulaşamayan
+bloklar elenir. Kalan az sayıdaki satırda eşiği geçen (araç, ağırlık) çiftleri sıralanır;
+sonuç Siralama ile aynıdır (skor azalan, eşitlikte konum artan).
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from oneri.motor import AGIRLIK_ALANLARI
+
+ONEM_SEVIYELERI = (1, 2, 3, 4, 5)
+ILK_SIRALAR = (1, 3, 10)
+AGIRLIK_ETIKETLERI = {
+    'onem_performans': 'Performans',
+    'onem_ikinci_el': 'İkinci El',
+    'onem_guvenlik': 'Güvenlik',
+    'onem_konfor': 'Konfor',
+    'onem_tuketim': 'İşletme Maliyeti',
+}
+
+# Üst sınırı birlikte hesaplanan aday bloğu, Morton sırası için kriter başına bit sayısı
+# ve tek seferde skorlanan ağırlık vektörü sayısı (bellek: kalan satır × YON_BLOGU)
+YAPRAK = 64
+MORTON_BITI = 6
+YON_BLOGU = 256
+
+
+def agirlik_izgarasi(seviyeler=ONEM_SEVIYELERI, kriter_sayisi=len(AGIRLIK_ALANLARI)):
+    """Tüm ağırlık kombinasyonları; (kombinasyon, kriter) boyutlu, KRITERLER sırasında."""
+    return np.array(list(itertools.product(seviyeler, repeat=kriter_sayisi)), dtype=float)
+
+
+def _morton_sirasi(matris):
+    """Satırları nicelenmiş kriter değerlerinin bitleri iç içe geçirilerek (Z-sırası) sıralar."""
+    alt, ust = matris.min(axis=0), matris.max(axis=0)
+    nicel = ((matris - alt) / np.where(ust > alt, ust - alt, 1.0) * (2 ** MORTON_BITI - 1)).astype(np.int64)
+    kod = np.zeros(len(matris), dtype=np.int64)
+    for bit in range(MORTON_BITI - 1, -1, -1):
+        for j in range(matris.shape[1]):
+            kod = (kod << 1) | ((nicel[:, j] >> bit) & 1)
+    return np.argsort(kod, kind='stable')
+
+
+def ilk_k_izgarasi(matris, izgara, k):
+    """Her ağırlık vektörü için en yüksek skorlu `k` aracın konumları: (k, vektör) boyutlu.
+
+    Skoru NaN olan araçlar yer almaz; k'dan az geçerli araç varsa satır sayısı azalır.
+    """
+    gecerli = np.flatnonzero(~np.isnan(matris).any(axis=1))
+    k = min(k, len(gecerli))
+    if k == 0:
+        return np.empty((0, len(izgara)), dtype=np.intp)
+    x = matris[gecerli]
+
+    # Uç vektörlerin ilk k'sı: her vektör için k'ncı skorun alt sınırı
+    uclar = np.array(list(itertools.product((izgara.min(), izgara.max()), repeat=x.shape[1])))
+    ornek = np.unique(np.argpartition(-(x @ uclar.T), k - 1, axis=0)[:k])
+    esik = -np.partition(-(x[ornek] @ izgara.T), k - 1, axis=0)[k - 1]
+    # Aynı skorun farklı çarpım yollarında son bitte farklı çıkabilmesine karşı pay
+    esik = esik - 1e-9 * np.maximum(np.abs(esik), 1.0)
+
+    # Hiçbir vektörde eşiğe ulaşamayan bloklar elenir
+    sira = _morton_sirasi(x)
+    baslar = np.arange(0, len(x), YAPRAK)
+    ust_sinir = np.maximum.reduceat(x[sira], baslar, axis=0) @ izgara.T
+    bloklar = np.flatnonzero((ust_sinir >= esik).any(axis=1))
+    kalan = np.sort(np.concatenate([sira[bas:bas + YAPRAK] for bas in baslar[bloklar]]))
+
+    ilkler = np.empty((k, len(izgara)), dtype=np.intp)
+    for bas in range(0, len(izgara), YON_BLOGU):
+        skorlar = x[kalan] @ izgara[bas:bas + YON_BLOGU].T
+        satir, sutun = np.nonzero(skorlar >= esik[bas:bas + YON_BLOGU])
+        # Sütun içinde skor azalan, eşitlikte konum artan; her sütunda en az k çift vardır
+        sira = np.lexsort((satir, -skorlar[satir, sutun], sutun))
+        satir, sutun = satir[sira], sutun[sira]
+        grup_basi = np.searchsorted(sutun, np.arange(skorlar.shape[1]))
+        secili = np.arange(len(sutun)) - grup_basi[sutun] < k
+        ilkler[:, bas:bas + YON_BLOGU] = kalan[satir[secili]].reshape(-1, k).T
+    return gecerli[ilkler]
+
+
+class DuyarlilikAnalizi:
+    """Bir aday kümesinin ağırlık ızgarası üzerindeki ilk k sıralamaları.
+
+    Ağırlıklara bağlı değildir (aday kümesi değişmedikçe yeniden hesaplanmaz);
+    mevcut ağırlıklara göre sorular (`en_yakin_degisim`, `birinci_olma_adimi`)
+    yalnızca ızgara üzerinde çalışır.
+    """
+
+    def __init__(self, matris, izgara=None, k=max(ILK_SIRALAR)):
+        self.izgara = agirlik_izgarasi(kriter_sayisi=matris.shape[1]) if izgara is None else np.asarray(izgara, dtype=float)
+        self.ilkler = ilk_k_izgarasi(matris, self.izgara, k)
+
+    @property
+    def birinciler(self):
+        return self.ilkler[0] if len(self.ilkler) else np.empty(0, dtype=np.intp)
+
+    def oranlar(self, siralar=ILK_SIRALAR):
+        """İlk `siralar` içinde yer aldığı ağırlık vektörlerinin oranı; en az bir kez ilk k'ya giren araçlar."""
+        konumlar, ters = np.unique(self.ilkler, return_inverse=True)
+        ters = ters.reshape(self.ilkler.shape)
+        return pd.DataFrame(
+            {f'Ilk_{s}': np.bincount(ters[:s].ravel(), minlength=len(konumlar)) / len(self.izgara) for s in siralar},
+            index=pd.Index(konumlar, name='konum'),
+        ).sort_values([f'Ilk_{s}' for s in siralar], ascending=False, kind='stable')
+
+    def _adimlar(self, agirliklar):
+        """Her ızgara vektörüne mevcut ağırlıklardan kaç kaydırıcı adımıyla gidildiği."""
+        return np.abs(self.izgara - np.asarray(agirliklar, dtype=float)).sum(axis=1)
+
+    def en_yakin_degisim(self, agirliklar, birinci):
+        """1. öneriyi `birinci`den başka bir araca çeviren en küçük ağırlık değişikliği.
+
+        (yeni ağırlıklar, adım sayısı, yeni 1. aracın konumu) döner; hiçbir vektör
+        birinciyi değiştirmiyorsa None. Eşit adımda daha az kaydırıcı değiştiren tercih edilir.
+        """
+        farkli = np.flatnonzero(self.birinciler != birinci)
+        if not len(farkli):
+            return None
+        adimlar = self._adimlar(agirliklar)[farkli]
+        degisen = (self.izgara[farkli] != np.asarray(agirliklar, dtype=float)).sum(axis=1)
+        secim = farkli[np.lexsort((degisen, adimlar))[0]]
+        return self.izgara[secim], int(self._adimlar(agirliklar)[secim]), int(self.birinciler[secim])
+
+    def birinci_olma_adimi(self, agirliklar):
+        """Izgarada en az bir kez 1. olan her araç için bunun gerektirdiği en az kaydırıcı adımı."""
+        if not len(self.ilkler):
+            return pd.Series([], dtype=int, index=pd.Index([], dtype=np.intp, name='konum'))
+        adimlar = self._adimlar(agirliklar)
+        sira = np.argsort(adimlar, kind='stable')
+        konumlar, ilk = np.unique(self.birinciler[sira], return_index=True)
+        return pd.Series(adimlar[sira[ilk]].astype(int), index=pd.Index(konumlar, name='konum'))
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from oneri.katalog import kodla
+
+# Donanım seviyeleri: (ad, fiyat çarpanı, skor değişimi)
+# Yeni bir seviye eklemek için bu listeye bir satır eklemek yeterlidir.
+DONANIM_SEVIYELERI = (
+    ('Giriş', 0.85, -0.15),
+    ('Orta', 1.0, 0),
+    ('Full', 1.15, 0.15),
+)
+
+
+def temizle(df):
+    """Fiyatı veya modeli olmayan satırları katalogdan çıkarır."""
+    df = df.dropna(subset=['marka', 'model', 'fiyat_tl'])
+    return df[(df['fiyat_tl'] > 0) & (df['model'] != '')]
+
+
+def donanim_genislet(df, seviyeler=DONANIM_SEVIYELERI):
+    """Her aracı tüm donanım seviyeleri için tek bir sütunsal işlemle çoğaltır.
+
+    Satır sırası eski iterrows döngüsüyle aynıdır: her araç için seviyeler art arda gelir.
+    """
+    adlar = [seviye[0] for seviye in seviyeler]
+    fiyat_carpanlari = np.array([seviye[1] for seviye in seviyeler], dtype=float)
+    skor_degisimi = np.array([seviye[2] for seviye in seviyeler], dtype=float)
+
+    n = len(df)
+    s = len(seviyeler)
+    genis = df.take(np.repeat(np.arange(n), s))
+
+    carpan = np.tile(fiyat_carpanlari, n)
+    skor_farki = np.tile(skor_degisimi, n)
+
+    genis['fiyat_tl'] = genis['fiyat_tl'].to_numpy(dtype=float) * carpan
+
+    # Donanım adı yalnızca benzersiz değerler üzerinde temizlenir, sonuç sözlük kodlu (kategorik) tutulur
+    kodlar, benzersiz = kodla(df['motor_donanim'])
+    base_kodlar, base_donanim = pd.factorize(
+        np.array([str(d).replace('"', '').split('(')[0].strip() for d in benzersiz], dtype=object)
+    )
+    etiketler = [f" ({ad})" for ad in adlar]
+    kategoriler = [base + etiket for base in base_donanim for etiket in etiketler]
+    yeni_kodlar = np.repeat(base_kodlar[kodlar], s) * s + np.tile(np.arange(s), n)
+    genis['motor_donanim'] = pd.Categorical.from_codes(yeni_kodlar, categories=kategoriler)
+
+    for col in ['donanim_skor', 'konfor_skor']:
+        genis[col] = np.clip(genis[col].to_numpy(dtype=float) + skor_farki, 1, 5)
+
+    for col in ['yillik_mtv', 'yillik_sigorta']:
+        genis[col] = np.trunc(genis[col].to_numpy(dtype=float) * carpan).astype(np.int64)
+
+    return genis
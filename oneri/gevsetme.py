@@ -0,0 +1,168 @@
+"""Sonuçsuz kalan bir sorgu için kısıt gevşetme önerileri.
+
+Sorgunun her aktif kısıtı için katalogda o kısıtı sağlamayan satırların maskesi bir
+kez çıkarılır (kısıt × satır matrisi). Her satırın kaç kısıtı ihlal ettiği bilindiğinde
+tek bir kısıt ya da kısıt çifti bırakıldığında kalan araç sayıları tek geçişte
+`bincount` ile bulunur: bir kısıt bırakılınca yalnızca onu ihlal eden satırlar,
+bir çift bırakılınca yalnızca o çifti (veya birini) ihlal eden satırlar geri gelir.
+Filtre zinciri kombinasyon başına yeniden çalıştırılmaz.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from oneri.motor import ESIKLER, FARKETMEZ, TEKLI_SECIMLER
+
+KISIT_ETIKETLERI = {
+    'butce': 'Bütçe',
+    'marka': 'Marka',
+    'model': 'Model',
+    'motor': 'Motor / Donanım',
+    'kasa_tipi': 'Kasa Tipi',
+    'yakit_tipi': 'Yakıt Tipi',
+    'sanziman': 'Vites Tipi',
+    'kullanim_amaci': 'Kullanım Amacı',
+    'min_performans': 'Min. Performans',
+    'min_guvenlik': 'Min. Güvenlik',
+    'min_beygir_gucu': 'Min. Beygir Gücü',
+    'min_bagaj_hacmi': 'Min. Bagaj Hacmi',
+    'min_menzil': 'Min. Elektrikli Menzil',
+}
+
+# Sayısal kısıtlar: alan -> (sütun, gevşetme yönü)
+SAYISAL_KISITLAR = {'butce': ('fiyat_tl', 'artir'), **{alan: (col, 'azalt') for alan, col in ESIKLER.items()}}
+
+
+def _kisit(alan, deger):
+    """Tek bir alanın FiltreIndeksi.bitmap argümanları."""
+    if alan == 'butce':
+        return {'en_cok': {'fiyat_tl': deger}}
+    if alan == 'kullanim_amaci':
+        return {'kullanim': deger}
+    if alan in ESIKLER:
+        return {'en_az': {ESIKLER[alan]: deger}}
+    return {'esitlikler': {TEKLI_SECIMLER[alan]: deger}}
+
+
+def _aktif_mi(alan, deger):
+    if alan == 'butce':
+        return deger is not None
+    if alan in ESIKLER:
+        return True  # eşiğin bir satırı dışarıda bırakıp bırakmadığına maskeden bakılır
+    return deger != FARKETMEZ
+
+
+@dataclass
+class Oneri:
+    """Tek tıkla uygulanabilir bir gevşetme: `degisiklikler` alan -> yeni değer (None: kısıt kaldırılır)."""
+    degisiklikler: dict
+    sonuc: int
+    tur: str  # 'esik', 'birak' veya 'ikili'
+
+
+class KisitMatrisi:
+    """Bir sorgunun aktif kısıtlarının ihlal maskeleri ve bunlardan türetilen sayımlar."""
+
+    def __init__(self, indeks, sorgu):
+        self.indeks = indeks
+        self.sorgu = sorgu
+        alanlar, satirlar = [], []
+        for alan in KISIT_ETIKETLERI:
+            deger = getattr(sorgu, alan)
+            if not _aktif_mi(alan, deger):
+                continue
+            ihlal = self._ihlal(alan, deger)
+            if ihlal.any():
+                alanlar.append(alan)
+                satirlar.append(ihlal)
+        self.alanlar = alanlar
+        self.ihlal = np.array(satirlar, dtype=bool).reshape(len(alanlar), indeks.n)
+        self.ihlal_sayisi = self.ihlal.sum(axis=0, dtype=np.int16)
+        self._sira = {alan: i for i, alan in enumerate(alanlar)}
+
+        # Tam olarak bir / iki kısıtı ihlal eden satırların hangi kısıt(lar)ı ihlal ettiği
+        c = len(alanlar)
+        self.gecen = int((self.ihlal_sayisi == 0).sum())
+        self._tek_kisit = np.empty(0, dtype=np.intp)
+        self.tekli = np.zeros(c, dtype=np.intp)
+        self.ikili = np.zeros((c, c), dtype=np.intp)
+        if c:
+            self._tek_kisit = self.ihlal[:, self.ihlal_sayisi == 1].argmax(axis=0)
+            self.tekli = np.bincount(self._tek_kisit, minlength=c)
+            cift = self.ihlal[:, self.ihlal_sayisi == 2]
+            ilk, son = cift.argmax(axis=0), c - 1 - cift[::-1].argmax(axis=0)
+            self.ikili = np.bincount(ilk * c + son, minlength=c * c).reshape(c, c)
+
+    def _ihlal(self, alan, deger):
+        bitmap = self.indeks.bitmap(**_kisit(alan, deger))
+        return ~np.unpackbits(bitmap, count=self.indeks.n).view(bool)
+
+    def birakinca(self, alan):
+        """`alan` kısıtı kaldırılınca kalan araç sayısı."""
+        return self.gecen + int(self.tekli[self._sira[alan]])
+
+    def ikisini_birakinca(self, alan1, alan2):
+        i, j = sorted((self._sira[alan1], self._sira[alan2]))
+        return self.gecen + int(self.tekli[i] + self.tekli[j] + self.ikili[i, j])
+
+    def sayi(self, degisiklikler):
+        """Verilen alanlar yeni değerleriyle (None: kısıt yok) değiştirilince kalan araç sayısı."""
+        ihlal_sayisi = self.ihlal_sayisi.copy()
+        for alan, deger in degisiklikler.items():
+            if alan in self._sira:
+                ihlal_sayisi -= self.ihlal[self._sira[alan]]
+            if deger is not None and _aktif_mi(alan, deger):
+                ihlal_sayisi += self._ihlal(alan, deger)
+        return int((ihlal_sayisi == 0).sum())
+
+    def esik_degeri(self, alan, hedef):
+        """Yalnızca `alan` eşiği değiştirilerek en az `hedef` sonuç veren en küçük değişiklik.
+
+        Bütçe için gereken en düşük üst sınır, min. eşikler için gereken en yüksek alt
+        sınır döner; yalnızca bu eşikle hedefe ulaşılamıyorsa None.
+        """
+        gereken = hedef - self.gecen
+        if gereken <= 0:
+            return getattr(self.sorgu, alan)
+        sutun, yon = SAYISAL_KISITLAR[alan]
+        # Diğer tüm kısıtları sağlayıp yalnızca bu eşiğe takılanlar
+        satirlar = np.flatnonzero(self.ihlal_sayisi == 1)[self._tek_kisit == self._sira[alan]]
+        if len(satirlar) < gereken:
+            return None
+        degerler = self.indeks.df[sutun].to_numpy(dtype=float)[satirlar]
+        if yon == 'artir':
+            return float(np.partition(degerler, gereken - 1)[gereken - 1])
+        return float(-np.partition(-degerler, gereken - 1)[gereken - 1])
+
+    def oneriler(self, hedef=10, yuvarla=None, en_fazla=6):
+        """En az `hedef` sonuç veren gevşetmeler: önce eşik değişiklikleri, sonra tek ve çift kısıt kaldırma.
+
+        `yuvarla(alan, deger)` eşik önerilerini widget adımlarına oturtmak için kullanılır.
+        Hiçbir gevşetme hedefe ulaşmıyorsa en çok sonuç verenler döner.
+        """
+        oneriler = []
+        for alan in self.alanlar:
+            if alan not in SAYISAL_KISITLAR:
+                continue
+            deger = self.esik_degeri(alan, hedef)
+            if deger is None:
+                continue
+            if yuvarla is not None:
+                deger = yuvarla(alan, deger)
+            oneriler.append(Oneri({alan: deger}, self.sayi({alan: deger}), 'esik'))
+
+        tekler = [Oneri({alan: None}, self.birakinca(alan), 'birak') for alan in self.alanlar]
+        ciftler = [
+            Oneri({a: None, b: None}, self.ikisini_birakinca(a, b), 'ikili')
+            for i, a in enumerate(self.alanlar) for b in self.alanlar[i + 1:]
+        ]
+        tekler.sort(key=lambda o: -o.sonuc)
+        ciftler.sort(key=lambda o: -o.sonuc)
+        oneriler += [o for o in tekler if o.sonuc >= hedef]
+        # Tek kısıtla hedefe ulaşılamıyorsa çiftlere bakılır
+        if not oneriler:
+            oneriler += [o for o in ciftler if o.sonuc >= hedef]
+        if not oneriler:
+            oneriler = [o for o in sorted(tekler + ciftler, key=lambda o: -o.sonuc) if o.sonuc > 0]
+        return oneriler[:en_fazla]
@@ -0,0 +1,117 @@
+"""Sayfadaki plotly grafikleri: gecikmeli içe aktarma ve içerik anahtarlı önbellek.
+
+plotly.express ilk grafik gerektiğinde içe aktarılır; sonuç çıkmayan ya da grafiğe
+ulaşmayan rerun'lar ve yeni işçi süreçlerinin açılışı bu maliyeti ödemez. Her grafik,
+çizilen verinin (ör. ilk 10 aracın adı, fiyatı ve işletme maliyeti) özetiyle anahtarlanan
+süreç geneli bir LRU'da tutulur: ağırlık değişikliği ilk 10'u değiştirmiyorsa ya da
+yalnızca karşılaştırma seçimi değişiyorsa figür yeniden kurulmaz. Anahtar verinin
+kendisi olduğundan katalog sürümünden bağımsızdır.
+"""
+
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from oneri.olcum import soguk_baslangic_kaydet
+from oneri.onbellek import LRUOnbellek
+from oneri.pareto import PARETO_ETIKETLERI
+
+RADAR_KRITERLERI = {
+    'guvenlik_skor': 'Güvenlik',
+    'Performans_Guncel': 'Performans',
+    'konfor_skor': 'Konfor',
+    'ikinci_el_skor': '2. El Değeri',
+    'donanim_skor': 'Donanım',
+}
+
+_px = None
+
+
+def plotly_express():
+    """plotly.express'i ilk çağrıda içe aktarır; süre soğuk başlangıç kaydına eklenir."""
+    global _px
+    if _px is None:
+        baslangic = time.perf_counter()
+        import plotly.express as px
+        soguk_baslangic_kaydet('plotly_yukleme', (time.perf_counter() - baslangic) * 1000)
+        _px = px
+    return _px
+
+
+def grafik_boyutu(fig):
+    """Figürdeki veri dizilerinin yaklaşık boyutu (bayt)."""
+    bayt = 4096
+    for iz in fig.data:
+        for deger in iz.to_plotly_json().values():
+            if isinstance(deger, (np.ndarray, list, tuple)):
+                bayt += np.asarray(deger).nbytes
+    return bayt
+
+
+GRAFIK_ONBELLEGI = LRUOnbellek(maks_giris=256, maks_bayt=64 * 1024 * 1024, boyut=grafik_boyutu)
+
+
+def veri_ozeti(df):
+    """DataFrame'in sütunları ve değerlerinden (indeks hariç) içerik özeti."""
+    ozet = hashlib.blake2b(digest_size=16)
+    ozet.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode())
+    ozet.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return ozet.hexdigest()
+
+
+def _onbellekli(ad, veri, parametreler, uret):
+    return GRAFIK_ONBELLEGI.getir((ad, veri_ozeti(veri), parametreler), lambda: uret(plotly_express()))
+
+
+def maliyet_grafigi(araclar):
+    """İlk araçların satın alma fiyatı ve yıllık işletme maliyeti (gruplu çubuk)."""
+    veri = araclar[['Araba', 'fiyat_tl', 'Toplam_Isletme_Maliyeti']]
+    return _onbellekli('maliyet', veri, (), lambda px: px.bar(
+        veri,
+        x='Araba',
+        y=['fiyat_tl', 'Toplam_Isletme_Maliyeti'],
+        barmode='group',
+        labels={'value': 'TL', 'variable': 'Maliyet Türü'},
+        title='İlk 10 Aracın Satın Alma Fiyatı ve TOPLAM Yıllık İşletme Maliyeti',
+        color_discrete_map={'fiyat_tl': '#1a237e', 'Toplam_Isletme_Maliyeti': '#ff8a65'}  # Kurumsal Mavi ve Turuncu Vurgu
+    ))
+
+
+def radar_grafigi(araclar):
+    """Araçların 5 üzerinden skorları (kutupsal çizgi); her araç bir iz."""
+    veri = araclar[['Araba', *RADAR_KRITERLERI]]
+
+    def uret(px):
+        # Araç × kriter tablosu uzun biçime tek seferde çevrilir (kriterler araç içinde sıralı)
+        radar_data = veri.rename(columns=RADAR_KRITERLERI).melt(id_vars='Araba', var_name='Theta', value_name='Skor')
+        radar_data = radar_data.rename(columns={'Araba': 'Araç'}).iloc[
+            np.arange(len(radar_data)).reshape(len(RADAR_KRITERLERI), len(veri)).T.ravel()
+        ]
+        return px.line_polar(
+            radar_data, r='Skor', theta='Theta', color='Araç', line_close=True, range_r=[0, 5],
+            title="İlk 3 Aracın Detaylı Skor Karşılaştırması (5 Üzerinden)"
+        )
+    return _onbellekli('radar', veri, (), uret)
+
+
+def pareto_grafigi(dagilim, eksen_x, eksen_y, baslik):
+    veri = dagilim[list(dict.fromkeys([eksen_x, eksen_y, 'Grup', 'marka', 'model', 'motor_donanim']))]
+    return _onbellekli('pareto', veri, (eksen_x, eksen_y, baslik), lambda px: px.scatter(
+        veri, x=eksen_x, y=eksen_y, color='Grup',
+        hover_data=['marka', 'model', 'motor_donanim'],
+        labels={eksen_x: PARETO_ETIKETLERI[eksen_x], eksen_y: PARETO_ETIKETLERI[eksen_y]},
+        color_discrete_map={'Diğer adaylar': '#c5cae9', 'Pareto cephesi': '#ff8a65'},
+        title=baslik
+    ))
+
+
+def tco_grafigi(tco_egrileri, baslik):
+    """Kümülatif TCO medyanı ve P10–P90 hata çubukları (araç başına bir çizgi)."""
+    return _onbellekli('tco', tco_egrileri, (baslik,), lambda px: px.line(
+        tco_egrileri, x='Yıl', y='Medyan', color='Araç', markers=True,
+        error_y=tco_egrileri['P90'] - tco_egrileri['Medyan'], error_y_minus=tco_egrileri['Medyan'] - tco_egrileri['P10'],
+        labels={'Medyan': 'Kümülatif TCO (TL)'},
+        title=baslik
+    ))
@@ -0,0 +1,153 @@
+import numpy as np
+
+from oneri.katalog import kodla
+
+KATEGORIK_SUTUNLAR = ['marka', 'model', 'motor_donanim', 'kasa_tipi', 'yakit_tipi', 'sanziman']
+SAYISAL_SUTUNLAR = ['fiyat_tl', 'performans_skor', 'guvenlik_skor', 'beygir_gucu', 'bagaj_hacmi_lt', 'elektrikli_menzil_km']
+
+# Bu sayıdan az farklı değeri olan sütunlar için bitmapler önceden hazırlanır;
+# daha fazla değeri olanlar (ör. motor_donanim) için yalnızca satır listeleri tutulur.
+BITMAP_ESIGI = 256
+
+
+class KategorikIndeks:
+    """Bir kategorik sütun için değer sözlüğü, satır listeleri ve (düşük kardinalitede) bitmapler."""
+
+    def __init__(self, degerler):
+        self.n = len(degerler)
+        kodlar, self.sozluk = kodla(degerler)
+        self.kodlar = kodlar.astype(np.int32)
+        # Değere göre gruplanmış satır numaraları (CSR düzeni)
+        self.satirlar = np.argsort(self.kodlar, kind='stable')
+        sayilar = np.bincount(self.kodlar, minlength=len(self.sozluk))
+        self.baslangic = np.concatenate([[0], np.cumsum(sayilar)])
+        self.bitmapler = None
+        if len(self.sozluk) <= BITMAP_ESIGI:
+            self.bitmapler = [self._bitmap_olustur(kod) for kod in range(len(self.sozluk))]
+
+    def _bitmap_olustur(self, kod):
+        return satirlardan_bitmap(self.satirlar[self.baslangic[kod]:self.baslangic[kod + 1]], self.n)
+
+    def kod(self, deger):
+        konum = self.sozluk.get_indexer([deger])[0]
+        return None if konum < 0 else konum
+
+    def esit(self, deger):
+        kod = self.kod(deger)
+        if kod is None:
+            return bos_bitmap(self.n)
+        if self.bitmapler is not None:
+            return self.bitmapler[kod]
+        return self._bitmap_olustur(kod)
+
+    def kodlarda(self, kodlar):
+        """Verilen kodlardan herhangi birine sahip satırların bitmapi."""
+        return np.packbits(np.isin(self.kodlar, kodlar))
+
+
+class SiraliIndeks:
+    """Eşik sorguları için değerlerine göre sıralanmış bir sayısal sütun."""
+
+    def __init__(self, degerler):
+        self.n = len(degerler)
+        self.siralama = np.argsort(degerler, kind='stable')
+        self.sirali = np.asarray(degerler)[self.siralama]
+
+    def _aralik(self, bas, son):
+        # Geçen satır sayısı azsa onları işaretle, çoksa tümünden kalanları sil
+        if son - bas <= self.n // 2:
+            return satirlardan_bitmap(self.siralama[bas:son], self.n)
+        maske = np.ones(self.n, dtype=bool)
+        maske[self.siralama[:bas]] = False
+        maske[self.siralama[son:]] = False
+        return np.packbits(maske)
+
+    def en_az(self, esik):
+        return self._aralik(np.searchsorted(self.sirali, esik, side='left'), self.n)
+
+    def en_cok(self, esik):
+        return self._aralik(0, np.searchsorted(self.sirali, esik, side='right'))
+
+
+def bos_bitmap(n):
+    return np.zeros((n + 7) // 8, dtype=np.uint8)
+
+
+def satirlardan_bitmap(satirlar, n):
+    maske = np.zeros(n, dtype=bool)
+    maske[satirlar] = True
+    return np.packbits(maske)
+
+
+class FiltreIndeksi:
+    """Genişletilmiş katalog üzerinde önceden hazırlanmış filtre indeksleri.
+
+    Bir sorgu tüm kısıtların bitmaplerinin kesişimi ve tek bir `take` işlemidir;
+    filtre başına ara DataFrame kopyası oluşturulmaz.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.n = len(df)
+        self.kategorik = {col: KategorikIndeks(df[col]) for col in KATEGORIK_SUTUNLAR}
+        self.sayisal = {col: SiraliIndeks(df[col].to_numpy()) for col in SAYISAL_SUTUNLAR}
+
+        # kullanim_amaci çok değerlidir ("Aile/Konfor"): değer sözlüğü ve parça (token) indeksi
+        self.kullanim = KategorikIndeks(df['kullanim_amaci'])
+        parcalar = {}
+        for kod, deger in enumerate(self.kullanim.sozluk):
+            for parca in str(deger).split('/'):
+                parca = parca.strip().lower()
+                if parca:
+                    parcalar.setdefault(parca, []).append(kod)
+        self.kullanim_parcalari = {parca: np.array(kodlar) for parca, kodlar in parcalar.items()}
+
+    def __len__(self):
+        return self.n
+
+    def kullanim_iceren(self, deger):
+        """Kullanım amacı `deger` metnini içeren satırlar (büyük/küçük harf duyarsız)."""
+        eslesen = np.flatnonzero(
+            self.kullanim.sozluk.astype(str).str.contains(deger, case=False, regex=False)
+        )
+        return self.kullanim.kodlarda(eslesen)
+
+    def kullanim_parcasi(self, parca):
+        """Kullanım amacının '/' ile ayrılmış parçalarından biri `parca` olan satırlar."""
+        kodlar = self.kullanim_parcalari.get(parca.strip().lower())
+        if kodlar is None:
+            return bos_bitmap(self.n)
+        return self.kullanim.kodlarda(kodlar)
+
+    def bitmap(self, esitlikler=None, kullanim=None, en_az=None, en_cok=None):
+        """Tüm aktif kısıtların kesişim bitmapini döndürür. Kısıt yoksa None döner."""
+        parcalar = []
+        for col, deger in (esitlikler or {}).items():
+            parcalar.append(self.kategorik[col].esit(deger))
+        if kullanim is not None:
+            parcalar.append(self.kullanim_iceren(kullanim))
+        for col, esik in (en_az or {}).items():
+            parcalar.append(self.sayisal[col].en_az(esik))
+        for col, esik in (en_cok or {}).items():
+            parcalar.append(self.sayisal[col].en_cok(esik))
+        if not parcalar:
+            return None
+        return np.bitwise_and.reduce(parcalar) if len(parcalar) > 1 else parcalar[0]
+
+    def satirlar(self, **kisitlar):
+        """Kısıtları sağlayan satırların konumları (artan sırada)."""
+        bitmap = self.bitmap(**kisitlar)
+        if bitmap is None:
+            return np.arange(self.n)
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n))
+
+    def sayilar(self, col, **kisitlar):
+        """Kısıtları sağlayan satırlarda `col` sözlüğündeki her değerin sayısı (tek `bincount`)."""
+        indeks = self.kullanim if col == 'kullanim_amaci' else self.kategorik[col]
+        bitmap = self.bitmap(**kisitlar)
+        kodlar = indeks.kodlar if bitmap is None else indeks.kodlar[np.unpackbits(bitmap, count=self.n).view(bool)]
+        return np.bincount(kodlar[kodlar >= 0], minlength=len(indeks.sozluk))
+
+    def filtrele(self, **kisitlar):
+        """Kısıtları sağlayan satırları tek bir `take` ile döndürür."""
+        return self.df.take(self.satirlar(**kisitlar))
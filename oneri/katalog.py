@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+ZORUNLU_SUTUNLAR = [
+    'model', 'marka', 'motor_donanim', 'fiyat_tl', 'donanim_skor',
+    'guvenlik_skor', 'performans_skor', 'konfor_skor', 'ikinci_el_skor',
+    'tuketim_kwh', 'ev_sarj_tl', 'yillik_mtv', 'yillik_sigorta',
+    'yillik_bakim', 'ortalama_tuketim', 'beygir_gucu', 'tork_nm',
+    'hizlanma_0_100s', 'elektrikli_menzil_km', 'gövde_uzunlugu_mm',
+    'bagaj_hacmi_lt', 'kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci'
+]
+SKOR_SUTUNLARI = ['donanim_skor', 'guvenlik_skor', 'performans_skor', 'konfor_skor', 'ikinci_el_skor']
+MALIYET_SUTUNLARI = [
+    'tuketim_kwh', 'ev_sarj_tl', 'yillik_mtv', 'yillik_sigorta',
+    'yillik_bakim', 'fiyat_tl', 'ortalama_tuketim', 'beygir_gucu',
+    'tork_nm', 'hizlanma_0_100s', 'elektrikli_menzil_km', 'gövde_uzunlugu_mm',
+    'bagaj_hacmi_lt'
+]
+METIN_SUTUNLARI = ['marka', 'model', 'motor_donanim', 'kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci']
+
+# Sözlükle kodlanan metin sütunları (değerler satır başına yalnızca bir tamsayı kodu tutar)
+KATEGORIK_SUTUNLAR = [
+    'marka', 'model', 'motor_donanim', 'kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci', 'marka_sitesi'
+]
+
+# Dar sayısal tipler: skorlar ve ondalıklı değerler float32, tam sayılar int32
+DAR_TIPLER = {
+    'fiyat_tl': np.float32,
+    'donanim_skor': np.float32,
+    'guvenlik_skor': np.float32,
+    'performans_skor': np.float32,
+    'konfor_skor': np.float32,
+    'ikinci_el_skor': np.float32,
+    'tuketim_kwh': np.float32,
+    'ev_sarj_tl': np.float32,
+    'yillik_mtv': np.int32,
+    'yillik_sigorta': np.int32,
+    'yillik_bakim': np.int32,
+    'ortalama_tuketim': np.float32,
+    'beygir_gucu': np.int32,
+    'tork_nm': np.int32,
+    'hizlanma_0_100s': np.float32,
+    'elektrikli_menzil_km': np.int32,
+    'gövde_uzunlugu_mm': np.int32,
+    'bagaj_hacmi_lt': np.int32,
+}
+
+
+class KatalogHatasi(ValueError):
+    """Katalog dosyasında zorunlu bir sütun eksik."""
+
+    def __init__(self, sutun):
+        super().__init__(f"Katalogda '{sutun}' sütunu eksik.")
+        self.sutun = sutun
+
+
+def dogrula(df):
+    """Zorunlu sütunları kontrol eder, sayısal ve metin sütunlarını temizleyip kompakt hale getirir."""
+    for col in ZORUNLU_SUTUNLAR:
+        if col not in df.columns:
+            raise KatalogHatasi(col)
+
+    for col in SKOR_SUTUNLARI + MALIYET_SUTUNLARI:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    for col in METIN_SUTUNLARI:
+        df[col] = df[col].astype(str).str.strip().replace('nan', '')
+
+    # Metin sütunları sözlük kodlu, sayısal sütunlar dar tiplerle tutulur
+    return kompakt(df)
+
+
+def csv_oku(file_path):
+    """CSV katalogunu okuyup doğrular."""
+    return dogrula(pd.read_csv(file_path, sep=',', quotechar='"', skipinitialspace=True))
+
+
+def kodla(seri):
+    """Bir sütunun (kodlar, değer sözlüğü) çiftini döndürür; kategorik sütunlarda kopya yapmaz."""
+    if isinstance(seri.dtype, pd.CategoricalDtype) and not seri.cat.codes.lt(0).any():
+        return seri.cat.codes.to_numpy(), seri.cat.categories
+    kodlar, sozluk = pd.factorize(seri.astype(str), use_na_sentinel=False)
+    return kodlar, pd.Index(sozluk)
+
+
+def kompakt(df):
+    """Katalogu sözlük kodlu metin sütunları ve dar sayısal tiplerle yeniden oluşturur."""
+    tipler = {col: 'category' for col in KATEGORIK_SUTUNLAR if col in df.columns}
+    tipler.update({col: tip for col, tip in DAR_TIPLER.items() if col in df.columns})
+    return df.astype(tipler)
+
+
+def bellek_raporu(df):
+    """Toplam bayt, satır başına bayt ve sütun bazında bellek kullanımını döndürür."""
+    sutunlar = df.memory_usage(deep=True, index=True)
+    toplam = int(sutunlar.sum())
+    return {
+        'satir': len(df),
+        'toplam_bayt': toplam,
+        'satir_basina_bayt': toplam / len(df) if len(df) else 0.0,
+        'sutunlar': {str(col): int(bayt) for col, bayt in sutunlar.items()},
+    }
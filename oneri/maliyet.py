@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# PHEV varsayımı: elektrikli menzili olan araçlar yolun %35'ini elektrikle gidiyor
+PHEV_ELEKTRIK_ORANI = 0.35
+PHEV_BENZIN_ORANI = 0.65
+PHEV_VARSAYILAN_KWH = 15.0
+LPG_FIYAT_ORANI = 0.70
+
+
+def yakit_maliyeti_hesapla(df, yillik_km, yakit_fiyat, elektrik_fiyat):
+    """Tüm araçların yıllık yakıt/enerji maliyetini tek seferde hesaplar.
+
+    Girdiler skaler ise (araç sayısı,) boyutlu bir dizi döner. Bir veya daha fazla
+    girdi dizi olarak verilirse (ör. farklı km veya fiyat senaryoları) girdiler
+    birbirine yayınlanır ve (araç sayısı, senaryo sayısı) boyutlu bir matris döner.
+    """
+    km = np.asarray(yillik_km, dtype=float)
+    yakit = np.asarray(yakit_fiyat, dtype=float)
+    elektrik = np.asarray(elektrik_fiyat, dtype=float)
+    senaryolu = km.ndim > 0 or yakit.ndim > 0 or elektrik.ndim > 0
+    km, yakit, elektrik = (np.ravel(x)[np.newaxis, :] for x in np.broadcast_arrays(km, yakit, elektrik))
+
+    yakit_tipi = df['yakit_tipi']
+    tuketim_kwh = df['tuketim_kwh'].to_numpy(dtype=float)[:, np.newaxis]
+    ortalama_tuketim = df['ortalama_tuketim'].to_numpy(dtype=float)[:, np.newaxis]
+    menzil = df['elektrikli_menzil_km'].to_numpy(dtype=float)[:, np.newaxis]
+
+    # Karşılaştırmalar kategorik sütunlarda kodlar üzerinden yapılır
+    elektrikli = (yakit_tipi == 'Elektrikli').to_numpy()[:, np.newaxis]
+    phev = (yakit_tipi == 'Plug-in Hibrit').to_numpy()[:, np.newaxis] & (menzil > 0)
+    lpg = (yakit_tipi == 'LPG').to_numpy()[:, np.newaxis]
+
+    # 4. Benzin, Dizel, Hibrit ve menzili olmayan PHEV (L/100km kullananlar)
+    yillik_tuketim_litre = (km / 100) * ortalama_tuketim
+    maliyet = yillik_tuketim_litre * yakit
+
+    # 3. LPG'li Araçlar
+    maliyet = np.where(lpg, yillik_tuketim_litre * (yakit * LPG_FIYAT_ORANI), maliyet)
+
+    # 2. Plug-in Hibrit (PHEV)
+    tuketim_kwh_100km = np.where(tuketim_kwh > 0, tuketim_kwh, PHEV_VARSAYILAN_KWH)
+    phev_maliyet = (
+        ((km * PHEV_ELEKTRIK_ORANI) / 100) * tuketim_kwh_100km * elektrik
+        + ((km * PHEV_BENZIN_ORANI) / 100) * ortalama_tuketim * yakit
+    )
+    maliyet = np.where(phev, phev_maliyet, maliyet)
+
+    # 1. Tam Elektrikli Araçlar
+    maliyet = np.where(elektrikli, ((km / 100) * tuketim_kwh) * elektrik, maliyet)
+
+    return maliyet if senaryolu else maliyet[:, 0]
+
+
+def isletme_maliyeti_hesapla(df, yillik_km, yakit_fiyat, elektrik_fiyat):
+    """Yakıt maliyeti ile toplam yıllık işletme maliyetini birlikte döndürür.
+
+    Senaryo dizileri verilirse her iki sonuç da (araç sayısı, senaryo sayısı) boyutludur.
+    """
+    yakit_maliyeti = yakit_maliyeti_hesapla(df, yillik_km, yakit_fiyat, elektrik_fiyat)
+    toplam = yakit_maliyeti
+    for col in ['yillik_mtv', 'yillik_sigorta', 'yillik_bakim']:
+        sabit = df[col].to_numpy(dtype=float)
+        toplam = toplam + (sabit[:, np.newaxis] if toplam.ndim > 1 else sabit)
+    return yakit_maliyeti, toplam
+
+
+def isletme_maliyeti_ekle(df, yillik_km, yakit_fiyat, elektrik_fiyat):
+    """Yillik_Yakit_Maliyeti ve Toplam_Isletme_Maliyeti sütunlarını ekleyip DataFrame'i döndürür."""
+    yakit_maliyeti, toplam = isletme_maliyeti_hesapla(df, yillik_km, yakit_fiyat, elektrik_fiyat)
+    return df.assign(Yillik_Yakit_Maliyeti=yakit_maliyeti, Toplam_Isletme_Maliyeti=toplam)
+
+
+def senaryo_tablosu(df, yillik_km, yakit_fiyat, elektrik_fiyat, toplam=True):
+    """Girdi listelerinin tüm kombinasyonları için maliyet tablosu üretir (filo bazlı ne-olursa analizi).
+
+    Satırlar araçlar, sütunlar (yillik_km, yakit_fiyat, elektrik_fiyat) üçlüleridir.
+    """
+    km, yakit, elektrik = (g.ravel() for g in np.meshgrid(
+        np.atleast_1d(yillik_km), np.atleast_1d(yakit_fiyat), np.atleast_1d(elektrik_fiyat), indexing='ij'
+    ))
+    yakit_maliyeti, toplam_maliyet = isletme_maliyeti_hesapla(df, km, yakit, elektrik)
+    sutunlar = pd.MultiIndex.from_arrays([km, yakit, elektrik], names=['yillik_km', 'yakit_fiyat', 'elektrik_fiyat'])
+    return pd.DataFrame(toplam_maliyet if toplam else yakit_maliyeti, index=df.index, columns=sutunlar)
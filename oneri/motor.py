@@ -0,0 +1,229 @@
+"""Streamlit'ten bağımsız öneri motoru.
+
+    motor = OneriMotoru.dosyadan('arabalar.csv')
+    motor.recommend(Sorgu(butce=2_000_000, kasa_tipi='SUV'))
+    motor.recommend_many([Sorgu(...), Sorgu(...)])
+"""
+from dataclasses import asdict, dataclass, fields
+
+import numpy as np
+
+from oneri.genisletme import DONANIM_SEVIYELERI, donanim_genislet, temizle
+from oneri.indeks import FiltreIndeksi
+from oneri.katalog import kompakt
+from oneri.maliyet import isletme_maliyeti_ekle
+from oneri.onbellek import LRUOnbellek
+from oneri.siralama import Siralama
+from oneri.skor import kriter_matrisi, kriter_skorlari_ekle, toplam_skor
+
+FARKETMEZ = 'Farketmez'
+
+# Sorgu alanı -> genişletilmiş katalogdaki sütun
+TEKLI_SECIMLER = {
+    'marka': 'marka',
+    'model': 'model',
+    'motor': 'motor_donanim',
+    'kasa_tipi': 'kasa_tipi',
+    'yakit_tipi': 'yakit_tipi',
+    'sanziman': 'sanziman',
+}
+ESIKLER = {
+    'min_performans': 'performans_skor',
+    'min_guvenlik': 'guvenlik_skor',
+    'min_beygir_gucu': 'beygir_gucu',
+    'min_bagaj_hacmi': 'bagaj_hacmi_lt',
+    'min_menzil': 'elektrikli_menzil_km',
+}
+MALIYET_ALANLARI = ['yillik_km', 'yakit_fiyat', 'elektrik_fiyat']
+AGIRLIK_ALANLARI = ['onem_performans', 'onem_ikinci_el', 'onem_guvenlik', 'onem_konfor', 'onem_tuketim']
+
+
+def _normalize(deger):
+    """Önbellek anahtarları için kanonik değer: sayılar float, metinler kırpılmış."""
+    if deger is None or isinstance(deger, str):
+        return deger.strip() if isinstance(deger, str) else deger
+    return float(deger)
+
+
+@dataclass(frozen=True)
+class Sorgu:
+    """Bir kullanıcının sidebar'daki tüm tercihleri. Varsayılanlar sayfanın açılış durumudur."""
+
+    butce: float | None = None
+    marka: str = FARKETMEZ
+    model: str = FARKETMEZ
+    motor: str = FARKETMEZ
+    kasa_tipi: str = FARKETMEZ
+    yakit_tipi: str = FARKETMEZ
+    sanziman: str = FARKETMEZ
+    kullanim_amaci: str = FARKETMEZ
+    min_performans: float = 1
+    min_guvenlik: float = 1
+    min_beygir_gucu: float = 0
+    min_bagaj_hacmi: float = 0
+    min_menzil: float = 0
+    yillik_km: float = 15000
+    yakit_fiyat: float = 40.0
+    elektrik_fiyat: float = 2.5
+    onem_tuketim: float = 3
+    onem_performans: float = 3
+    onem_ikinci_el: float = 3
+    onem_guvenlik: float = 3
+    onem_konfor: float = 3
+    k: int = 30
+
+    @classmethod
+    def sozlukten(cls, veri):
+        """Bilinmeyen anahtarları yok sayarak bir sözlükten sorgu oluşturur."""
+        alanlar = {alan.name for alan in fields(cls)}
+        return cls(**{anahtar: deger for anahtar, deger in veri.items() if anahtar in alanlar})
+
+    def sozluk(self):
+        return asdict(self)
+
+    def kisitlar(self):
+        """FiltreIndeksi için kısıt sözlüğü."""
+        en_cok = {} if self.butce is None else {'fiyat_tl': self.butce}
+        return dict(
+            esitlikler={col: getattr(self, alan) for alan, col in TEKLI_SECIMLER.items() if getattr(self, alan) != FARKETMEZ},
+            kullanim=self.kullanim_amaci if self.kullanim_amaci != FARKETMEZ else None,
+            en_az={col: getattr(self, alan) for alan, col in ESIKLER.items()},
+            en_cok=en_cok,
+        )
+
+    def alanlar_anahtari(self, alanlar):
+        """Verilen alanların normalize edilmiş değerleri."""
+        return tuple(_normalize(getattr(self, alan)) for alan in alanlar)
+
+    def filtre_anahtari(self):
+        return self.alanlar_anahtari(['butce', 'kullanim_amaci', *TEKLI_SECIMLER, *ESIKLER])
+
+    def aday_anahtari(self):
+        """Aday kümesini (filtre + maliyet + normalizasyon) belirleyen alanlar; ağırlıklar hariç."""
+        return self.filtre_anahtari() + self.alanlar_anahtari(MALIYET_ALANLARI)
+
+    def anahtar(self):
+        """Sorgunun tamamının kanonik biçimi (sonuç önbelleği anahtarı)."""
+        return self.aday_anahtari() + self.alanlar_anahtari([*AGIRLIK_ALANLARI, 'k'])
+
+    def agirliklar(self):
+        """KRITERLER sırasında ağırlık vektörü."""
+        return [getattr(self, alan) for alan in AGIRLIK_ALANLARI]
+
+
+class AdayKumesi:
+    """Filtrelenmiş, maliyetleri ve kriter skorları hesaplanmış araçlar."""
+
+    def __init__(self, df, matris):
+        self.df = df
+        self.matris = matris
+
+    @property
+    def bos(self):
+        return self.df.empty
+
+    def bayt(self):
+        return int(self.df.memory_usage(index=True, deep=False).sum()) + self.matris.nbytes
+
+    def skorla(self, agirliklar):
+        """Toplam_Skor vektörü (tek ağırlık seti) veya matrisi (ağırlık seti grubu)."""
+        return toplam_skor(self.matris, agirliklar)
+
+    def ilk(self, skorlar, k, baslangic=0):
+        """Skorlara göre [baslangic, baslangic + k) sıralarındaki araçlar, Toplam_Skor sütunuyla."""
+        return self.sirala(skorlar, Siralama(skorlar).ilk(k, baslangic))
+
+    def sirala(self, skorlar, konumlar):
+        return self.df.take(konumlar).assign(Toplam_Skor=np.asarray(skorlar)[konumlar]).reset_index(drop=True)
+
+
+class OneriMotoru:
+    """Bir katalog sürümü için genişletme ve indeksleri bir kez hazırlayıp sorgu yanıtlar.
+
+    Aday kümeleri motor içinde küçük bir LRU önbellekte tutulur (ağırlık değişiklikleri
+    yalnızca skor çarpımını yeniler). İsteğe bağlı `onbellek` tüm sonuçlar için süreç
+    geneli bir LRU önbellektir; `surum` değiştiğinde kendiliğinden boşalır.
+    """
+
+    def __init__(self, katalog, seviyeler=DONANIM_SEVIYELERI, genis=None, surum=None, onbellek=None):
+        self.katalog = katalog
+        self.seviyeler = seviyeler
+        self.surum = surum
+        self.onbellek = onbellek
+        self.genis = kompakt(donanim_genislet(temizle(katalog), seviyeler)) if genis is None else genis
+        self.indeks = FiltreIndeksi(self.genis)
+        self.aday_onbellegi = LRUOnbellek(maks_giris=32, maks_bayt=max(256 * 1024 * 1024, 4 * self._genis_bayt()))
+
+    def _genis_bayt(self):
+        return int(self.genis.memory_usage(index=True, deep=False).sum())
+
+    @classmethod
+    def genisletilmisten(cls, genis, **kwargs):
+        """Önceden genişletilmiş bir katalogdan (ör. bellek eşlemeli kopya) motor oluşturur."""
+        return cls(None, genis=genis, **kwargs)
+
+    @classmethod
+    def dosyadan(cls, file_path, seviyeler=DONANIM_SEVIYELERI, **kwargs):
+        # oneri.depo komut satırından da çalıştırıldığı için burada içe aktarılır
+        from oneri.depo import katalog_oku
+        return cls(katalog_oku(file_path), seviyeler, **kwargs)
+
+    def filtrele(self, sorgu):
+        return self.indeks.filtrele(**sorgu.kisitlar())
+
+    def _adaylari_hesapla(self, sorgu, filtreli=None):
+        df = self.filtrele(sorgu) if filtreli is None else filtreli
+        df = isletme_maliyeti_ekle(df, sorgu.yillik_km, sorgu.yakit_fiyat, sorgu.elektrik_fiyat)
+        df = kriter_skorlari_ekle(df)
+        return AdayKumesi(df, kriter_matrisi(df))
+
+    def adaylar(self, sorgu, filtreli=None):
+        """Sorgunun aday kümesi. Önceden filtrelenmiş bir DataFrame verilirse filtreleme atlanır."""
+        return self.aday_onbellegi.getir(sorgu.aday_anahtari(), lambda: self._adaylari_hesapla(sorgu, filtreli))
+
+    def recommend(self, sorgu):
+        """Sorgu için en iyi `sorgu.k` aracı Toplam_Skor sırasıyla döndürür.
+
+        Dönen DataFrame önbellekte paylaşılabilir; yerinde değiştirilmemelidir.
+        """
+        if self.onbellek is not None:
+            return self.onbellek.getir(sorgu.anahtar(), lambda: self._oner(sorgu), self.surum)
+        return self._oner(sorgu)
+
+    def _oner(self, sorgu):
+        adaylar = self.adaylar(sorgu)
+        return adaylar.ilk(adaylar.skorla(sorgu.agirliklar()), sorgu.k)
+
+    def recommend_many(self, sorgular):
+        """Sorgu listesini yanıtlar (sonuçlar girdiyle aynı sırada).
+
+        Aynı filtreleri paylaşan sorgular bir kez filtrelenir, aynı maliyet
+        girdilerini de paylaşanlar bir kez maliyetlendirilir ve tüm ağırlık
+        setleri tek bir matris çarpımıyla skorlanır.
+        """
+        sorgular = list(sorgular)
+        sonuclar = [None] * len(sorgular)
+        gruplar = {}
+        for i, sorgu in enumerate(sorgular):
+            if self.onbellek is not None:
+                sonuclar[i] = self.onbellek.al(sorgu.anahtar(), self.surum)
+                if sonuclar[i] is not None:
+                    continue
+            gruplar.setdefault(sorgu.filtre_anahtari(), {}).setdefault(sorgu.aday_anahtari(), []).append(i)
+
+        for alt_gruplar in gruplar.values():
+            filtreli = None
+            for indisler in alt_gruplar.values():
+                ilk_sorgu = sorgular[indisler[0]]
+                adaylar = self.aday_onbellegi.al(ilk_sorgu.aday_anahtari())
+                if adaylar is None:
+                    if filtreli is None:
+                        filtreli = self.filtrele(ilk_sorgu)
+                    adaylar = self._adaylari_hesapla(ilk_sorgu, filtreli)
+                    self.aday_onbellegi.koy(ilk_sorgu.aday_anahtari(), adaylar)
+                skorlar = adaylar.skorla([sorgular[i].agirliklar() for i in indisler])
+                for j, i in enumerate(indisler):
+                    sonuclar[i] = adaylar.ilk(skorlar[:, j], sorgular[i].k)
+                    if self.onbellek is not None:
+                        self.onbellek.koy(sorgular[i].anahtar(), sonuclar[i], self.surum)
+        return sonuclar
@@ -0,0 +1,336 @@
+"""Serbest metin notunu ("Kişisel Analiz Notu") tek geçişte ayrıştırıp sorguya uygular.
+
+Metin tek bir derlenmiş desenle sayı/kelime parçalarına ayrılır. İfadeler (kasa, yakıt,
+vites, katalogdaki marka ve model adları, öncelik ipuçları) parça dizileri olarak bir
+sözlükte aranır; arama süresi sözlüğün büyüklüğünden bağımsızdır. Sabit ifadelerin son
+kelimesi yalnızca izin verilen eklerle (-li, çoğul, hâl ve iyelik ekleri) uzamışsa da
+eşleşir ("bagajlı", "dizelli", "elektrikliler"); anlamı tersine çeviren -siz eki ve 3
+harfe kadar kısa ifadeler ekli eşleşmez. Marka ve model adları (ekleri kesme işaretiyle
+ayrılır) tam eşleşmelidir.
+
+    ayristirici = NotAyristirici.katalogdan(secenek_agaci)
+    sorgu, uyarilar = notu_uygula(sorgu, "1.5 milyon TL altı, 150 hp üstü hibrit SUV", ayristirici)
+"""
+
+import dataclasses
+import re
+from dataclasses import dataclass
+
+from oneri.motor import FARKETMEZ
+from oneri.onbellek import LRUOnbellek
+
+PARCA_DESENI = re.compile(r'(?P<sayi>\d+(?:[.,]\d+)*)|(?P<kelime>[^\W_]+(?:-[^\W\d_][^\W_]*)*)|(?P<tire>-)')
+BINLIK_DESENI = re.compile(r'\d{1,3}(?:[.,]\d{3})+')
+
+KASA_TIPLERI = ['SUV', 'Sedan', 'Hatchback', 'Station Wagon', 'Coupe', 'Pick-up']
+YAKIT_TIPLERI = ['Dizel', 'Benzin', 'Elektrikli', 'Hibrit', 'LPG']
+SANZIMAN_TIPLERI = ['Otomatik', 'Manuel']
+BAGAJ_IFADELERI = ['geniş bagaj', 'büyük bagaj', 'yük taşıma']
+GENIS_BAGAJ_LT = 400
+
+# Sabit ifadelerin son kelimesine gelebilecek ekler (küçültülmüş biçimde, ı -> i)
+EKLER = [
+    'li', 'lu', 'lü', 'lik', 'liğ', 'luk', 'luğ', 'lük', 'lüğ', 'ler', 'lar', 'ce', 'ca',
+    'i', 'u', 'ü', 'e', 'a', 'yi', 'yu', 'yü', 'ye', 'ya', 'ni', 'nu', 'nü', 'ne', 'na',
+    'si', 'su', 'sü', 'in', 'un', 'ün', 'nin', 'nun', 'nün', 'le', 'la', 'yle', 'yla',
+    'de', 'da', 'te', 'ta', 'den', 'dan', 'ten', 'tan', 'nde', 'nda', 'nden', 'ndan',
+]
+EK_DESENI = re.compile('(?:' + '|'.join(sorted(EKLER, key=len, reverse=True)) + ')+')
+# Yokluk eki: "rahatsız", "konforsuz" ifadenin tersini söyler
+YOKLUK_DESENI = re.compile('s[iuü]z')
+EKSIZ_UZUNLUK = 3
+
+# Eş anlamlılar: ifade -> (alan, değer)
+ES_ANLAMLILAR = {
+    'pickup': ('kasa_tipi', 'Pick-up'),
+    'kamyonet': ('kasa_tipi', 'Pick-up'),
+    'hb': ('kasa_tipi', 'Hatchback'),
+    'mazot': ('yakit_tipi', 'Dizel'),
+    'benzinli': ('yakit_tipi', 'Benzin'),
+    'dizel motor': ('yakit_tipi', 'Dizel'),
+    'elektrik': ('yakit_tipi', 'Elektrikli'),
+    'hybrid': ('yakit_tipi', 'Hibrit'),
+    'plug-in': ('yakit_tipi', 'Plug-in Hibrit'),
+    'şarj edilebilir hibrit': ('yakit_tipi', 'Plug-in Hibrit'),
+    'otomatik vites': ('sanziman', 'Otomatik'),
+    'manuel vites': ('sanziman', 'Manuel'),
+    'düz vites': ('sanziman', 'Manuel'),
+}
+
+ONCELIK_IFADELERI = {
+    'onem_tuketim': ['ekonomik', 'tasarruflu', 'az yakan', 'düşük maliyet', 'yakıt cimrisi'],
+    'onem_performans': ['performans', 'hızlı', 'sportif', 'güçlü', 'çevik'],
+    'onem_guvenlik': ['güvenli', 'güvenlik', 'güvenlikli'],
+    'onem_konfor': ['konfor', 'konforlu', 'sessiz', 'rahat'],
+    'onem_ikinci_el': ['ikinci el', '2. el', 'değerini koruyan', 'değer kaybı'],
+}
+ONCELIK_ADLARI = {
+    'onem_tuketim': 'İşletme Maliyeti',
+    'onem_performans': 'Performans',
+    'onem_guvenlik': 'Güvenlik',
+    'onem_konfor': 'Konfor',
+    'onem_ikinci_el': 'İkinci El Değeri',
+}
+
+CARPANLAR = {'bin': 1_000, 'milyon': 1_000_000}
+BIRIMLER = {
+    'tl': 'tl', 'lira': 'tl',
+    'hp': 'hp', 'bg': 'hp', 'ps': 'hp', 'beygir': 'hp',
+    'km': 'km',
+    'lt': 'lt', 'litre': 'lt', 'l': 'lt',
+}
+ARALIK_AYIRICILARI = {'-', 'ile', 'veya'}
+BAGLAM_PENCERESI = 3
+
+
+def kucult(metin):
+    """Türkçe büyük/küçük harf ve noktalı/noktasız i farkını yok sayan biçim."""
+    return metin.replace('İ', 'i').lower().replace('ı', 'i')
+
+
+def parcala(metin):
+    """Metni (tür, değer) parçalarına ayırır; tür 'sayi', 'kelime' veya 'tire'."""
+    return [(eslesme.lastgroup, eslesme.group()) for eslesme in PARCA_DESENI.finditer(kucult(metin))]
+
+
+def sayi_oku(metin, carpanli):
+    """'1.5' / '1,5' ondalık, '750.000' binlik ayraçlı sayı olarak okunur."""
+    if not carpanli and BINLIK_DESENI.fullmatch(metin):
+        return float(re.sub(r'[.,]', '', metin))
+    try:
+        return float(metin.replace(',', '.'))
+    except ValueError:
+        return float(re.sub(r'[.,]', '', metin))
+
+
+@dataclass(frozen=True)
+class NotAnalizi:
+    """Nottan çıkarılan istekler; bulunmayan alanlar None."""
+    butce: float | None = None
+    marka: str | None = None
+    model: str | None = None
+    kasa_tipi: str | None = None
+    yakit_tipi: str | None = None
+    sanziman: str | None = None
+    min_beygir_gucu: float | None = None
+    min_bagaj_hacmi: float | None = None
+    genis_bagaj: bool = False
+    min_menzil: float | None = None
+    yillik_km: float | None = None
+    oncelikler: tuple = ()
+
+
+class NotAyristirici:
+    """Sabit ve katalogdan gelen ifadeler için bir kez hazırlanan ayrıştırıcı.
+
+    Sonuçlar metne göre bir LRU önbellekte tutulur; aynı not her rerun'da yeniden
+    ayrıştırılmaz.
+    """
+
+    def __init__(self, markalar=(), model_markalari=None, degerler=None):
+        self.model_markalari = model_markalari or {}
+        self.ifadeler = {}
+        self.ekli_ifadeler = {}
+        for model, model_markalari in self.model_markalari.items():
+            if all(tur == 'sayi' for tur, _ in parcala(model)):
+                # Yalnızca sayıdan oluşan adlar ("2008", "208") yıl ve sayılarla karışır; marka adıyla aranır
+                for marka in model_markalari:
+                    self._ekle(f"{marka} {model}", ('marka_model', (marka, model)), ekli=False)
+            else:
+                self._ekle(model, ('model', model), ekli=False)
+        for marka in markalar:
+            self._ekle(marka, ('marka', marka), ekli=False)
+        degerler = degerler or {}
+        for alan, sabitler in [('kasa_tipi', KASA_TIPLERI), ('yakit_tipi', YAKIT_TIPLERI), ('sanziman', SANZIMAN_TIPLERI)]:
+            for deger in [*sabitler, *degerler.get(alan, [])]:
+                self._ekle(deger, (alan, deger))
+        for ifade, hedef in ES_ANLAMLILAR.items():
+            self._ekle(ifade, hedef)
+        for ifade in BAGAJ_IFADELERI:
+            self._ekle(ifade, ('genis_bagaj', True))
+        for alan, ifadeler in ONCELIK_IFADELERI.items():
+            for ifade in ifadeler:
+                self._ekle(ifade, ('oncelik', alan))
+        self.en_uzun = max((len(anahtar) for anahtar in self.ifadeler), default=1)
+        self.onbellek = LRUOnbellek(maks_giris=1024)
+
+    @classmethod
+    def katalogdan(cls, secenekler):
+        """SecenekAgaci'ndaki marka, model ve kategori değerleriyle ayrıştırıcı oluşturur."""
+        return cls(secenekler.markalar, secenekler.model_markalari(), secenekler.degerler)
+
+    def _ekle(self, ifade, hedef, ekli=True):
+        anahtar = tuple(deger for _, deger in parcala(ifade))
+        # Tek karakterlik ifadeler (ör. 'l') sıradan kelimelerle karışır
+        if anahtar and len(''.join(anahtar)) > 1:
+            self.ifadeler.setdefault(anahtar, hedef)
+            if ekli and len(''.join(anahtar)) > EKSIZ_UZUNLUK:
+                self.ekli_ifadeler.setdefault(anahtar, hedef)
+
+    def ayristir(self, metin):
+        """Notu NotAnalizi'ne çevirir (sonuç metne göre önbelleklenir)."""
+        metin = (metin or '').strip()
+        return self.onbellek.getir(metin, lambda: self._ayristir(metin))
+
+    def _miktar(self, parcalar, i):
+        """i'deki sayıdan başlayan miktar: (değer, çarpan, birim, sonraki konum)."""
+        j = i + 1
+        carpan = None
+        if j < len(parcalar) and parcalar[j][1] in CARPANLAR:
+            carpan = CARPANLAR[parcalar[j][1]]
+            j += 1
+        birim = None
+        if j < len(parcalar) and parcalar[j][1] in BIRIMLER:
+            birim = BIRIMLER[parcalar[j][1]]
+            j += 1
+        deger = sayi_oku(parcalar[i][1], carpan is not None) * (carpan or 1)
+        return deger, carpan, birim, j
+
+    def _ifade(self, parcalar):
+        """Parça dizisine karşılık gelen ifade; sabit ifadelerin son kelimesi izin verilen eklerle uzayabilir."""
+        hedef = self.ifadeler.get(tuple(deger for _, deger in parcalar))
+        tur, son = parcalar[-1]
+        if hedef is not None or tur != 'kelime':
+            return hedef
+        onceki = tuple(deger for _, deger in parcalar[:-1])
+        for uzunluk in range(len(son) - 1, EKSIZ_UZUNLUK - 1, -1):
+            kok, ek = son[:uzunluk], son[uzunluk:]
+            if YOKLUK_DESENI.match(ek) or not EK_DESENI.fullmatch(ek):
+                continue
+            hedef = self.ekli_ifadeler.get((*onceki, kok))
+            # Ünlüyle başlayan ekte k -> ğ yumuşaması: "güvenliği" -> "güvenlik"
+            if hedef is None and kok.endswith('ğ') and ek[0] in 'iuüea':
+                hedef = self.ekli_ifadeler.get((*onceki, kok[:-1] + 'k'))
+            if hedef is not None:
+                return hedef
+        return None
+
+    def _baglamda(self, parcalar, bas, son, kokler):
+        kelimeler = parcalar[max(0, bas - BAGLAM_PENCERESI):son + BAGLAM_PENCERESI]
+        return any(deger.startswith(kokler) for tur, deger in kelimeler if tur == 'kelime')
+
+    def _ayristir(self, metin):
+        parcalar = parcala(metin)
+        bulunan = {}
+        oncelikler = []
+        i = 0
+        while i < len(parcalar):
+            tur, deger = parcalar[i]
+            if tur == 'sayi':
+                alt, carpan, birim, j = self._miktar(parcalar, i)
+                ust = alt
+                # Aralık: "1-1.5 milyon", "500 bin ile 1 milyon"; birimsiz alt sınır üst sınırın birimini alır
+                if j + 1 < len(parcalar) and parcalar[j][1] in ARALIK_AYIRICILARI and parcalar[j + 1][0] == 'sayi':
+                    ust, ust_carpan, ust_birim, k = self._miktar(parcalar, j + 1)
+                    if carpan is None and birim is None:
+                        alt *= ust_carpan or 1
+                        carpan, birim = ust_carpan, ust_birim
+                    j = k
+                alan = self._miktar_alani(parcalar, i, j, carpan is not None, birim, ust)
+                if alan is not None:
+                    bulunan.setdefault(alan, ust if alan == 'butce' else alt)
+                    i = j
+                    continue
+
+            # En uzun ifade eşleşmesi (son kelimede ek olabilir)
+            for uzunluk in range(min(self.en_uzun, len(parcalar) - i), 0, -1):
+                hedef = self._ifade(parcalar[i:i + uzunluk])
+                if hedef is not None:
+                    alan, sonuc = hedef
+                    if alan == 'oncelik':
+                        if sonuc not in oncelikler:
+                            oncelikler.append(sonuc)
+                    elif alan == 'marka_model':
+                        bulunan.setdefault('marka', sonuc[0])
+                        bulunan.setdefault('model', sonuc[1])
+                    else:
+                        bulunan.setdefault(alan, sonuc)
+                    i += uzunluk
+                    break
+            else:
+                i += 1
+
+        if 'model' in bulunan and 'marka' not in bulunan:
+            markalar = self.model_markalari.get(bulunan['model'], [])
+            if len(markalar) == 1:
+                bulunan['marka'] = markalar[0]
+        return NotAnalizi(**bulunan, oncelikler=tuple(oncelikler))
+
+    def _miktar_alani(self, parcalar, bas, son, carpanli, birim, deger):
+        if birim == 'tl' or (carpanli and birim is None):
+            return 'butce'
+        if birim == 'hp':
+            return 'min_beygir_gucu'
+        if birim == 'lt' and self._baglamda(parcalar, bas, son, ('bagaj',)):
+            return 'min_bagaj_hacmi'
+        if birim == 'km':
+            if self._baglamda(parcalar, bas, son, ('menzil',)):
+                return 'min_menzil'
+            if self._baglamda(parcalar, bas, son, ('yil', 'sene')) or deger >= 5000:
+                return 'yillik_km'
+            return 'min_menzil'
+        return None
+
+
+VARSAYILAN_AYRISTIRICI = None
+
+
+def varsayilan_ayristirici():
+    """Yalnızca sabit ifadeleri bilen (katalogdan bağımsız) ayrıştırıcı."""
+    global VARSAYILAN_AYRISTIRICI
+    if VARSAYILAN_AYRISTIRICI is None:
+        VARSAYILAN_AYRISTIRICI = NotAyristirici()
+    return VARSAYILAN_AYRISTIRICI
+
+
+def analizi_uygula(sorgu, analiz):
+    """NotAnalizi'ni sorguya uygular; güncellenmiş sorgu ve uyarı mesajlarını döndürür."""
+    uyarilar = []
+    degisiklikler = {}
+
+    if analiz.butce is not None and (sorgu.butce is None or analiz.butce < sorgu.butce):
+        degisiklikler['butce'] = analiz.butce
+        uyarilar.append(f"Özel notunuzdaki bütçe ({analiz.butce:,.0f} TL) slider değerinden daha düşük. Bütçe filtreniz otomatik olarak güncellendi. (Sidebar'da güncellenmeyi görebilirsiniz.)")
+
+    for alan, ad in [('kasa_tipi', 'Kasa Tipi'), ('yakit_tipi', 'Yakıt Tipi'), ('sanziman', 'Vites Tipi'), ('marka', 'Marka'), ('model', 'Model')]:
+        deger = getattr(analiz, alan)
+        if deger is not None and getattr(sorgu, alan) == FARKETMEZ:
+            degisiklikler[alan] = deger
+            uyarilar.append(f"Özel notunuzdan **'{deger}'** {ad} tercihi algılandı ve filtreye uygulandı.")
+
+    if analiz.min_bagaj_hacmi is not None and sorgu.min_bagaj_hacmi < analiz.min_bagaj_hacmi:
+        degisiklikler['min_bagaj_hacmi'] = analiz.min_bagaj_hacmi
+        uyarilar.append(f"Özel notunuzdaki bagaj isteği nedeniyle minimum bagaj hacmi {analiz.min_bagaj_hacmi:,.0f} litreye yükseltildi.")
+    elif analiz.genis_bagaj and sorgu.min_bagaj_hacmi < GENIS_BAGAJ_LT:
+        degisiklikler['min_bagaj_hacmi'] = GENIS_BAGAJ_LT
+        uyarilar.append("Özel notunuzdaki 'geniş bagaj' isteği nedeniyle minimum bagaj hacmi 400 litreye yükseltildi.")
+
+    if analiz.min_beygir_gucu is not None and sorgu.min_beygir_gucu < analiz.min_beygir_gucu:
+        degisiklikler['min_beygir_gucu'] = analiz.min_beygir_gucu
+        uyarilar.append(f"Özel notunuzdan minimum {analiz.min_beygir_gucu:,.0f} HP beygir gücü isteği algılandı ve filtreye uygulandı.")
+
+    if analiz.min_menzil is not None and sorgu.min_menzil < analiz.min_menzil:
+        degisiklikler['min_menzil'] = analiz.min_menzil
+        uyarilar.append(f"Özel notunuzdan minimum {analiz.min_menzil:,.0f} km elektrikli menzil isteği algılandı ve filtreye uygulandı.")
+
+    if analiz.yillik_km is not None and analiz.yillik_km != sorgu.yillik_km:
+        degisiklikler['yillik_km'] = analiz.yillik_km
+        uyarilar.append(f"Özel notunuzdaki yıllık {analiz.yillik_km:,.0f} km kullanım, işletme maliyeti hesabına uygulandı.")
+
+    for alan in analiz.oncelikler:
+        if getattr(sorgu, alan) < 5:
+            degisiklikler[alan] = 5
+            uyarilar.append(f"Özel notunuzdan **'{ONCELIK_ADLARI[alan]}'** önceliği algılandı; bu kriterin önemi 5'e yükseltildi.")
+
+    return dataclasses.replace(sorgu, **degisiklikler), uyarilar
+
+
+def notu_uygula(sorgu, metin, ayristirici=None):
+    """Serbest metindeki istekleri sorguya uygular.
+
+    Güncellenmiş sorgu ile kullanıcıya gösterilecek uyarı mesajlarını döndürür.
+    """
+    if not metin:
+        return sorgu, []
+    analiz = (ayristirici or varsayilan_ayristirici()).ayristir(metin)
+    return analizi_uygula(sorgu, analiz)
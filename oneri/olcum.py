@@ -0,0 +1,234 @@
+"""Sayfanın her rerun'ı için aşama bazında süre, satır ve bellek ölçümü.
+
+Ölçüm kapalıyken `asama()` paylaşılan boş bir aşama döndürür, `adim()` hiçbir şey yapmaz;
+maliyet bir öznitelik kontrolüdür. Açıkken her aşama için süre (ms), giren/çıkan
+satır sayısı ve (istenirse) tracemalloc ile ayrılan tepe bellek kaydedilir. tracemalloc
+yalnızca bellek ölçen bir Olcer açıkken çalışır; sonuncusu bitince durdurulur.
+Kayıtlar JSON-lines dosyasına eklenebilir ve oturumlar arası özetlenebilir. Süreç başına
+bir kez ölçülen soğuk başlangıç süreleri (katalog hazırlama, plotly yükleme, ilk rerun'ın
+bittiği andaki süreç yaşı) ilk yazımda `soguk:` önekli kayıtlar olarak eklenir:
+
+    python -m oneri.olcum olcum.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
+
+_YAZMA_KILIDI = threading.Lock()
+
+# tracemalloc'u bu modül başlattıysa onu kullanan açık Olcer sayısı
+_BELLEK_KILIDI = threading.Lock()
+_BELLEK_OLCERLERI = 0
+
+# Süreç başına bir kez ölçülen soğuk başlangıç süreleri (ms) ve dosyaya yazılmış olanlar
+_SOGUK_BASLANGIC = {}
+_SOGUK_YAZILAN = set()
+
+
+def soguk_baslangic_kaydet(ad, sure_ms):
+    """Sürecin ilk `ad` ölçümünü kaydeder; sonraki çağrılar yok sayılır."""
+    if sure_ms is not None:
+        _SOGUK_BASLANGIC.setdefault(ad, sure_ms)
+
+
+def soguk_baslangic():
+    return dict(_SOGUK_BASLANGIC)
+
+
+def surec_yasi_ms():
+    """Sürecin başlamasından bu yana geçen süre (ms); /proc yoksa None."""
+    try:
+        with open('/proc/self/stat') as f:
+            baslangic = int(f.read().rsplit(')', 1)[1].split()[19]) / os.sysconf('SC_CLK_TCK')
+        with open('/proc/uptime') as f:
+            return (float(f.read().split()[0]) - baslangic) * 1000
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _bellek_ac():
+    """tracemalloc'u gerekirse başlatır; kapatılması gerekiyorsa True döner."""
+    global _BELLEK_OLCERLERI
+    with _BELLEK_KILIDI:
+        if _BELLEK_OLCERLERI == 0 and tracemalloc.is_tracing():
+            # Başka bir araç (ör. benchmark) izliyor; durdurmak ona kalır
+            return False
+        if _BELLEK_OLCERLERI == 0:
+            tracemalloc.start()
+        _BELLEK_OLCERLERI += 1
+        return True
+
+
+def _bellek_kapat():
+    global _BELLEK_OLCERLERI
+    with _BELLEK_KILIDI:
+        _BELLEK_OLCERLERI -= 1
+        if _BELLEK_OLCERLERI == 0:
+            tracemalloc.stop()
+
+
+def satir_sayisi(deger):
+    """Aşama çıktısının satır sayısı (bilinmiyorsa None)."""
+    if isinstance(deger, (tuple, list)) and deger and hasattr(deger[0], '__len__'):
+        deger = deger[0]
+    df = getattr(deger, 'df', deger)
+    try:
+        return len(df)
+    except TypeError:
+        return None
+
+
+class _BosAsama:
+    """Ölçüm kapalıyken kullanılan, hiçbir şey yapmayan aşama."""
+
+    def cikti(self, deger):
+        return deger
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        return False
+
+
+_BOS_ASAMA = _BosAsama()
+
+
+class _Asama:
+    def __init__(self, olcer, ad, satir_giris):
+        self.olcer = olcer
+        # satir_giris bir sayı ya da satır sayısı alınacak girdi nesnesi olabilir
+        if satir_giris is not None and not isinstance(satir_giris, int):
+            satir_giris = satir_sayisi(satir_giris)
+        self.kayit = {'asama': ad, 'satir_giris': satir_giris, 'satir_cikis': None}
+
+    def cikti(self, deger):
+        """Aşamanın çıktısını bildirir (satır sayısı kaydedilir)."""
+        self.kayit['satir_cikis'] = satir_sayisi(deger)
+        return deger
+
+    def __enter__(self):
+        self._bellek = self.olcer.bellek and tracemalloc.is_tracing()
+        if self._bellek:
+            tracemalloc.reset_peak()
+            self._bellek_baslangic = tracemalloc.get_traced_memory()[0]
+        self._baslangic = time.perf_counter()
+        return self
+
+    def __exit__(self, *hata):
+        self.kayit['sure_ms'] = (time.perf_counter() - self._baslangic) * 1000
+        if self._bellek and tracemalloc.is_tracing():
+            simdiki, tepe = tracemalloc.get_traced_memory()
+            self.kayit['bellek_mb'] = (tepe - self._bellek_baslangic) / 1e6
+            self.kayit['kalan_mb'] = (simdiki - self._bellek_baslangic) / 1e6
+        self.olcer.kayitlar.append(self.kayit)
+        return False
+
+
+class Olcer:
+    """Bir rerun'ın aşama ölçümleri.
+
+    `bellek=True` tracemalloc'u başlatır ve son adım kapanınca (ya da Olcer bırakılınca)
+    durdurur; açıkken süreçteki tüm ayırmalar izlenir ve süreler belirgin biçimde uzar.
+    tracemalloc ve tepe sıfırlaması süreç geneli olduğundan aynı anda çalışan oturumlarda
+    bellek değerleri yaklaşıktır (birbirinin ayırmalarını içerebilir).
+    """
+
+    def __init__(self, etkin=True, bellek=False):
+        self.etkin = etkin
+        self.bellek = etkin and bellek
+        self.kayitlar = []
+        self._adim = None
+        self._bellek_birak = None
+        if self.bellek and _bellek_ac():
+            # Rerun yarıda kesilse de (ör. st.stop) Olcer bırakılınca tracemalloc kapanır
+            self._bellek_birak = weakref.finalize(self, _bellek_kapat)
+
+    def asama(self, ad, satir_giris=None):
+        """`with olcer.asama('skorlama') as a: a.cikti(sonuc)` biçiminde ölçüm bağlamı."""
+        if not self.etkin:
+            return _BOS_ASAMA
+        return _Asama(self, ad, satir_giris)
+
+    def adim(self, ad=None, satir_giris=None):
+        """Doğrusal betikler için: önceki adımı kapatıp `ad` adımını başlatır (ad yoksa yalnızca kapatır)."""
+        if not self.etkin:
+            return
+        if self._adim is not None:
+            self._adim.__exit__(None, None, None)
+            self._adim = None
+        if ad is not None:
+            self._adim = _Asama(self, ad, satir_giris).__enter__()
+        elif self._bellek_birak is not None:
+            self._bellek_birak()
+
+    def cikti(self, deger):
+        """Açık adımın çıktısını bildirir."""
+        if self._adim is not None:
+            self._adim.cikti(deger)
+        return deger
+
+    def tablo(self):
+        """Kayıtları aşama sırasıyla DataFrame olarak döndürür."""
+        self.adim()
+        return pd.DataFrame(self.kayitlar, columns=['asama', 'sure_ms', 'satir_giris', 'satir_cikis', *(['bellek_mb'] if self.bellek else [])])
+
+    def jsonl_yaz(self, yol, **ek):
+        """Kayıtları (ör. oturum ve sürüm bilgisiyle) JSON-lines dosyasına ekler."""
+        self.adim()
+        if not self.etkin or not self.kayitlar:
+            return
+        ortak = {'zaman': time.time(), 'rerun': uuid.uuid4().hex[:12], **ek}
+        os.makedirs(os.path.dirname(yol) or '.', exist_ok=True)
+        with _YAZMA_KILIDI, open(yol, 'a', encoding='utf-8') as f:
+            # Soğuk başlangıç kayıtları ayrı bir rerun kimliğiyle yazılır (rerun toplamına girmez)
+            soguk = [{'asama': f'soguk:{ad}', 'sure_ms': sure} for ad, sure in _SOGUK_BASLANGIC.items() if ad not in _SOGUK_YAZILAN]
+            _SOGUK_YAZILAN.update(_SOGUK_BASLANGIC)
+            soguk_ortak = {**ortak, 'rerun': 'soguk-' + ortak['rerun']}
+            f.write(''.join(json.dumps({**soguk_ortak, **kayit}, ensure_ascii=False, default=str) + '\n' for kayit in soguk))
+            f.write(''.join(json.dumps({**ortak, **kayit}, ensure_ascii=False, default=str) + '\n' for kayit in self.kayitlar))
+
+
+KAPALI = Olcer(etkin=False)
+
+
+def ozet(yol):
+    """JSON-lines ölçüm dosyasından aşama başına süre yüzdelikleri."""
+    with open(yol, encoding='utf-8') as f:
+        kayitlar = pd.DataFrame([json.loads(satir) for satir in f if satir.strip()])
+    if kayitlar.empty:
+        return pd.DataFrame()
+    gruplar = kayitlar.groupby('asama', sort=False)['sure_ms']
+    sonuc = pd.DataFrame({
+        'adet': gruplar.size(),
+        'p50_ms': gruplar.quantile(0.50),
+        'p90_ms': gruplar.quantile(0.90),
+        'p99_ms': gruplar.quantile(0.99),
+        'maks_ms': gruplar.max(),
+    })
+    if 'bellek_mb' in kayitlar:
+        sonuc['p99_bellek_mb'] = kayitlar.groupby('asama', sort=False)['bellek_mb'].quantile(0.99)
+    if 'rerun' in kayitlar:
+        reruns = kayitlar[~kayitlar['asama'].str.startswith('soguk:')].groupby('rerun')['sure_ms'].sum()
+        sonuc.loc['(rerun toplamı)'] = [len(reruns), *np.percentile(reruns, [50, 90, 99]), reruns.max(), *([np.nan] if 'p99_bellek_mb' in sonuc else [])]
+    return sonuc
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sayfa ölçüm kayıtlarını (JSON-lines) aşama bazında özetler.")
+    parser.add_argument('dosya')
+    args = parser.parse_args(argv)
+    with pd.option_context('display.width', 140, 'display.float_format', '{:,.2f}'.format):
+        print(ozet(args.dosya))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Sorgu sonuçları ve aday kümeleri için sürüm bilgili LRU önbellek."""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def nesne_boyutu(nesne):
+    """Önbellekteki bir değerin yaklaşık bellek kullanımı (bayt)."""
+    if isinstance(nesne, pd.DataFrame):
+        return int(nesne.memory_usage(index=True, deep=False).sum())
+    if isinstance(nesne, pd.Series):
+        return int(nesne.memory_usage(index=True, deep=False))
+    if isinstance(nesne, np.ndarray):
+        return nesne.nbytes
+    if isinstance(nesne, tuple):
+        return sum(nesne_boyutu(parca) for parca in nesne)
+    boyut = getattr(nesne, 'bayt', None)
+    if callable(boyut):
+        return int(boyut())
+    return 64
+
+
+class LRUOnbellek:
+    """İş parçacığı güvenli, giriş sayısı ve bayt ile sınırlı LRU önbellek.
+
+    Her okuma/yazma bir katalog sürümüyle yapılır; sürüm değiştiğinde önbellek
+    kendiliğinden boşaltılır, eski katalogdan üretilmiş sonuçlar dönmez.
+    """
+
+    def __init__(self, maks_giris=1024, maks_bayt=256 * 1024 * 1024, boyut=nesne_boyutu):
+        self.maks_giris = maks_giris
+        self.maks_bayt = maks_bayt
+        self.boyut = boyut
+        self.surum = None
+        self._veri = OrderedDict()
+        self._kilit = threading.Lock()
+        self.bayt = 0
+        self.isabet = 0
+        self.iska = 0
+        self.cikarilan = 0
+
+    def __len__(self):
+        return len(self._veri)
+
+    def _surum_kontrol(self, surum):
+        if surum != self.surum:
+            self._veri.clear()
+            self.bayt = 0
+            self.surum = surum
+
+    def al(self, anahtar, surum=None, varsayilan=None):
+        with self._kilit:
+            self._surum_kontrol(surum)
+            giris = self._veri.get(anahtar)
+            if giris is None:
+                self.iska += 1
+                return varsayilan
+            self._veri.move_to_end(anahtar)
+            self.isabet += 1
+            return giris[0]
+
+    def koy(self, anahtar, deger, surum=None):
+        bayt = self.boyut(deger)
+        with self._kilit:
+            self._surum_kontrol(surum)
+            if bayt > self.maks_bayt:
+                return
+            eski = self._veri.pop(anahtar, None)
+            if eski is not None:
+                self.bayt -= eski[1]
+            self._veri[anahtar] = (deger, bayt)
+            self.bayt += bayt
+            while len(self._veri) > self.maks_giris or self.bayt > self.maks_bayt:
+                _, (_, cikan_bayt) = self._veri.popitem(last=False)
+                self.bayt -= cikan_bayt
+                self.cikarilan += 1
+
+    def getir(self, anahtar, uret, surum=None):
+        """Önbellekte varsa değeri döndürür, yoksa `uret()` ile üretip saklar.
+
+        Üretim kilit dışında yapılır; aynı anahtar için eşzamanlı iki ıska iki kez üretebilir.
+        """
+        deger = self.al(anahtar, surum, _YOK)
+        if deger is _YOK:
+            deger = uret()
+            self.koy(anahtar, deger, surum)
+        return deger
+
+    def temizle(self):
+        with self._kilit:
+            self._veri.clear()
+            self.bayt = 0
+
+    def istatistik(self):
+        with self._kilit:
+            toplam = self.isabet + self.iska
+            return {
+                'giris': len(self._veri),
+                'bayt': self.bayt,
+                'isabet': self.isabet,
+                'iska': self.iska,
+                'isabet_orani': self.isabet / toplam if toplam else 0.0,
+                'cikarilan': self.cikarilan,
+                'surum': self.surum,
+            }
+
+
+_YOK = object()
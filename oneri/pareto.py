@@ -0,0 +1,126 @@
+"""Aday kümesinde Pareto cephesi (skyline): hiçbir boyutta başka bir araç tarafından geçilemeyen araçlar.
+
+İki boyut için sıralama + kümülatif minimum (O(n log n)); daha fazla boyut için
+monoton bir toplama göre sıralanmış adaylardan bloklar halinde cephe noktaları alınır
+ve bunların domine ettiği adaylar kalan kümeden vektörel olarak elenir (sort-filter
+skyline). Maliyet O(n · cephe) olup kalan küme hızla küçüldüğü için yüz binlerce
+satırda da etkileşimli kalır.
+"""
+
+import numpy as np
+
+# Sütun -> hangi yön daha iyi
+PARETO_YONLERI = {
+    'fiyat_tl': 'min',
+    'Toplam_Isletme_Maliyeti': 'min',
+    'Toplam_Skor': 'max',
+    'guvenlik_skor': 'max',
+    'Performans_Guncel': 'max',
+    'konfor_skor': 'max',
+    'ikinci_el_skor': 'max',
+    'bagaj_hacmi_lt': 'max',
+    'beygir_gucu': 'max',
+    'elektrikli_menzil_km': 'max',
+}
+PARETO_ETIKETLERI = {
+    'fiyat_tl': 'Fiyat (TL)',
+    'Toplam_Isletme_Maliyeti': 'TOPLAM İşletme Maliyeti (Yıllık, TL)',
+    'Toplam_Skor': 'Toplam Skor',
+    'guvenlik_skor': 'Güvenlik Puanı (5)',
+    'Performans_Guncel': 'Performans Puanı (5)',
+    'konfor_skor': 'Konfor Puanı (5)',
+    'ikinci_el_skor': '2. El Değeri Puanı (5)',
+    'bagaj_hacmi_lt': 'Bagaj Hacmi (lt)',
+    'beygir_gucu': 'Beygir Gücü (HP)',
+    'elektrikli_menzil_km': 'E-Menzil (km)',
+}
+VARSAYILAN_BOYUTLAR = ('fiyat_tl', 'Toplam_Isletme_Maliyeti', 'Toplam_Skor')
+
+# Dağılım grafiğinde gösterilen cephe dışı aday sayısı üst sınırı
+ORNEK_SINIRI = 5000
+
+# Çok boyutlu skyline'da sırayla işlenen aday bloğu ve bir seferde
+# tüm adaylarla karşılaştırılan cephe satırı sayısı (bellek: PARCA × aday × boyut)
+BLOK = 256
+PARCA = 16
+
+
+def _skyline_2b(matris):
+    x, y = matris[:, 0], matris[:, 1]
+    sira = np.lexsort((y, x))
+    xs, ys = x[sira], y[sira]
+    grup_basi = np.flatnonzero(np.r_[True, xs[1:] != xs[:-1]])
+    grup = np.repeat(np.arange(len(grup_basi)), np.diff(np.r_[grup_basi, len(xs)]))
+    grup_min = np.minimum.reduceat(ys, grup_basi)
+    # Daha küçük x'e sahip gruplardaki en küçük y
+    onceki_min = np.r_[np.inf, np.minimum.accumulate(grup_min)[:-1]]
+    secili = (ys == grup_min[grup]) & (ys < onceki_min[grup])
+    return np.sort(sira[secili])
+
+
+def _domine_edilen(cephe, adaylar):
+    """`adaylar` satırlarından `cephe`deki en az bir satır tarafından domine edilenlerin maskesi."""
+    sutunlar = np.ascontiguousarray(adaylar.T)
+    sonuc = np.zeros(len(adaylar), dtype=bool)
+    for bas in range(0, len(cephe), PARCA):
+        parca = cephe[bas:bas + PARCA]
+        kotu_degil = np.ones((len(parca), len(adaylar)), dtype=bool)
+        kesin_iyi = np.zeros((len(parca), len(adaylar)), dtype=bool)
+        for k, sutun in enumerate(sutunlar):
+            kotu_degil &= parca[:, k, np.newaxis] <= sutun
+            kesin_iyi |= parca[:, k, np.newaxis] < sutun
+        sonuc |= (kotu_degil & kesin_iyi).any(axis=0)
+    return sonuc
+
+
+def _skyline_sfs(matris):
+    # Her boyutta kesin artan bir toplam: bir satırı domine eden satır sıralamada ondan önce gelir
+    alt, ust = matris.min(axis=0), matris.max(axis=0)
+    aralik = np.where(ust > alt, ust - alt, 1.0)
+    kalan = np.argsort(((matris - alt) / aralik).sum(axis=1), kind='stable')
+
+    konumlar = []
+    while len(kalan):
+        # Sıradaki bloğun kendi içinde domine edilmeyenleri kesin olarak cephededir:
+        # önceki cephe noktalarının domine ettikleri zaten elenmiştir
+        blok, kalan = kalan[:BLOK], kalan[BLOK:]
+        degerler = matris[blok]
+        yeni = ~_domine_edilen(degerler, degerler)
+        blok, degerler = blok[yeni], degerler[yeni]
+        konumlar.append(blok)
+        # Yeni cephe noktalarının domine ettiği adaylar tek seferde elenir
+        if len(kalan):
+            kalan = kalan[~_domine_edilen(degerler, matris[kalan])]
+    return np.sort(np.concatenate(konumlar))
+
+
+def skyline(matris):
+    """Küçüğün iyi olduğu (satır × boyut) matriste domine edilmeyen satırların konumları."""
+    matris = np.asarray(matris, dtype=float)
+    if len(matris) == 0:
+        return np.empty(0, dtype=np.intp)
+    if matris.shape[1] == 1:
+        return np.flatnonzero(matris[:, 0] == matris[:, 0].min())
+    if matris.shape[1] == 2:
+        return _skyline_2b(matris)
+    return _skyline_sfs(matris)
+
+
+def pareto_cephesi(df, boyutlar=VARSAYILAN_BOYUTLAR):
+    """`boyutlar` üzerinde Pareto-optimal satırlar. Eksik değerli satırlar cepheye girmez."""
+    matris = np.column_stack([
+        df[col].to_numpy(dtype=float) * (1.0 if PARETO_YONLERI[col] == 'min' else -1.0)
+        for col in boyutlar
+    ]) if len(boyutlar) else np.empty((len(df), 0))
+    gecerli = np.flatnonzero(~np.isnan(matris).any(axis=1))
+    if matris.shape[1] == 0:
+        return df.iloc[:0]
+    return df.take(gecerli[skyline(matris[gecerli])])
+
+
+def dagilim_ornegi(df, cephe, sinir=ORNEK_SINIRI, tohum=0):
+    """Dağılım grafiği için cephe dışındaki adaylardan sabit tohumlu bir örnek."""
+    digerleri = df.drop(index=cephe.index) if df.index.is_unique else df
+    if len(digerleri) <= sinir:
+        return digerleri
+    return digerleri.sample(sinir, random_state=tohum).sort_index()
@@ -0,0 +1,119 @@
+"""Çok yıllık toplam sahip olma maliyeti (TCO): alış fiyatı, değer kaybı, sabit giderler
+ve Monte Carlo yakıt/elektrik fiyat senaryoları.
+
+Yakıt ve elektrik fiyatları yıllık artışları korelasyonlu log-normal olan binlerce
+fiyat yolu olarak örneklenir. Bir aracın enerji maliyeti iki fiyatın doğrusal
+birleşimidir (a·yakıt + b·elektrik); bu yüzden araç × yıl × senaryo küpü açıkça
+kurulmaz: senaryo dağılımı yalnızca aracın enerji karışımına (b / (a + b)) bağlıdır.
+Yüzdelikler (karışım × senaryo × yıl) yayınlamasıyla her farklı karışım için bir kez
+hesaplanır (benzinli/dizel/elektrikli araçların hepsi tek karışım, PHEV'ler birkaç
+tane), araçlara ölçeklenerek dağıtılır. Alış, değer kaybı ve sabit
+giderler deterministik olduğundan yüzdelikleri yalnızca kaydırır.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from oneri.maliyet import yakit_maliyeti_hesapla
+
+# İkinci el skoru 1 → yıllık %20, 5 → yıllık %8 değer kaybı (arası doğrusal)
+DEGER_KAYBI_ARALIGI = (0.20, 0.08)
+SABIT_GIDERLER = ['yillik_mtv', 'yillik_sigorta', 'yillik_bakim']
+YUZDELIKLER = (10, 50, 90)
+# Yüzdelikleri tek yayınlamada hesaplanan karışım sayısı (bellek: blok × senaryo × yıl)
+KARISIM_BLOGU = 64
+
+
+@dataclass(frozen=True)
+class TcoVarsayimlari:
+    yil: int = 5
+    senaryo: int = 2000
+    yakit_artis: float = 0.25      # yıllık beklenen artış
+    elektrik_artis: float = 0.25
+    oynaklik: float = 0.15         # yıllık artışın log-standart sapması
+    korelasyon: float = 0.5        # yakıt ve elektrik artışları arasında
+    enflasyon: float = 0.25        # MTV/sigorta/bakım artışı
+    tohum: int = 0
+
+
+def deger_kaybi_orani(ikinci_el_skor):
+    """İkinci el skorundan (1-5) yıllık değer kaybı oranı."""
+    return np.interp(np.asarray(ikinci_el_skor, dtype=float), [1, 5], DEGER_KAYBI_ARALIGI)
+
+
+def fiyat_yollari(yakit_fiyat, elektrik_fiyat, varsayim):
+    """(senaryo, yıl) boyutlu yakıt ve elektrik fiyat yolları; ilk yıl bugünkü fiyattır."""
+    rng = np.random.default_rng(varsayim.tohum)
+    z = rng.standard_normal((2, varsayim.senaryo, max(varsayim.yil - 1, 0)))
+    z[1] = varsayim.korelasyon * z[0] + np.sqrt(1 - varsayim.korelasyon ** 2) * z[1]
+    yollar = []
+    for baslangic, artis, zi in ((yakit_fiyat, varsayim.yakit_artis, z[0]), (elektrik_fiyat, varsayim.elektrik_artis, z[1])):
+        # Log-normal artış; beklenen değer (1 + artis) olacak şekilde kaydırılır
+        log_artis = np.log1p(artis) - varsayim.oynaklik ** 2 / 2 + varsayim.oynaklik * zi
+        birikimli = np.concatenate([np.zeros((varsayim.senaryo, 1)), np.cumsum(log_artis, axis=1)], axis=1)
+        yollar.append(baslangic * np.exp(birikimli))
+    return yollar
+
+
+class TcoProjeksiyonu:
+    """Bir araç kümesinin yıl sonu kümülatif TCO yüzdelikleri.
+
+    Araç başına yalnızca birkaç katsayı tutulur; (yüzdelik, araç, yıl) değerleri
+    istenen satırlar için `egriler()` ile üretilir.
+    """
+
+    def __init__(self, df, yillik_km, yakit_fiyat, elektrik_fiyat, varsayim=TcoVarsayimlari()):
+        self.varsayim = varsayim
+        yillar = np.arange(1, varsayim.yil + 1)
+
+        # Birim fiyat başına yıllık enerji maliyeti: a (yakıt), b (elektrik)
+        katsayilar = yakit_maliyeti_hesapla(df, yillik_km, [1.0, 0.0], [0.0, 1.0])
+        katsayilar = np.nan_to_num(katsayilar)
+        self.olcek = katsayilar.sum(axis=1)
+        karisim = np.divide(katsayilar[:, 1], self.olcek, out=np.zeros(len(df)), where=self.olcek > 0)
+        karisimlar, self.karisim_kodu = np.unique(karisim, return_inverse=True)
+
+        # (karışım, senaryo, yıl): birim ölçekli kümülatif enerji maliyeti
+        yakit, elektrik = fiyat_yollari(yakit_fiyat, elektrik_fiyat, varsayim)
+        self.enerji_yuzdelikleri = np.empty((len(YUZDELIKLER), len(karisimlar), varsayim.yil))  # (yüzdelik, karışım, yıl)
+        for bas in range(0, len(karisimlar), KARISIM_BLOGU):
+            blok = karisimlar[bas:bas + KARISIM_BLOGU, np.newaxis, np.newaxis]
+            enerji = np.cumsum((1 - blok) * yakit + blok * elektrik, axis=2)
+            self.enerji_yuzdelikleri[:, bas:bas + KARISIM_BLOGU] = np.percentile(enerji, YUZDELIKLER, axis=1)
+
+        # Deterministik kısım: alış − ikinci el değeri + enflasyonla artan sabit giderler
+        fiyat = df['fiyat_tl'].to_numpy(dtype=float)
+        kayip = deger_kaybi_orani(df['ikinci_el_skor'].to_numpy(dtype=float))
+        sabit = np.nan_to_num(df[SABIT_GIDERLER].to_numpy(dtype=float)).sum(axis=1)
+        enflasyon = (1 + varsayim.enflasyon) ** (yillar - 1)
+        self._fiyat, self._kayip, self._sabit = fiyat, kayip, sabit
+        self._sabit_carpan = np.cumsum(enflasyon)
+        self.yillar = yillar
+
+    def __len__(self):
+        return len(self.olcek)
+
+    def bayt(self):
+        return self.olcek.nbytes * 4 + self.karisim_kodu.nbytes + self.enerji_yuzdelikleri.nbytes
+
+    def deterministik(self, konumlar=slice(None), yillar=None):
+        """(araç, yıl): alış − ikinci el değeri + kümülatif sabit giderler."""
+        yillar = self.yillar if yillar is None else np.atleast_1d(yillar)
+        fiyat = self._fiyat[konumlar, np.newaxis]
+        ikinci_el = fiyat * (1 - self._kayip[konumlar, np.newaxis]) ** yillar
+        return fiyat - ikinci_el + self._sabit[konumlar, np.newaxis] * self._sabit_carpan[yillar - 1]
+
+    def egriler(self, konumlar=slice(None)):
+        """(yüzdelik, araç, yıl) boyutlu kümülatif TCO; yüzdelikler YUZDELIKLER sırasında."""
+        enerji = self.enerji_yuzdelikleri[:, self.karisim_kodu[konumlar], :] * self.olcek[konumlar, np.newaxis]
+        return self.deterministik(konumlar) + enerji
+
+    def ozet(self, yil=None, konumlar=slice(None)):
+        """`yil` sonundaki (varsayılan: ufuk) P10 / medyan / P90 TCO tablosu."""
+        yil = self.varsayim.yil if yil is None else yil
+        enerji = self.enerji_yuzdelikleri[:, self.karisim_kodu[konumlar], yil - 1] * self.olcek[konumlar]
+        sabit = self.deterministik(konumlar, yil)[:, 0]
+        p10, medyan, p90 = sabit + enerji
+        return pd.DataFrame({'TCO_P10': p10, 'TCO_Medyan': medyan, 'TCO_P90': p90})
@@ -0,0 +1,101 @@
+"""Sidebar seçim kutularının değerleri ve seçenek başına sonuç sayıları (facet)."""
+
+from dataclasses import replace
+
+import numpy as np
+
+from oneri.motor import FARKETMEZ, TEKLI_SECIMLER
+
+# Sayıları gösterilen seçim kutuları: sorgu alanı -> sütun. motor_donanim kutusunun
+# seçenekleri marka/modele göre daraltıldığından sayısı tutulmaz.
+FACET_ALANLARI = {alan: col for alan, col in TEKLI_SECIMLER.items() if col != 'motor_donanim'}
+FACET_ALANLARI['kullanim_amaci'] = 'kullanim_amaci'
+
+
+class SecenekAgaci:
+    """marka → model → motor_donanim ağacı ve sütunların farklı değerleri.
+
+    Katalog sürümü başına bir kez, tek bir `drop_duplicates` ile hazırlanır;
+    her rerun'da sütun taraması yapılmaz. Seçeneklerin filtreyle eşleşmesi için `df`
+    motorun filtrelediği genişletilmiş katalog olmalıdır; slider sınırları verilirse
+    `aralik_kaynagi`ndan (ör. liste fiyatlı katalog) alınır.
+    """
+
+    def __init__(self, df, aralik_kaynagi=None):
+        uclu = df[['marka', 'model', 'motor_donanim']].drop_duplicates()
+        uclu = uclu.astype(str).sort_values(['marka', 'model', 'motor_donanim'])
+        self.markalar = sorted(uclu['marka'].unique().tolist())
+        self.tum_modeller = sorted(uclu['model'].unique().tolist())
+        self._modeller = {}
+        self._marka_motorlari = {}
+        self._motorlar = {}
+        for marka, model, motor in uclu.itertuples(index=False):
+            if model not in self._modeller.setdefault(marka, []):
+                self._modeller[marka].append(model)
+            self._marka_motorlari.setdefault(marka, set()).add(motor)
+            self._motorlar.setdefault((marka, model), []).append(motor)
+        self._marka_motorlari = {marka: sorted(motorlar) for marka, motorlar in self._marka_motorlari.items()}
+        self.degerler = {
+            col: sorted(df[col].astype(str).unique().tolist())
+            for col in ['kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci']
+        }
+        # Slider ve sayı kutularının sınırları
+        aralik_kaynagi = df if aralik_kaynagi is None else aralik_kaynagi
+        self.araliklar = {
+            col: (aralik_kaynagi[col].min(), aralik_kaynagi[col].max()) for col in ['fiyat_tl', 'beygir_gucu', 'bagaj_hacmi_lt']
+        }
+
+    def model_markalari(self):
+        """Model adı -> o adı kullanan markalar."""
+        sonuc = {}
+        for marka, modeller in self._modeller.items():
+            for model in modeller:
+                sonuc.setdefault(model, []).append(marka)
+        return sonuc
+
+    def modeller(self, marka):
+        if marka == FARKETMEZ:
+            return self.tum_modeller
+        return self._modeller.get(marka, [])
+
+    def motorlar(self, marka, model):
+        if model != FARKETMEZ:
+            return self._motorlar.get((marka, model), [])
+        if marka != FARKETMEZ:
+            return self._marka_motorlari.get(marka, [])
+        return []
+
+
+def facet_sayilari(indeks, sorgu):
+    """Her seçim kutusu için {değer: sonuç sayısı}.
+
+    Bir kutunun sayıları kendi seçimi dışındaki tüm aktif filtrelere göredir
+    ("SUV (42)": kasa tipi SUV seçilirse 42 sonuç). Kısıtlar önerilerdeki gibi
+    `sorgu.kisitlar()`'dan gelir; sayıların sonuçlarla tutması için `sorgu` motor
+    seçimi ve not uygulanmış son sorgu olmalıdır. Kutu başına indeks üzerinde tek
+    bir gruplanmış sayım yapılır.
+    """
+    sonuc = {}
+    for alan, col in FACET_ALANLARI.items():
+        kisitlar = replace(sorgu, **{alan: FARKETMEZ}).kisitlar()
+        sayilar = indeks.sayilar(col, **kisitlar)
+        sozluk = (indeks.kullanim if col == 'kullanim_amaci' else indeks.kategorik[col]).sozluk.astype(str)
+        if col == 'kullanim_amaci':
+            # Kullanım filtresi "içerir" eşleşmesidir: bir değer, onu içeren tüm değerleri sayar
+            kucuk = sozluk.str.lower()
+            sonuc[alan] = {
+                deger: int(sayilar[np.asarray(kucuk.str.contains(deger.lower(), regex=False))].sum())
+                for deger in sozluk
+            }
+        else:
+            sonuc[alan] = dict(zip(sozluk, sayilar.tolist()))
+    return sonuc
+
+
+def etiketle(sayilar):
+    """selectbox `format_func`'u: seçeneğin yanına sonuç sayısını ekler."""
+    def bicimle(deger):
+        if deger == FARKETMEZ or deger not in sayilar:
+            return deger
+        return f"{deger} ({sayilar[deger]:,})"
+    return bicimle
@@ -0,0 +1,91 @@
+"""Gerçek katalogun şemasını ve dağılımlarını izleyen deterministik sentetik katalog üretici.
+
+Satırlar kaynak katalogdan (yakıt tipi karışımı, kasa tipleri, PHEV menzilleri,
+skorlar birlikte korunacak şekilde) yeniden örneklenir; sayısal alanlar küçük
+gürültülerle çeşitlendirilir ve donanım adlarına varyant eki verilerek
+kardinalite katalog boyutuyla birlikte büyütülür.
+
+    python -m oneri.sentetik 1000000 -o buyuk.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from oneri.katalog import SKOR_SUTUNLARI, csv_oku, kompakt
+
+# Tek bir donanım adının en fazla kaç varyantı üretilir (kardinalite üst sınırı)
+MAKS_VARYANT = 50
+PARCA_SATIR = 1_000_000
+
+
+def _parca(kaynak, n, rng, ofset):
+    secim = rng.integers(0, len(kaynak), n)
+    df = kaynak.take(secim).reset_index(drop=True)
+
+    # Fiyat ve ona bağlı giderler birlikte ölçeklenir
+    fiyat_carpani = rng.lognormal(0.0, 0.15, n)
+    df['fiyat_tl'] = np.round(df['fiyat_tl'].to_numpy(dtype=float) * fiyat_carpani, -3)
+    for col in ['yillik_mtv', 'yillik_sigorta']:
+        df[col] = np.round(df[col].to_numpy(dtype=float) * fiyat_carpani, -2)
+    df['yillik_bakim'] = np.round(df['yillik_bakim'].to_numpy(dtype=float) * rng.uniform(0.9, 1.1, n), -2)
+
+    for col in SKOR_SUTUNLARI:
+        df[col] = np.clip(np.round(df[col].to_numpy(dtype=float) + rng.normal(0, 0.3, n), 1), 1, 5)
+
+    for col in ['ortalama_tuketim', 'tuketim_kwh']:
+        df[col] = np.round(df[col].to_numpy(dtype=float) * rng.uniform(0.9, 1.1, n), 1)
+    for col in ['beygir_gucu', 'tork_nm', 'elektrikli_menzil_km']:
+        df[col] = np.round(df[col].to_numpy(dtype=float) * rng.uniform(0.9, 1.1, n))
+    df['hizlanma_0_100s'] = np.round(df['hizlanma_0_100s'].to_numpy(dtype=float) * rng.uniform(0.95, 1.05, n), 1)
+    df['bagaj_hacmi_lt'] = np.round(df['bagaj_hacmi_lt'].to_numpy(dtype=float) + rng.normal(0, 20, n).clip(-60, 60))
+
+    # Donanım adlarına varyant eki: kodlar üzerinden üretilir, satır başına metin oluşturulmaz
+    varyant_sayisi = int(min(MAKS_VARYANT, max(1, np.ceil((ofset + n) / len(kaynak)))))
+    motor_kodlari = df['motor_donanim'].cat.codes.to_numpy()
+    motorlar = kaynak['motor_donanim'].cat.categories
+    varyant = rng.integers(0, varyant_sayisi, n)
+    df['motor_donanim'] = pd.Categorical.from_codes(
+        motor_kodlari.astype(np.int64) * MAKS_VARYANT + varyant,
+        categories=[f"{motor} S{v}" if v else motor for motor in motorlar for v in range(MAKS_VARYANT)],
+    )
+    return df
+
+
+def sentetik_katalog(satir, kaynak='arabalar.csv', tohum=0):
+    """`satir` satırlık sentetik katalog üretir. Aynı tohum her zaman aynı katalogu verir."""
+    if satir < 1:
+        raise ValueError(f"Sentetik katalog en az 1 satır olmalı (istenen: {satir})")
+    if isinstance(kaynak, str):
+        kaynak = csv_oku(kaynak)
+    kaynak = kompakt(kaynak).reset_index(drop=True)
+    rng = np.random.default_rng(tohum)
+
+    parcalar = []
+    for ofset in range(0, satir, PARCA_SATIR):
+        parcalar.append(_parca(kaynak, min(PARCA_SATIR, satir - ofset), rng, ofset))
+    df = pd.concat(parcalar, ignore_index=True) if len(parcalar) > 1 else parcalar[0]
+    # Kullanılmayan varyant kategorileri bellekten atılır
+    df['motor_donanim'] = df['motor_donanim'].cat.remove_unused_categories()
+    return kompakt(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="arabalar.csv şemasında sentetik katalog üretir.")
+    parser.add_argument('satir', type=int)
+    parser.add_argument('-o', '--cikti', required=True, help="CSV dosyası veya (.katalog ile biten) ikili katalog dizini")
+    parser.add_argument('--kaynak', default='arabalar.csv')
+    parser.add_argument('--tohum', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    df = sentetik_katalog(args.satir, args.kaynak, args.tohum)
+    if args.cikti.endswith('.katalog'):
+        from oneri.depo import ikili_yaz
+        ikili_yaz(df, args.cikti)
+    else:
+        df.to_csv(args.cikti, index=False)
+    print(f"{len(df)} satır -> {args.cikti}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import numpy as np
+
+
+def _skorlar(skorlar):
+    # NaN skorlar her zaman en sona düşer
+    return np.nan_to_num(np.asarray(skorlar, dtype=float), nan=-np.inf)
+
+
+def en_iyiler(skorlar, k, baslangic=0):
+    """En yüksek skorlu araçların konumlarını kısmi seçimle döndürür.
+
+    Sıralama skor azalan, eşitlikte konum artan şekildedir (deterministik).
+    Yalnızca ilk `baslangic + k` eleman sıralanır; tüm dizi sıralanmaz.
+    """
+    skorlar = _skorlar(skorlar)
+    n = len(skorlar)
+    son = min(baslangic + k, n)
+    if son <= baslangic:
+        return np.empty(0, dtype=np.intp)
+    if son < n:
+        # son'uncu en büyük skor eşiği; sınırdaki eşit skorların hepsi aday olur
+        esik = np.partition(skorlar, n - son)[n - son]
+        adaylar = np.flatnonzero(skorlar >= esik)
+    else:
+        adaylar = np.arange(n)
+    sira = np.lexsort((adaylar, -skorlar[adaylar]))
+    return adaylar[sira[baslangic:son]]
+
+
+def sira_bul(skorlar, konum):
+    """Bir aracın sıralamadaki yeri (1'den başlar), sıralama yapmadan tek geçişte."""
+    skorlar = _skorlar(skorlar)
+    skor = skorlar[konum]
+    return int(np.count_nonzero(skorlar > skor) + np.count_nonzero(skorlar[:konum] == skor)) + 1
+
+
+class Siralama:
+    """Bir skor dizisi üzerinde sayfalı sıralama.
+
+    Sıralanmış ön ek istenen sayfaya yetmediğinde iki katına çıkarılarak
+    genişletilir; sonraki sayfalar tüm diziyi yeniden sıralamaz.
+    """
+
+    def __init__(self, skorlar):
+        self.skorlar = _skorlar(skorlar)
+        self._sirali = np.empty(0, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.skorlar)
+
+    def _genislet(self, gereken):
+        gereken = min(gereken, len(self.skorlar))
+        if gereken > len(self._sirali):
+            self._sirali = en_iyiler(self.skorlar, max(gereken, 2 * len(self._sirali)))
+
+    def ilk(self, k, baslangic=0):
+        """[baslangic, baslangic + k) sıralarındaki araçların konumları."""
+        self._genislet(baslangic + k)
+        return self._sirali[baslangic:baslangic + k]
+
+    def sayfa(self, no, boyut=30):
+        """0'dan başlayan `no` numaralı sayfanın konumları."""
+        return self.ilk(boyut, no * boyut)
+
+    def sira(self, konum):
+        return sira_bul(self.skorlar, konum)
@@ -0,0 +1,75 @@
+import numpy as np
+
+# Kriter matrisinin sütunları ve her birine karşılık gelen ağırlık (session_state anahtarı)
+KRITERLER = ['Performans_Guncel', 'ikinci_el_skor', 'guvenlik_skor', 'konfor_skor', 'Maliyet_Skor']
+AGIRLIK_ANAHTARLARI = ['onem_performans', 'onem_ikinci_el', 'onem_guvenlik', 'onem_konfor', 'onem_tuketim']
+
+
+def kriter_skorlari_ekle(df):
+    """Aday kümesine göre normalize edilen performans ve maliyet skorlarını ekler.
+
+    Tork, hızlanma ve maliyet skorları kümedeki en iyi/en kötü değerlere göre
+    hesaplandığından bu adım filtrelere ve maliyet girdilerine bağlıdır, ağırlıklara bağlı değildir.
+    """
+    tork = df['tork_nm'].to_numpy(dtype=float)
+    hizlanma = df['hizlanma_0_100s'].to_numpy(dtype=float)
+    maliyet = df['Toplam_Isletme_Maliyeti'].to_numpy(dtype=float)
+    bos = len(df) == 0
+
+    # Dinamik Performans Skoru Hesaplanması
+    hizlanma_olan = hizlanma[hizlanma != 0]
+    max_hizlanma = np.nanmax(hizlanma_olan) if hizlanma_olan.size else np.nan
+    min_hizlanma = np.nanmin(hizlanma_olan) if hizlanma_olan.size else np.nan
+    max_tork = np.nan if bos else tork.max()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tork_skor = np.where(tork == 0, 1.0, (tork / max_tork) * 5)
+
+        if max_hizlanma > 0 and min_hizlanma > 0 and max_hizlanma != min_hizlanma:
+            # Hızlanma ters orantılıdır: Düşük saniye = Yüksek Skor
+            hizlanma_skor = 5 - (5 * (hizlanma - min_hizlanma) / (max_hizlanma - min_hizlanma))
+            hizlanma_skor = np.where(hizlanma == 0, 1.0, hizlanma_skor)
+        else:
+            hizlanma_skor = np.full(len(df), 2.5)
+    hizlanma_skor = np.clip(hizlanma_skor, 0.5, 5)
+
+    # Performans Skorunun Güncellenmesi (Subjektif + Objektif)
+    performans = (df['performans_skor'].to_numpy(dtype=float) * 0.5) + ((tork_skor + hizlanma_skor) / 2 * 0.5)
+    performans = np.clip(performans, 1, 5)
+
+    # Maliyet Skoru Hesaplaması
+    max_maliyet = np.nan if bos else maliyet.max()
+    if max_maliyet > 0:
+        # Maliyet ters orantılıdır: Yüksek maliyet = Düşük Skor
+        maliyet_skor = np.clip(5 * (1 - (maliyet / max_maliyet)), 0, 5) # Skoru 0-5 arasına sınırla
+    else:
+        maliyet_skor = np.full(len(df), 2.5)
+    maliyet_skor = np.nan_to_num(maliyet_skor, nan=0.0)
+
+    return df.assign(
+        Tork_Skor=tork_skor,
+        Hizlanma_Skor=hizlanma_skor,
+        Performans_Guncel=performans,
+        Maliyet_Skor=maliyet_skor,
+    )
+
+
+def kriter_matrisi(df):
+    """Aday × kriter skor matrisi (sütun sırası KRITERLER ile aynı)."""
+    return np.ascontiguousarray(df[KRITERLER].to_numpy(dtype=float))
+
+
+def agirlik_vektoru(agirliklar):
+    """Ağırlık sözlüğünü (AGIRLIK_ANAHTARLARI) KRITERLER sırasında bir vektöre çevirir."""
+    return np.array([agirliklar[anahtar] for anahtar in AGIRLIK_ANAHTARLARI], dtype=float)
+
+
+def toplam_skor(matris, agirliklar):
+    """Toplam_Skor'u tek bir matris-vektör çarpımıyla hesaplar.
+
+    `agirliklar` (kriter sayısı,) boyutlu ise (aday sayısı,) boyutlu skorlar döner;
+    (ağırlık seti sayısı, kriter sayısı) boyutlu bir grup verilirse sonuç
+    (aday sayısı, ağırlık seti sayısı) boyutludur (duyarlılık analizleri için).
+    """
+    agirliklar = np.asarray(agirliklar, dtype=float)
+    return matris @ agirliklar.T
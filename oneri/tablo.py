@@ -0,0 +1,38 @@
+# Nihai karşılaştırma tablosunun sütunları ve görünen adları
+GOSTERILECEK_SUTUNLAR = [
+    'marka', 'model', 'motor_donanim', 'fiyat_tl', 'Toplam_Isletme_Maliyeti', 'Yillik_Yakit_Maliyeti', 'yakit_tipi', 'sanziman',
+    'tork_nm', 'hizlanma_0_100s', 'elektrikli_menzil_km', 'bagaj_hacmi_lt',
+    'guvenlik_skor', 'Performans_Guncel', 'ikinci_el_skor'
+]
+SUTUN_ADLARI = [
+    'Fiyat (TL)', 'TOPLAM İşletme Maliyeti (Yıllık, TL)', 'Yıllık Yakıt Maliyeti (TL)', 'Yakıt Tipi', 'Şanzıman',
+    'Tork (Nm)', '0-100 (s)', 'E-Menzil (km)', 'Bagaj Hacmi (lt)',
+    'Güvenlik Puanı (5)', 'Performans Puanı (5)', '2. El Değeri Puanı (5)'
+]
+TL_SUTUNLARI = ['Fiyat (TL)', 'TOPLAM İşletme Maliyeti (Yıllık, TL)', 'Yıllık Yakıt Maliyeti (TL)']
+# Sayfalı sonuç tablosunun ek sütunları
+SIRA_SUTUNU = 'Sıra'
+SKOR_SUTUNU = 'Toplam Skor'
+
+
+def karsilastirma_tablosu(onerilen_araclar):
+    """Önerilen araçlardan marka/model/donanım indeksli karşılaştırma tablosunu oluşturur.
+
+    Değerler sayısal kalır; TL biçimlendirmesi gösterim katmanında (sütun ayarlarıyla) yapılır.
+    """
+    karsilastirma_df = onerilen_araclar[GOSTERILECEK_SUTUNLAR].set_index(['marka', 'model', 'motor_donanim'])
+    karsilastirma_df.columns = SUTUN_ADLARI
+    return karsilastirma_df
+
+
+def sonuc_sayfasi(aday_kumesi, skorlar, siralama, no, boyut):
+    """Tüm sıralı aday listesinin `no` numaralı (0'dan başlayan) sayfası, sıra ve skor sütunlarıyla.
+
+    Yalnızca sayfadaki satırlar tabloya dönüştürülür; `siralama` (oneri.siralama.Siralama)
+    derin sayfalarda sıralı ön eki genişletir, tüm listeyi yeniden sıralamaz.
+    """
+    sayfa = aday_kumesi.sirala(skorlar, siralama.sayfa(no, boyut))
+    tablo = karsilastirma_tablosu(sayfa)
+    tablo.insert(0, SIRA_SUTUNU, range(no * boyut + 1, no * boyut + 1 + len(sayfa)))
+    tablo.insert(1, SKOR_SUTUNU, sayfa['Toplam_Skor'].to_numpy())
+    return tablo
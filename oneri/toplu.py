@@ -0,0 +1,214 @@
+"""JSONL kullanıcı profilleri için toplu öneri üretici.
+
+Her girdi satırı bir profildir: Sorgu alanları (butce, marka, kasa_tipi,
+yakit_tipi, onem_*, yillik_km, yakit_fiyat, elektrik_fiyat, ...), isteğe bağlı
+`not` (Kişisel Analiz Notu) ve `id`. Her profil için en iyi `k` (varsayılan 30)
+araç bir JSONL satırı olarak yazılır; okunamayan ya da hatalı değerli profiller
+işi durdurmaz, `{"id": ..., "hata": ...}` satırı olarak yazılır.
+
+    python -m oneri.toplu profiller.jsonl -o oneriler.jsonl --isci 8
+
+Girdi ve çıktı akış halinde işlenir; aynı anda yalnızca sınırlı sayıda parça
+bellekte bulunur. İşçiler genişletilmiş kataloğu fork ile devralır; fork olmayan
+platformlarda katalog bir kez bellek eşlemeli ikili formata yazılır ve tüm işçiler
+bu salt okunur kopyayı paylaşır.
+"""
+import argparse
+import collections
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from oneri.depo import ikili_oku, ikili_yaz
+from oneri.motor import AGIRLIK_ALANLARI, ESIKLER, MALIYET_ALANLARI, TEKLI_SECIMLER, OneriMotoru, Sorgu
+from oneri.not_analizi import NotAyristirici, notu_uygula
+from oneri.secenekler import SecenekAgaci
+
+CIKTI_SUTUNLARI = [
+    'marka', 'model', 'motor_donanim', 'yakit_tipi', 'fiyat_tl',
+    'Yillik_Yakit_Maliyeti', 'Toplam_Isletme_Maliyeti', 'Toplam_Skor',
+]
+# Profildeki sayısal ve metin alanlar; metin olarak yazılmış sayılar dönüştürülür
+SAYISAL_ALANLAR = ['butce', *ESIKLER, *MALIYET_ALANLARI, *AGIRLIK_ALANLARI]
+METIN_ALANLARI = [*TEKLI_SECIMLER, 'kullanim_amaci']
+# Çıktıdaki ondalık sayılar (float32 sütunlar) bu hassasiyete yuvarlanır
+CIKTI_ONDALIK = 2
+
+# İşçi işlemindeki motor (fork ile devralınır veya ikili katalogdan açılır)
+_MOTOR = None
+_AYRISTIRICI = None
+
+
+def _isci_baslat(genis_dizini):
+    global _MOTOR
+    if _MOTOR is None and genis_dizini is not None:
+        _MOTOR = OneriMotoru.genisletilmisten(ikili_oku(genis_dizini))
+
+
+def _ayristirici():
+    # Notlardaki marka/model adları motorun kataloğundan tanınır
+    global _AYRISTIRICI
+    if _AYRISTIRICI is None:
+        _AYRISTIRICI = NotAyristirici.katalogdan(SecenekAgaci(_MOTOR.genis))
+    return _AYRISTIRICI
+
+
+def _sayi(alan, deger):
+    if isinstance(deger, bool):
+        raise ValueError(f"'{alan}' sayı olmalı: {deger!r}")
+    try:
+        sayi = float(deger)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{alan}' sayı olmalı: {deger!r}") from None
+    if not math.isfinite(sayi) or sayi < 0:
+        raise ValueError(f"'{alan}' sonlu ve negatif olmayan bir sayı olmalı: {deger!r}")
+    return sayi
+
+
+def _profil_alanlari(profil):
+    """Profildeki Sorgu alanlarını doğrular; hatalı değerde ValueError verir."""
+    if not isinstance(profil, dict):
+        raise ValueError("Profil bir JSON nesnesi olmalı")
+    alanlar = dict(profil)
+    for alan in SAYISAL_ALANLAR:
+        if alan in alanlar and not (alan == 'butce' and alanlar[alan] is None):
+            alanlar[alan] = _sayi(alan, alanlar[alan])
+    if 'k' in alanlar:
+        k = _sayi('k', alanlar['k'])
+        if k < 1 or not k.is_integer():
+            raise ValueError(f"'k' pozitif bir tam sayı olmalı: {alanlar['k']!r}")
+        alanlar['k'] = int(k)
+    for alan in METIN_ALANLARI:
+        if alan in alanlar and not isinstance(alanlar[alan], str):
+            raise ValueError(f"'{alan}' metin olmalı: {alanlar[alan]!r}")
+    if alanlar.get('not') is not None and not isinstance(alanlar['not'], str):
+        raise ValueError(f"'not' metin olmalı: {alanlar['not']!r}")
+    return alanlar
+
+
+def _profil_sorgusu(profil):
+    sorgu = Sorgu.sozlukten(_profil_alanlari(profil))
+    sorgu, _ = notu_uygula(sorgu, profil.get('not'), _ayristirici())
+    return sorgu
+
+
+def parca_isle(satirlar):
+    """Bir parça JSONL satırını yanıtlayıp çıktı satırlarını döndürür."""
+    kayitlar, sorgular, hatalar = [], [], {}
+    for i, satir in enumerate(satirlar):
+        kimlik, sorgu = None, None
+        try:
+            profil = json.loads(satir)
+            kimlik = profil.get('id') if isinstance(profil, dict) else None
+            sorgu = _profil_sorgusu(profil)
+        except (ValueError, TypeError, AttributeError) as e:
+            hatalar[i] = str(e)
+        kayitlar.append(kimlik)
+        sorgular.append(sorgu)
+
+    gecerli = [i for i, sorgu in enumerate(sorgular) if sorgu is not None]
+    try:
+        sonuclar = dict(zip(gecerli, _MOTOR.recommend_many([sorgular[i] for i in gecerli])))
+    except (ValueError, TypeError, KeyError):
+        # Toplu hesap bir profilde bozulursa profiller tek tek yanıtlanır; yalnızca hatalı olan hata kaydı alır
+        sonuclar = {}
+        for i in gecerli:
+            try:
+                sonuclar[i] = _MOTOR.recommend(sorgular[i])
+            except (ValueError, TypeError, KeyError) as e:
+                hatalar[i] = str(e)
+
+    cikti = []
+    for i, kimlik in enumerate(kayitlar):
+        if i not in sonuclar:
+            cikti.append(json.dumps({'id': kimlik, 'hata': hatalar[i]}, ensure_ascii=False))
+            continue
+        sonuc = sonuclar[i]
+        sutunlar = [_cikti_degerleri(sonuc[col]) for col in CIKTI_SUTUNLARI]
+        oneriler = [dict(zip(CIKTI_SUTUNLARI, degerler)) for degerler in zip(*sutunlar)]
+        cikti.append(json.dumps({'id': kimlik, 'oneriler': oneriler}, ensure_ascii=False))
+    return cikti
+
+
+def _cikti_degerleri(sutun):
+    if sutun.dtype.kind == 'f':
+        return [round(deger, CIKTI_ONDALIK) for deger in sutun.astype(float).tolist()]
+    return sutun.tolist()
+
+
+def _parcalar(dosya, boyut):
+    satirlar = (satir for satir in dosya if satir.strip())
+    while True:
+        parca = list(itertools.islice(satirlar, boyut))
+        if not parca:
+            return
+        yield parca
+
+
+def calistir(girdi, cikti, motor, isci=None, parca_boyutu=64):
+    """Girdi akışındaki profilleri işleyip çıktı akışına yazar; işlenen profil sayısını döndürür."""
+    global _MOTOR
+    isci = isci or os.cpu_count() or 1
+    sayac = 0
+
+    with tempfile.TemporaryDirectory(prefix='oneri-katalog-') as gecici:
+        # fork destekleniyorsa işçiler hazır motoru devralır; aksi halde ikili kataloğu eşler
+        yontemler = multiprocessing.get_all_start_methods()
+        if 'fork' in yontemler:
+            _MOTOR = motor
+            baglam = multiprocessing.get_context('fork')
+            genis_dizini = None
+        else:
+            baglam = multiprocessing.get_context()
+            genis_dizini = os.path.join(gecici, 'genis')
+            ikili_yaz(motor.genis, genis_dizini)
+
+        with baglam.Pool(isci, initializer=_isci_baslat, initargs=(genis_dizini,)) as havuz:
+            # Sıra korunur; bellekte en fazla isci * 4 parça bekler
+            bekleyen = collections.deque()
+            for parca in _parcalar(girdi, parca_boyutu):
+                bekleyen.append(havuz.apply_async(parca_isle, (parca,)))
+                if len(bekleyen) >= isci * 4:
+                    sayac += _yaz(cikti, bekleyen.popleft().get())
+            while bekleyen:
+                sayac += _yaz(cikti, bekleyen.popleft().get())
+    return sayac
+
+
+def _yaz(cikti, satirlar):
+    for satir in satirlar:
+        cikti.write(satir + '\n')
+    return len(satirlar)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSONL kullanıcı profilleri için toplu araç önerisi.")
+    parser.add_argument('girdi', help="Profil dosyası (JSONL, '-' ise standart girdi)")
+    parser.add_argument('-o', '--cikti', default='-', help="Çıktı dosyası (JSONL, varsayılan standart çıktı)")
+    parser.add_argument('--katalog', default='arabalar.csv')
+    parser.add_argument('--isci', type=int, default=None, help="İşçi işlem sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument('--parca', type=int, default=64, help="İşçiye tek seferde gönderilen profil sayısı")
+    args = parser.parse_args(argv)
+
+    motor = OneriMotoru.dosyadan(args.katalog)
+    girdi = sys.stdin if args.girdi == '-' else open(args.girdi, encoding='utf-8')
+    cikti = sys.stdout if args.cikti == '-' else open(args.cikti, 'w', encoding='utf-8')
+    baslangic = time.perf_counter()
+    try:
+        sayac = calistir(girdi, cikti, motor, args.isci, args.parca)
+    finally:
+        if girdi is not sys.stdin:
+            girdi.close()
+        if cikti is not sys.stdout:
+            cikti.close()
+    sure = time.perf_counter() - baslangic
+    print(f"{sayac} profil, {sure:.2f} sn, {sayac / sure if sure else 0:.1f} profil/sn", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
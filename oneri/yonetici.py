@@ -0,0 +1,161 @@
+"""Katalog dosyasını arka planda izleyip yeni sürümü istek yolunun dışında hazırlayan yönetici.
+
+Bir anlık görüntü (KatalogAnligi) katalogun doğrulanmış hali ile ondan türetilen
+büyük yapıların (genişletme, filtre indeksleri, seçenek ağacı, not ayrıştırıcısı,
+benzerlik matrisi, sonuç önbelleği) tamamıdır ve oluşturulduktan sonra değişmez.
+İzleyici iş parçacığı dosyanın değişiklik zamanı/boyutuna bakar; değişiklik bir
+sonraki yoklamada da sabitse (yazma bitmişse) içerik özetiyle gerçekten değişip
+değişmediğini doğrular, yeni görüntüyü hazırlar ve tek bir atamayla yerine koyar.
+Hazırlama başarısız olursa (ör. yarım kalmış veya hatalı CSV) eski görüntü kullanılmaya
+devam eder. Oturumlar kendi görüntülerini tuttuğundan bir etkileşimin ortasında
+katalog değişmez.
+
+    yonetici = KatalogYoneticisi('arabalar.csv').baslat()
+    anlik = yonetici.anlik()      # anlik.surum, anlik.motor, anlik.secenekler ...
+"""
+
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from oneri.benzerlik import BenzerlikIndeksi
+from oneri.depo import META_DOSYASI, ikili_dizin, katalog_oku, katalog_surumu
+from oneri.genisletme import DONANIM_SEVIYELERI
+from oneri.motor import OneriMotoru
+from oneri.not_analizi import NotAyristirici
+from oneri.olcum import soguk_baslangic_kaydet
+from oneri.onbellek import LRUOnbellek
+from oneri.secenekler import SecenekAgaci
+
+# Dosya değişikliklerinin yoklanma aralığı (saniye)
+YOKLAMA_ARALIGI = 2.0
+OZET_BLOGU = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class KatalogAnligi:
+    """Bir katalog sürümünden hazırlanmış, değişmeyen yapılar."""
+    surum: int
+    kaynak: tuple  # katalog_surumu(): dosyaların değişiklik zamanı ve boyutu
+    ozet: str
+    katalog: object
+    motor: OneriMotoru
+    secenekler: SecenekAgaci
+    ayristirici: NotAyristirici
+    benzerlik: BenzerlikIndeksi
+    onbellek: LRUOnbellek
+    hazirlanma_s: float
+
+
+def icerik_ozeti(file_path):
+    """CSV ve (varsa) ikili katalog meta dosyasının içerik özeti; yalnızca dokunulan dosyaları ayırt eder."""
+    ozet = hashlib.blake2b(digest_size=16)
+    for yol in (file_path, os.path.join(ikili_dizin(file_path), META_DOSYASI)):
+        try:
+            with open(yol, 'rb') as f:
+                while blok := f.read(OZET_BLOGU):
+                    ozet.update(blok)
+        except OSError:
+            ozet.update(b'-')
+        ozet.update(b'\0')
+    return ozet.hexdigest()
+
+
+def anlik_hazirla(file_path, surum, kaynak=None, ozet=None, seviyeler=DONANIM_SEVIYELERI):
+    """Katalogu okuyup doğrular ve tüm türetilmiş yapıları hazırlar."""
+    baslangic = time.perf_counter()
+    kaynak = katalog_surumu(file_path) if kaynak is None else kaynak
+    ozet = icerik_ozeti(file_path) if ozet is None else ozet
+    katalog = katalog_oku(file_path)
+    # Sonuç önbelleği görüntüye aittir: farklı sürümlerdeki oturumlar birbirinin önbelleğini boşaltmaz
+    onbellek = LRUOnbellek(maks_giris=512, maks_bayt=64 * 1024 * 1024)
+    motor = OneriMotoru(katalog, seviyeler, surum=surum, onbellek=onbellek)
+    # Seçim kutuları motorun filtrelediği genişletilmiş adlardan, bütçe slider'ı liste fiyatlarından
+    secenekler = SecenekAgaci(motor.genis, aralik_kaynagi=katalog)
+    return KatalogAnligi(
+        surum=surum,
+        kaynak=kaynak,
+        ozet=ozet,
+        katalog=katalog,
+        motor=motor,
+        secenekler=secenekler,
+        ayristirici=NotAyristirici.katalogdan(secenekler),
+        benzerlik=BenzerlikIndeksi(motor.genis),
+        onbellek=onbellek,
+        hazirlanma_s=time.perf_counter() - baslangic,
+    )
+
+
+class KatalogYoneticisi:
+    """Güncel katalog görüntüsünü tutar ve dosya değiştikçe arka planda yeniler.
+
+    İlk görüntü yapıcıda hazırlanır (hatalar çağırana iletilir); sonraki sürümler
+    yalnızca izleyici iş parçacığında hazırlanır.
+    """
+
+    def __init__(self, file_path, aralik=YOKLAMA_ARALIGI, hazirla=anlik_hazirla):
+        self.file_path = file_path
+        self.aralik = aralik
+        self.hazirla = hazirla
+        self.son_hata = None
+        self._anlik = hazirla(file_path, 1)
+        soguk_baslangic_kaydet('katalog_hazirlama', self._anlik.hazirlanma_s * 1000)
+        self._son_kaynak = self._anlik.kaynak
+        self._hatali_kaynak = None
+        self._durdur = threading.Event()
+        self._kilit = threading.Lock()
+        self._is_parcacigi = None
+
+    def anlik(self):
+        """Güncel görüntü. Referans ataması atomik olduğundan kilit gerekmez."""
+        return self._anlik
+
+    def baslat(self):
+        if self._is_parcacigi is None:
+            self._is_parcacigi = threading.Thread(target=self._izle, name='katalog-izleyici', daemon=True)
+            self._is_parcacigi.start()
+        return self
+
+    def durdur(self):
+        self._durdur.set()
+        if self._is_parcacigi is not None:
+            self._is_parcacigi.join()
+            self._is_parcacigi = None
+
+    def _izle(self):
+        while not self._durdur.wait(self.aralik):
+            try:
+                self.kontrol_et()
+            except Exception as e:  # izleyici hiçbir hatada durmamalı
+                self.son_hata = e
+
+    def kontrol_et(self):
+        """Dosya değişmiş ve yazımı bitmişse yeni görüntüyü hazırlayıp yerine koyar.
+
+        Yeni bir görüntü yerine konduysa True döner.
+        """
+        with self._kilit:
+            kaynak = katalog_surumu(self.file_path)
+            onceki, self._son_kaynak = self._son_kaynak, kaynak
+            mevcut = self._anlik
+            # Değişiklik yok, dosya hâlâ yazılıyor (son yoklamadan beri değişti)
+            # ya da bu hali daha önce hazırlanamadı
+            if kaynak in (mevcut.kaynak, self._hatali_kaynak) or kaynak != onceki:
+                return False
+            ozet = icerik_ozeti(self.file_path)
+            if ozet == mevcut.ozet:
+                # Yalnızca dokunulmuş ya da yüklü içeriğe geri dönülmüş: görüntü yeniden hazırlanmaz
+                self._anlik = replace(mevcut, kaynak=kaynak)
+                self.son_hata = None
+                return False
+            try:
+                yeni = self.hazirla(self.file_path, mevcut.surum + 1, kaynak, ozet)
+            except Exception as e:
+                self.son_hata = e
+                self._hatali_kaynak = kaynak
+                return False
+            self.son_hata = None
+            self._anlik = yeni
+            return True
@@ -0,0 +1,317 @@
+"""Gerçek sayfa betiğini tarayıcısız çalıştıran eşzamanlı oturum yük testi.
+
+Her simüle oturum Streamlit'in AppTest API'siyle `streamlit.app.py`'yi çalıştırır ve
+rastgele (tohumlu) ya da kaydedilmiş bir etkileşim dizisini oynatır: bütçe kaydırıcısı,
+marka→model seçimi, ağırlık değişikliği, serbest metin notu ve "Sonuçlardan Memnun
+Kalmadım" düğmesi. Her etkileşim tek bir rerun'dır ve süresi etkileşim türüyle kaydedilir.
+
+AppTest her çalıştırmada süreç genelindeki Runtime örneğini kurup sıfırladığından aynı
+süreçte iş parçacıklarıyla eşzamanlı oturum çalıştırılamaz; bu yüzden eşzamanlılık
+işçi süreçleriyle sağlanır. Her işçi kendi katalog önbelleğini ısıttıktan sonra diğerleriyle
+birlikte (bariyer) ölçüme başlar ve oturumlarını sırayla (round-robin) ilerletir; oturumlar
+test sonuna kadar canlı tutulduğundan oturum başına RSS artışı da ölçülür. Tek işçinin
+verimi bir çekirdeğin (Streamlit sunucusunun tek sürecinin) kapasitesidir; işçi sayısı
+artırıldığında verimin doğrusal artmadığı nokta çekirdeklerin doyduğu eşzamanlılıktır.
+
+    python -m oneri.yuk_testi --isci 1 2 4 --oturum 4 --etkilesim 20
+    python -m oneri.yuk_testi --isci 4 --kaydet senaryolar.json --cikti yuk_sonuclari/yeni.json
+    python -m oneri.yuk_testi --isci 4 --senaryo senaryolar.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import os
+import platform
+import resource
+import time
+
+import numpy as np
+
+VARSAYILAN_BETIK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit.app.py')
+ZAMAN_ASIMI = 120
+
+AGIRLIK_ANAHTARLARI = ['slider_onem_tuketim', 'slider_onem_performans', 'slider_onem_ikinci_el', 'slider_onem_guvenlik', 'slider_onem_konfor']
+MEMNUN_DEGILIM = "Sonuçlardan Memnun Kalmadım 👎"
+ORNEK_NOTLAR = [
+    "2 milyon tl'yi geçmeyecek, dizel, geniş bagaj SUV",
+    "elektrikli, aile için güvenli bir araç",
+    "3 milyon altı otomatik hatchback",
+    "performanslı benzinli sedan, 200 beygir üstü",
+    "şehir içi için ekonomik ve küçük",
+    "",
+]
+
+# Rastgele dizilerde etkileşim türlerinin ağırlıkları ('model' yalnızca 'marka'dan sonra gelir)
+ETKILESIM_AGIRLIKLARI = {'butce': 0.3, 'marka': 0.2, 'agirlik': 0.25, 'not': 0.15, 'memnun_degilim': 0.1}
+
+
+def rss_mb():
+    """Sürecin anlık yerleşik belleği (MB); /proc yoksa tepe değer."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+# --- Etkileşimler: ornekle(at, rng) -> deger, uygula(at, deger) ---
+
+def _butce_ornekle(at, rng):
+    slider = at.slider(key='slider_fiyat')
+    adim = 50_000
+    return int(rng.integers(slider.min // adim, slider.max // adim + 1)) * adim
+
+
+def _butce_uygula(at, deger):
+    slider = at.slider(key='slider_fiyat')
+    slider.set_value(min(max(deger, slider.min), slider.max))
+
+
+def _secim_ornekle(anahtar):
+    return lambda at, rng: int(rng.integers(len(at.selectbox(key=anahtar).options)))
+
+
+def _secim_uygula(anahtar):
+    def uygula(at, deger):
+        selectbox = at.selectbox(key=anahtar)
+        selectbox.select_index(deger % len(selectbox.options))
+    return uygula
+
+
+def _agirlik_ornekle(at, rng):
+    return [AGIRLIK_ANAHTARLARI[rng.integers(len(AGIRLIK_ANAHTARLARI))], int(rng.integers(1, 6))]
+
+
+def _agirlik_uygula(at, deger):
+    anahtar, onem = deger
+    at.slider(key=anahtar).set_value(onem)
+
+
+def _not_uygula(at, deger):
+    at.sidebar.text_area[0].input(deger)
+
+
+def _memnun_degilim_uygula(at, deger):
+    next(b for b in at.sidebar.button if b.label == MEMNUN_DEGILIM).click()
+
+
+ETKILESIMLER = {
+    'butce': (_butce_ornekle, _butce_uygula),
+    'marka': (_secim_ornekle('select_marka'), _secim_uygula('select_marka')),
+    'model': (_secim_ornekle('select_model'), _secim_uygula('select_model')),
+    'agirlik': (_agirlik_ornekle, _agirlik_uygula),
+    'not': (lambda at, rng: ORNEK_NOTLAR[rng.integers(len(ORNEK_NOTLAR))], _not_uygula),
+    'memnun_degilim': (lambda at, rng: None, _memnun_degilim_uygula),
+}
+
+
+class Oturum:
+    """Tek bir simüle tarayıcı oturumu: bir AppTest ve oynatılacak etkileşim dizisi.
+
+    `dizi` verilirse kaydedilmiş [etkileşim, değer] adımları sırayla oynatılır;
+    verilmezse adımlar `tohum`la rastgele üretilir ve `oynanan`a kaydedilir.
+    """
+
+    def __init__(self, betik, tohum, dizi=None):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(betik, default_timeout=ZAMAN_ASIMI)
+        self.rng = np.random.default_rng(tohum)
+        self.dizi = list(dizi) if dizi is not None else None
+        self.oynanan = []
+        self.hatalar = []
+        self._sonraki = None
+
+    def _calistir(self):
+        baslangic = time.perf_counter()
+        self.at.run()
+        sure = (time.perf_counter() - baslangic) * 1000
+        if self.at.exception:
+            self.hatalar.append(self.at.exception[0].message)
+        return sure
+
+    def ilk_yukleme(self):
+        return self._calistir()
+
+    def _siradaki(self):
+        if self.dizi is not None:
+            return self.dizi.pop(0) if self.dizi else None
+        if self._sonraki is not None:
+            ad, self._sonraki = self._sonraki, None
+        else:
+            adlar = list(ETKILESIM_AGIRLIKLARI)
+            olasiliklar = np.array(list(ETKILESIM_AGIRLIKLARI.values()))
+            ad = adlar[self.rng.choice(len(adlar), p=olasiliklar / olasiliklar.sum())]
+        if ad == 'marka':
+            self._sonraki = 'model'
+        return [ad, ETKILESIMLER[ad][0](self.at, self.rng)]
+
+    def adim(self):
+        """Sıradaki etkileşimi uygulayıp rerun eder; (etkileşim, ms) ya da dizi bittiyse None döner."""
+        adim = self._siradaki()
+        if adim is None:
+            return None
+        ad, deger = adim
+        ETKILESIMLER[ad][1](self.at, deger)
+        self.oynanan.append(adim)
+        return ad, self._calistir()
+
+
+def isci(no, betik, oturum_sayisi, etkilesim, tohum, diziler, bariyer, kuyruk):
+    """Bir işçi süreci: oturumları açar, diğer işçilerle aynı anda ölçüme başlar ve sonucu kuyruğa koyar."""
+    logging.disable(logging.WARNING)
+    oturumlar = [
+        Oturum(betik, tohum=(tohum, no, i), dizi=diziler[(no * oturum_sayisi + i) % len(diziler)] if diziler else None)
+        for i in range(oturum_sayisi)
+    ]
+    # İlk oturumun ilk çalıştırması katalog önbelleğini kurar (soğuk başlangıç)
+    soguk = oturumlar[0].ilk_yukleme()
+    rss_baslangic = rss_mb()
+    bariyer.wait()
+
+    sureler = {'ilk_yukleme': []}
+    duvar, cpu = time.perf_counter(), time.process_time()
+    for oturum in oturumlar[1:]:
+        sureler['ilk_yukleme'].append(oturum.ilk_yukleme())
+    for _ in range(etkilesim):
+        for oturum in oturumlar:
+            sonuc = oturum.adim()
+            if sonuc is not None:
+                sureler.setdefault(sonuc[0], []).append(sonuc[1])
+    duvar, cpu = time.perf_counter() - duvar, time.process_time() - cpu
+
+    kuyruk.put({
+        'isci': no,
+        'soguk_baslangic_ms': soguk,
+        'sureler': sureler,
+        'duvar_s': duvar,
+        'cpu_s': cpu,
+        'rss_baslangic_mb': rss_baslangic,
+        'rss_son_mb': rss_mb(),
+        'oturum': oturum_sayisi,
+        'hatalar': [h for oturum in oturumlar for h in oturum.hatalar],
+        'oynanan': [oturum.oynanan for oturum in oturumlar],
+    })
+
+
+def seviye_olc(isci_sayisi, oturum_sayisi, etkilesim, betik=VARSAYILAN_BETIK, tohum=0, diziler=None):
+    """`isci_sayisi` eşzamanlı süreçle yük testi; işçi sonuçlarını döndürür."""
+    baglam = mp.get_context('spawn')
+    bariyer = baglam.Barrier(isci_sayisi)
+    kuyruk = baglam.Queue()
+    surecler = [
+        baglam.Process(target=isci, args=(no, betik, oturum_sayisi, etkilesim, tohum, diziler, bariyer, kuyruk))
+        for no in range(isci_sayisi)
+    ]
+    for surec in surecler:
+        surec.start()
+    # Kuyruk, süreçler beklenmeden önce boşaltılır (büyük sonuçlar borudan çıkmadan süreç bitmez)
+    sonuclar = [kuyruk.get() for _ in surecler]
+    for surec in surecler:
+        surec.join()
+    return sorted(sonuclar, key=lambda s: s['isci'])
+
+
+def _yuzdelikler(sureler):
+    sureler = np.asarray(sureler, dtype=float)
+    if not len(sureler):
+        return {'adet': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(sureler, [50, 95, 99])
+    return {'adet': len(sureler), 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+def seviye_ozeti(isciler):
+    """İşçi sonuçlarından etkileşim bazında gecikme yüzdelikleri, verim ve bellek özeti."""
+    etkilesimler = {}
+    for sonuc in isciler:
+        for ad, sureler in sonuc['sureler'].items():
+            etkilesimler.setdefault(ad, []).extend(sureler)
+    tum = [s for ad, sureler in etkilesimler.items() if ad != 'ilk_yukleme' for s in sureler]
+    duvar = max(sonuc['duvar_s'] for sonuc in isciler)
+    oturum = sum(sonuc['oturum'] for sonuc in isciler)
+    return {
+        'isci': len(isciler),
+        'oturum': oturum,
+        'rerun': len(tum),
+        'verim_rerun_s': len(tum) / duvar if duvar else None,
+        'cpu_kullanimi': float(np.mean([sonuc['cpu_s'] / sonuc['duvar_s'] for sonuc in isciler if sonuc['duvar_s']])),
+        'soguk_baslangic_ms': float(np.mean([sonuc['soguk_baslangic_ms'] for sonuc in isciler])),
+        'rss_oturum_basi_mb': float(np.mean([
+            (sonuc['rss_son_mb'] - sonuc['rss_baslangic_mb']) / max(sonuc['oturum'] - 1, 1) for sonuc in isciler
+        ])),
+        'rss_isci_mb': float(np.mean([sonuc['rss_son_mb'] for sonuc in isciler])),
+        'hata': sum(len(sonuc['hatalar']) for sonuc in isciler),
+        'tum': _yuzdelikler(tum),
+        'etkilesimler': {ad: _yuzdelikler(sureler) for ad, sureler in sorted(etkilesimler.items())},
+    }
+
+
+def _ms(deger):
+    return '-' if deger is None else f"{deger:.0f}"
+
+
+def rapor_yaz(ozetler):
+    print(f"\n{'işçi':>5}{'oturum':>8}{'rerun':>7}{'rerun/s':>9}{'ölçekl.':>9}{'CPU':>6}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'MB/oturum':>11}{'MB/işçi':>9}{'hata':>6}")
+    tekli_verim = None
+    for ozet in ozetler:
+        if ozet['isci'] == 1:
+            tekli_verim = ozet['verim_rerun_s']
+        # Ölçeklenme: tek işçiye göre verim artışının işçi sayısına oranı (1.0 doğrusal)
+        olcek = f"{ozet['verim_rerun_s'] / (tekli_verim * ozet['isci']):.2f}" if tekli_verim else '-'
+        print(f"{ozet['isci']:>5}{ozet['oturum']:>8}{ozet['rerun']:>7}{ozet['verim_rerun_s']:>9.2f}{olcek:>9}"
+              f"{ozet['cpu_kullanimi']:>6.2f}{_ms(ozet['tum']['p50_ms']):>9}{_ms(ozet['tum']['p95_ms']):>9}"
+              f"{_ms(ozet['tum']['p99_ms']):>9}{ozet['rss_oturum_basi_mb']:>11.1f}{ozet['rss_isci_mb']:>9.0f}{ozet['hata']:>6}")
+    for ozet in ozetler:
+        print(f"\n== {ozet['isci']} işçi: etkileşim bazında rerun gecikmesi "
+              f"(soğuk başlangıç {ozet['soguk_baslangic_ms']:.0f} ms) ==")
+        print(f"{'etkileşim':<16}{'adet':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for ad, olcum in ozet['etkilesimler'].items():
+            print(f"{ad:<16}{olcum['adet']:>6}{_ms(olcum['p50_ms']):>9}{_ms(olcum['p95_ms']):>9}{_ms(olcum['p99_ms']):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sayfa betiği üzerinde eşzamanlı oturum yük testi.")
+    parser.add_argument('--isci', type=int, nargs='+', default=[1, 2, 4], help="Denenecek eşzamanlı süreç sayıları")
+    parser.add_argument('--oturum', type=int, default=4, help="İşçi başına canlı oturum sayısı")
+    parser.add_argument('--etkilesim', type=int, default=20, help="Oturum başına etkileşim sayısı")
+    parser.add_argument('--betik', default=VARSAYILAN_BETIK)
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--senaryo', help="Oynatılacak kaydedilmiş etkileşim dizileri (JSON)")
+    parser.add_argument('--kaydet', help="Oynanan etkileşim dizilerinin yazılacağı JSON dosyası")
+    parser.add_argument('--cikti', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    diziler = None
+    if args.senaryo:
+        with open(args.senaryo, encoding='utf-8') as f:
+            diziler = json.load(f)
+
+    ozetler, oynanan = [], []
+    for isci_sayisi in args.isci:
+        print(f"{isci_sayisi} işçi × {args.oturum} oturum × {args.etkilesim} etkileşim...", flush=True)
+        isciler = seviye_olc(isci_sayisi, args.oturum, args.etkilesim, args.betik, args.tohum, diziler)
+        ozetler.append(seviye_ozeti(isciler))
+        for sonuc in isciler:
+            for hata in dict.fromkeys(sonuc['hatalar']):
+                print(f"  işçi {sonuc['isci']} hata: {hata}")
+        # En kalabalık seviyenin dizileri kaydedilir
+        if len(isciler) * args.oturum > len(oynanan):
+            oynanan = [dizi for sonuc in isciler for dizi in sonuc['oynanan']]
+    rapor_yaz(ozetler)
+
+    if args.kaydet:
+        with open(args.kaydet, 'w', encoding='utf-8') as f:
+            json.dump(oynanan, f, ensure_ascii=False, indent=1)
+        print(f"\nEtkileşim dizileri -> {args.kaydet}")
+    if args.cikti:
+        os.makedirs(os.path.dirname(args.cikti) or '.', exist_ok=True)
+        ortam = {'python': platform.python_version(), 'makine': platform.machine(), 'islemci_sayisi': os.cpu_count()}
+        with open(args.cikti, 'w', encoding='utf-8') as f:
+            json.dump({'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'), 'ortam': ortam, 'ozetler': ozetler}, f, indent=1)
+        print(f"\nSonuçlar -> {args.cikti}")
+
+
+if __name__ == '__main__':
+    main()
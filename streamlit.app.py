@@ -1,9 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import os
 import textwrap
-import re # 5. özellik için regular expression modülünü ekliyoruz
+from dataclasses import replace
+
+from oneri.genisletme import DONANIM_SEVIYELERI
+from oneri.grafikler import GRAFIK_ONBELLEGI, maliyet_grafigi, pareto_grafigi, radar_grafigi, tco_grafigi
+from oneri.katalog import KatalogHatasi
+from oneri.duyarlilik import AGIRLIK_ETIKETLERI
+from oneri.gevsetme import KISIT_ETIKETLERI, KisitMatrisi
+from oneri.boru_hatti import oneri_hatti
+from oneri.motor import AGIRLIK_ALANLARI, FARKETMEZ, Sorgu
+from oneri.not_analizi import notu_uygula
+from oneri.olcum import KAPALI, Olcer, soguk_baslangic, soguk_baslangic_kaydet, surec_yasi_ms
+from oneri.pareto import PARETO_ETIKETLERI, PARETO_YONLERI, VARSAYILAN_BOYUTLAR
+from oneri.sahiplik import TcoVarsayimlari
+from oneri.siralama import en_iyiler
+from oneri.tablo import SIRA_SUTUNU, SKOR_SUTUNU, TL_SUTUNLARI
+from oneri.secenekler import etiketle, facet_sayilari
+from oneri.yonetici import KatalogYoneticisi
 
 # --- Custom CSS Function for Professional Look ---
 def set_custom_style():
@@ -58,48 +74,57 @@ st.set_page_config(
 # Custom stil ayarlarını uygula
 set_custom_style()
 
+# --- Performans Ölçümü ---
+# Adres çubuğuna ?perf=1 eklenirse sidebar'da gizli performans paneli açılır. ONERI_OLCUM_LOG
+# tanımlıysa her rerun'ın ölçümleri bu JSON-lines dosyasına eklenir (özet: python -m oneri.olcum
+# <dosya>). İkisi de yoksa ölçüm kapalıdır. tracemalloc tüm süreci yavaşlattığından bellek ölçümü
+# (&bellek=1) yalnızca ONERI_OLCUM_BELLEK=1 ile başlatılan sunucularda açılabilir.
+OLCUM_LOG = os.environ.get('ONERI_OLCUM_LOG')
+BELLEK_OLCUMU = os.environ.get('ONERI_OLCUM_BELLEK') == '1'
+perf_paneli = st.query_params.get('perf') == '1'
+olcer = Olcer(bellek=BELLEK_OLCUMU and st.query_params.get('bellek') == '1') if (perf_paneli or OLCUM_LOG) else KAPALI
+
+def olcumu_bitir():
+    olcer.adim()
+    # Sürecin ilk rerun'ı bittiğinde: yeni bir işçinin ilk sayfayı sunmaya hazır olma süresi
+    soguk_baslangic_kaydet('ilk_rerun_hazir', surec_yasi_ms())
+    if OLCUM_LOG:
+        oturum = st.session_state.setdefault('olcum_oturumu', os.urandom(6).hex())
+        olcer.jsonl_yaz(OLCUM_LOG, oturum=oturum, surum=str(veri_surumu))
+    if perf_paneli:
+        with st.sidebar.expander("⏱ Performans (bu rerun)", expanded=True):
+            tablo = olcer.tablo()
+            st.dataframe(tablo, hide_index=True, use_container_width=True)
+            st.caption(f"Toplam: {tablo['sure_ms'].sum():,.1f} ms")
+            soguk = soguk_baslangic()
+            grafik = GRAFIK_ONBELLEGI.istatistik()
+            st.caption(
+                "Soğuk başlangıç (süreç başına): "
+                + ", ".join(f"{ad} {sure:,.0f} ms" for ad, sure in soguk.items())
+                + f" · Grafik önbelleği: {grafik['giris']} figür, isabet %{100 * grafik['isabet_orani']:.0f}"
+            )
+
 # --- Uygulama Başlığı ve Tanıtım ---
 st.title("Akıllı Araba Öneri ve Karşılaştırma Aracı")
 st.markdown("<h3 style='text-align: center; color: #555;'>Milyonlarca Kombinasyon İçinden Size En Uygun Aracı Bulun</h3>", unsafe_allow_html=True)
 
 
 # --- Veri Yükleme ve Hata Kontrolü ---
-@st.cache_data
+# Katalog ve ondan türetilen tüm yapılar (donanım genişletmesi, filtre indeksleri, seçenek
+# ağacı, not ayrıştırıcısı, benzerlik matrisi, sonuç önbelleği) bir anlık görüntüde tutulur
+# ve tüm oturumlarca paylaşılır. Yönetici dosyayı arka planda izler; yeni sürüm istek
+# yolunun dışında hazırlanıp tek atamayla yerine konur. İkili katalog (python -m oneri.depo)
+# varsa bellek eşlemeli olarak açılır, yoksa CSV okunur.
+@st.cache_resource
+def katalog_yoneticisi(file_path):
+    return KatalogYoneticisi(file_path).baslat()
+
 def load_data(file_path):
     try:
-        df = pd.read_csv(file_path, sep=',', quotechar='"', skipinitialspace=True)
-        
-        required_cols = [
-            'model', 'marka', 'motor_donanim', 'fiyat_tl', 'donanim_skor', 
-            'guvenlik_skor', 'performans_skor', 'konfor_skor', 'ikinci_el_skor', 
-            'tuketim_kwh', 'ev_sarj_tl', 'yillik_mtv', 'yillik_sigorta', 
-            'yillik_bakim', 'ortalama_tuketim', 'beygir_gucu', 'tork_nm', 
-            'hizlanma_0_100s', 'elektrikli_menzil_km', 'gövde_uzunlugu_mm', 
-            'bagaj_hacmi_lt', 'kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci'
-        ]
-        
-        for col in required_cols:
-            if col not in df.columns:
-                st.error(f"Hata: CSV dosyasında **'{col}'** sütunu eksik. Lütfen size gönderdiğim **son CSV içeriğini** kontrol edin.")
-                return None
-        
-        score_cols = ['donanim_skor', 'guvenlik_skor', 'performans_skor', 'konfor_skor', 'ikinci_el_skor']
-        for col in score_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        maliyet_cols = [
-            'tuketim_kwh', 'ev_sarj_tl', 'yillik_mtv', 'yillik_sigorta', 
-            'yillik_bakim', 'fiyat_tl', 'ortalama_tuketim', 'beygir_gucu', 
-            'tork_nm', 'hizlanma_0_100s', 'elektrikli_menzil_km', 'gövde_uzunlugu_mm', 
-            'bagaj_hacmi_lt'
-        ]
-        for col in maliyet_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        
-        for col in ['marka', 'model', 'motor_donanim', 'kasa_tipi', 'yakit_tipi', 'sanziman', 'kullanim_amaci']:
-            df[col] = df[col].astype(str).str.strip().replace('nan', '') 
-            
-        return df
+        return katalog_yoneticisi(file_path)
+    except KatalogHatasi as e:
+        st.error(f"Hata: CSV dosyasında **'{e.sutun}'** sütunu eksik. Lütfen size gönderdiğim **son CSV içeriğini** kontrol edin.")
+        return None
     except FileNotFoundError:
         st.error(f"Hata: 'arabalar.csv' dosyası bulunamadı. Lütfen dosya adını kontrol edin.")
         return None
@@ -107,13 +132,67 @@ def load_data(file_path):
         st.error(f"Veri yüklenirken kritik bir hata oluştu: CSV dosyası formatı hatalı. (Detay: {e})")
         return None
 
-df_original = load_data('arabalar.csv')
+VERI_DOSYASI = 'arabalar.csv'
+olcer.adim('yukleme')
+yonetici = load_data(VERI_DOSYASI)
 
-if df_original is None:
+if yonetici is None:
     st.stop()
 
+# Her oturum kendi görüntüsüyle çalışır: katalog güncellendiğinde öneriler, seçimler ve
+# karşılaştırmalar kullanıcı yeni sürüme geçene kadar değişmez
+def katalogu_guncelle():
+    yeni = yonetici.anlik()
+    st.session_state['katalog_anligi'] = yeni
+    # Yeni katalogda bulunmayan seçimler sıfırlanır
+    for anahtar, gecerli in [
+        ('select_marka', yeni.secenekler.markalar),
+        ('select_model', yeni.secenekler.tum_modeller),
+        ('select_kasa', yeni.secenekler.degerler['kasa_tipi']),
+        ('select_yakit', yeni.secenekler.degerler['yakit_tipi']),
+        ('select_sanziman', yeni.secenekler.degerler['sanziman']),
+        ('select_kullanim', yeni.secenekler.degerler['kullanim_amaci']),
+    ]:
+        if st.session_state.get(anahtar, FARKETMEZ) not in [FARKETMEZ, *gecerli]:
+            st.session_state[anahtar] = FARKETMEZ
+    st.session_state['select_motor'] = FARKETMEZ
+
+anlik = st.session_state.get('katalog_anligi')
+if anlik is None:
+    anlik = st.session_state['katalog_anligi'] = yonetici.anlik()
+if yonetici.anlik().surum != anlik.surum:
+    col_katalog1, col_katalog2 = st.columns([4, 1])
+    col_katalog1.info(f"Katalog güncellendi (sürüm {yonetici.anlik().surum}). Bu oturum sürüm {anlik.surum} ile devam ediyor.")
+    col_katalog2.button("Güncel kataloğa geç", key='katalog_gecisi', on_click=katalogu_guncelle)
+if yonetici.son_hata is not None:
+    st.sidebar.warning(f"Katalog dosyasındaki son değişiklik yüklenemedi; önceki sürüm kullanılıyor. (Detay: {yonetici.son_hata})")
+
+veri_surumu = anlik.surum
+df_original = anlik.katalog
+motor = anlik.motor
+olcer.cikti(motor.genis)
+secenekler = anlik.secenekler
+
+def nota_gore_sorgu(sorgu, not_metni):
+    """Nottaki istekleri ve nota uygulanmış gevşetmeleri sorguya ekler.
+
+    (sorgu, uyarılar, nottan gelen alanlar, uygulanan gevşetmeler) döner; seçenek
+    sayıları da öneriler de bu sorguyla hesaplanır.
+    """
+    yeni, uyarilar = notu_uygula(sorgu, not_metni, anlik.ayristirici)
+    # Nottan gelen kısıtlar widget'lardan gevşetilemez; gevşetme önerilerinde seçilen
+    # değerler not değişene kadar notun üzerine uygulanır
+    nottan_gelenler = {alan for alan in KISIT_ETIKETLERI if getattr(yeni, alan) != getattr(sorgu, alan)}
+    gevsetmeler = {}
+    not_gevsetmeleri = st.session_state.get('not_gevsetmeleri')
+    if not_gevsetmeleri and not_gevsetmeleri['not'] == not_metni:
+        gevsetmeler = {alan: deger for alan, deger in not_gevsetmeleri['degerler'].items() if alan in nottan_gelenler}
+        yeni = replace(yeni, **gevsetmeler)
+    return yeni, uyarilar, nottan_gelenler, gevsetmeler
+
 
 # --- Sol Sütun: CANLI Filtreler ---
+olcer.adim('sidebar')
 st.sidebar.header("Öneri Sistemi Kriterleri")
 st.sidebar.markdown("---")
 
@@ -134,8 +213,8 @@ if 'onem_konfor' not in st.session_state:
 
 with st.sidebar.container(border=True):
     st.subheader("1. Kapsam ve Temel Filtreler")
-    min_fiyat = int(df_original['fiyat_tl'].min()) if not df_original.empty else 0
-    max_fiyat_csv = int(df_original['fiyat_tl'].max()) if not df_original.empty else 1000000
+    min_fiyat = int(secenekler.araliklar['fiyat_tl'][0]) if not df_original.empty else 0
+    max_fiyat_csv = int(secenekler.araliklar['fiyat_tl'][1]) if not df_original.empty else 1000000
     max_fiyat = int(max_fiyat_csv * 1.5) 
 
     secilen_fiyat_araligi = st.slider(
@@ -148,47 +227,60 @@ with st.sidebar.container(border=True):
         key='slider_fiyat' # NLP güncellemeleri için anahtar ekledik
     )
 
-    marka_secenekleri = ['Farketmez'] + sorted(df_original['marka'].unique().tolist())
-    secilen_marka = st.selectbox("Marka Tercihi:", marka_secenekleri, key='select_marka')
+    # Seçeneklerin yanındaki sayılar diğer aktif filtrelere göre kaç sonuç kaldığını gösterir.
+    # Widget'ların güncel değerleri henüz çizilmeden session_state'ten okunur; motor seçimi
+    # ve not da önerilerdeki gibi uygulanır.
+    durum = st.session_state
+    facet_sorgusu = Sorgu(
+        butce=secilen_fiyat_araligi,
+        marka=durum.get('select_marka', FARKETMEZ),
+        model=durum.get('select_model', FARKETMEZ),
+        motor=durum.get('select_motor', FARKETMEZ),
+        kasa_tipi=durum.get('select_kasa', FARKETMEZ),
+        yakit_tipi=durum.get('select_yakit', FARKETMEZ),
+        sanziman=durum.get('select_sanziman', FARKETMEZ),
+        kullanim_amaci=durum.get('select_kullanim', FARKETMEZ),
+        min_performans=durum.get('slider_min_performans', 1),
+        min_guvenlik=durum.get('slider_min_guvenlik', 1),
+        min_beygir_gucu=durum.get('input_min_beygir', 0),
+        min_bagaj_hacmi=durum.get('input_min_bagaj', 0),
+    )
+    if facet_sorgusu.model not in secenekler.modeller(facet_sorgusu.marka):
+        facet_sorgusu = replace(facet_sorgusu, model=FARKETMEZ)
+    if facet_sorgusu.motor not in secenekler.motorlar(facet_sorgusu.marka, facet_sorgusu.model):
+        facet_sorgusu = replace(facet_sorgusu, motor=FARKETMEZ)
+    facet_sorgusu, _, _, _ = nota_gore_sorgu(facet_sorgusu, durum.get('text_ozel_beklenti', ''))
+    facetler = facet_sayilari(motor.indeks, facet_sorgusu)
 
-    if secilen_marka != 'Farketmez':
-        modeller_df = df_original[df_original['marka'] == secilen_marka]
-        model_secenekleri = ['Farketmez'] + sorted(modeller_df['model'].unique().tolist())
-    else:
-        model_secenekleri = ['Farketmez'] + sorted(df_original['model'].unique().tolist())
-    secilen_model = st.selectbox("Model Tercihi:", model_secenekleri)
-
-    if secilen_model != 'Farketmez':
-        motor_df = df_original[(df_original['marka'] == secilen_marka) & (df_original['model'] == secilen_model)]
-        motor_secenekleri = ['Farketmez'] + sorted(motor_df['motor_donanim'].unique().tolist())
-    elif secilen_marka != 'Farketmez':
-        motor_df = df_original[df_original['marka'] == secilen_marka]
-        motor_secenekleri = ['Farketmez'] + sorted(motor_df['motor_donanim'].unique().tolist())
-    else:
-        motor_secenekleri = ['Farketmez'] 
+    marka_secenekleri = ['Farketmez'] + secenekler.markalar
+    secilen_marka = st.selectbox("Marka Tercihi:", marka_secenekleri, key='select_marka', format_func=etiketle(facetler['marka']))
+
+    model_secenekleri = ['Farketmez'] + secenekler.modeller(secilen_marka)
+    secilen_model = st.selectbox("Model Tercihi:", model_secenekleri, key='select_model', format_func=etiketle(facetler['model']))
 
-    secilen_motor = st.selectbox("Motor / Donanım Tercihi:", motor_secenekleri)
+    motor_secenekleri = ['Farketmez'] + secenekler.motorlar(secilen_marka, secilen_model)
+    secilen_motor = st.selectbox("Motor / Donanım Tercihi:", motor_secenekleri, key='select_motor')
 
-    kasa_secenekleri = ['Farketmez'] + sorted(df_original['kasa_tipi'].unique().tolist())
-    secilen_kasa = st.selectbox("Kasa Tipi Tercihi:", kasa_secenekleri, key='select_kasa')
+    kasa_secenekleri = ['Farketmez'] + secenekler.degerler['kasa_tipi']
+    secilen_kasa = st.selectbox("Kasa Tipi Tercihi:", kasa_secenekleri, key='select_kasa', format_func=etiketle(facetler['kasa_tipi']))
 
-    yakit_secenekleri = ['Farketmez'] + sorted(df_original['yakit_tipi'].unique().tolist())
-    secilen_yakit = st.selectbox("En Çok Tercih Edilen Yakıt Tipi:", yakit_secenekleri, key='select_yakit') 
+    yakit_secenekleri = ['Farketmez'] + secenekler.degerler['yakit_tipi']
+    secilen_yakit = st.selectbox("En Çok Tercih Edilen Yakıt Tipi:", yakit_secenekleri, key='select_yakit', format_func=etiketle(facetler['yakit_tipi']))
 
-    sanziman_secenekleri = ['Farketmez'] + sorted(df_original['sanziman'].unique().tolist())
-    secilen_sanziman = st.selectbox("Vites Tipi Tercihi:", sanziman_secenekleri)
+    sanziman_secenekleri = ['Farketmez'] + secenekler.degerler['sanziman']
+    secilen_sanziman = st.selectbox("Vites Tipi Tercihi:", sanziman_secenekleri, key='select_sanziman', format_func=etiketle(facetler['sanziman']))
 
-    kullanim_secenekleri = ['Farketmez'] + sorted(df_original['kullanim_amaci'].unique().tolist())
-    secilen_kullanim = st.selectbox("Aracın Ana Kullanım Amacı:", kullanim_secenekleri)
+    kullanim_secenekleri = ['Farketmez'] + secenekler.degerler['kullanim_amaci']
+    secilen_kullanim = st.selectbox("Aracın Ana Kullanım Amacı:", kullanim_secenekleri, key='select_kullanim', format_func=etiketle(facetler['kullanim_amaci']))
 
 
 # --- 2. Teknik ve Skor Eşikleri ---
 with st.sidebar.expander("2. Performans ve Güvenlik Limitleri", expanded=True):
-    min_performans = st.slider("Minimum Subjektif Performans Skoru (1-5):", 1, 5, 1)
-    min_guvenlik = st.slider("Minimum Güvenlik Skoru (1-5):", 1, 5, 1)
+    min_performans = st.slider("Minimum Subjektif Performans Skoru (1-5):", 1, 5, 1, key='slider_min_performans')
+    min_guvenlik = st.slider("Minimum Güvenlik Skoru (1-5):", 1, 5, 1, key='slider_min_guvenlik')
 
-    min_beygir_gucu = st.number_input("Minimum Beygir Gücü (HP):", min_value=0, max_value=int(df_original['beygir_gucu'].max()), value=0, step=10)
-    min_bagaj_hacmi = st.number_input("Minimum Bagaj Hacmi (Litre):", min_value=0, max_value=int(df_original['bagaj_hacmi_lt'].max()), value=0, step=50)
+    min_beygir_gucu = st.number_input("Minimum Beygir Gücü (HP):", min_value=0, max_value=int(secenekler.araliklar['beygir_gucu'][1]), value=0, step=10, key='input_min_beygir')
+    min_bagaj_hacmi = st.number_input("Minimum Bagaj Hacmi (Litre):", min_value=0, max_value=int(secenekler.araliklar['bagaj_hacmi_lt'][1]), value=0, step=50, key='input_min_bagaj')
 
 # --- 3. Maliyet Girdileri ---
 with st.sidebar.expander("3. İşletme Maliyeti Verileri", expanded=True):
@@ -222,98 +314,63 @@ with st.sidebar.container(border=True):
     ozel_beklenti = st.text_area(
         "Özel beklentiniz hakkında serbestçe bir cümle yazın:", 
         max_chars=200,
-        placeholder="Örn: 500 bin TL'yi geçmeyecek, dizel yakıtlı, geniş bagajlı bir SUV istiyorum."
+        placeholder="Örn: 500 bin TL'yi geçmeyecek, dizel yakıtlı, geniş bagajlı bir SUV istiyorum.",
+        key='text_ozel_beklenti'
     )
 
 
 # --- Ana Ekran: Sonuçların Gösterilmesi ---
 
 # 1. TEMEL FİLTRELEME 
-filtreli_df = df_original.copy()
-filtreli_df = filtreli_df.dropna(subset=['marka', 'model', 'fiyat_tl'])
-filtreli_df = filtreli_df[(filtreli_df['fiyat_tl'] > 0) & (filtreli_df['model'] != '')]
-
 # Fiyat Çarpanı Ekleme (VERİ TABANINI SİMÜLE OLARAK BÜYÜTME)
-donanim_seviyeleri = ['Giriş', 'Orta', 'Full']
-fiyat_carpanlari = [0.85, 1.0, 1.15] 
-skor_degisimi = [-0.15, 0, 0.15] 
-
-genisletilmis_data = []
-
-for index, row in filtreli_df.iterrows():
-    for seviye, carpan, skor_farki in zip(donanim_seviyeleri, fiyat_carpanlari, skor_degisimi):
-        new_row = row.copy()
-        
-        new_row['fiyat_tl'] = row['fiyat_tl'] * carpan
-        base_donanim = str(row['motor_donanim']).replace('"', '').split('(')[0].strip()
-        new_row['motor_donanim'] = base_donanim + f" ({seviye})"
-        
-        new_row['donanim_skor'] = np.clip(row['donanim_skor'] + skor_farki, 1, 5)
-        new_row['konfor_skor'] = np.clip(row['konfor_skor'] + skor_farki, 1, 5)
-        
-        new_row['yillik_mtv'] = int(row['yillik_mtv'] * carpan)
-        new_row['yillik_sigorta'] = int(row['yillik_sigorta'] * carpan)
-        
-        genisletilmis_data.append(new_row)
-
-filtreli_df = pd.DataFrame(genisletilmis_data)
+# Genişletilmiş katalog motorla birlikte önbellekten gelir
+filtreli_df = motor.genis
+
+# Tüm sidebar tercihleri tek bir sorgu nesnesinde toplanır
+sorgu = Sorgu(
+    butce=secilen_fiyat_araligi,
+    marka=secilen_marka,
+    model=secilen_model,
+    motor=secilen_motor,
+    kasa_tipi=secilen_kasa,
+    yakit_tipi=secilen_yakit,
+    sanziman=secilen_sanziman,
+    kullanim_amaci=secilen_kullanim,
+    min_performans=min_performans,
+    min_guvenlik=min_guvenlik,
+    min_beygir_gucu=min_beygir_gucu,
+    min_bagaj_hacmi=min_bagaj_hacmi,
+    yillik_km=yillik_km,
+    yakit_fiyat=yakit_fiyat_input,
+    elektrik_fiyat=elektrik_fiyat_input,
+    onem_tuketim=onem_tuketim,
+    onem_performans=onem_performans,
+    onem_ikinci_el=onem_ikinci_el,
+    onem_guvenlik=onem_guvenlik,
+    onem_konfor=onem_konfor,
+)
 
 # --- 5. NLP Benzeri Filtreleme (Chatbot Arayüzü) ---
-if ozel_beklenti:
-    
-    # 1. Bütçe Analizi (Örn: 500 bin TL, 1 milyon)
-    fiyat_match = re.search(r'(\d+)\s*(milyon|bin)?\s*tl', ozel_beklenti, re.IGNORECASE)
-    if fiyat_match:
-        try:
-            fiyat = int(fiyat_match.group(1))
-            birim = fiyat_match.group(2)
-            if birim and 'milyon' in birim.lower():
-                max_fiyat_nlp = fiyat * 1000000
-            elif birim and 'bin' in birim.lower():
-                max_fiyat_nlp = fiyat * 1000
-            else:
-                max_fiyat_nlp = fiyat
-                
-            if max_fiyat_nlp < secilen_fiyat_araligi:
-                secilen_fiyat_araligi = max_fiyat_nlp
-                st.warning(f"Özel notunuzdaki bütçe ({max_fiyat_nlp:,.0f} TL) slider değerinden daha düşük. Bütçe filtreniz otomatik olarak güncellendi. (Sidebar'da güncellenmeyi görebilirsiniz.)")
-        except Exception:
-            pass # Sayı formatı hatası
-
-    # 2. Kasa Tipi Analizi (Örn: SUV, Sedan)
-    kasa_tipleri = ['SUV', 'Sedan', 'Hatchback', 'Station Wagon', 'Coupe', 'Pick-up']
-    for tip in kasa_tipleri:
-        if tip.lower() in ozel_beklenti.lower():
-            if secilen_kasa == 'Farketmez':
-                secilen_kasa = tip
-                st.warning(f"Özel notunuzdan **'{tip}'** Kasa Tipi tercihi algılandı ve filtreye uygulandı.")
-            break
-            
-    # 3. Yakıt Tipi Analizi (Örn: Dizel, Elektrikli, Hibrit)
-    yakit_tipleri = ['Dizel', 'Benzin', 'Elektrikli', 'Hibrit', 'LPG']
-    for yakit in yakit_tipleri:
-        if yakit.lower() in ozel_beklenti.lower():
-            if secilen_yakit == 'Farketmez':
-                secilen_yakit = yakit
-                st.warning(f"Özel notunuzdan **'{yakit}'** Yakıt Tipi tercihi algılandı ve filtreye uygulandı.")
-            break
-            
-    # 4. Bagaj Hacmi Analizi (Basit bir kontrol)
-    if any(kelime in ozel_beklenti.lower() for kelime in ['geniş bagaj', 'büyük bagaj', 'yük taşıma']):
-        if min_bagaj_hacmi < 400: # Eğer kullanıcı 400lt'den az girmişse, bunu zorla artır
-             min_bagaj_hacmi = 400
-             st.warning("Özel notunuzdaki 'geniş bagaj' isteği nedeniyle minimum bagaj hacmi 400 litreye yükseltildi.")
-            
+# Notta algılanan bütçe, marka/model, kasa/yakıt/vites, beygir gücü, bagaj, menzil,
+# yıllık km ve öncelik istekleri sorguya uygulanır
+olcer.adim('not_analizi')
+sorgu, nlp_uyarilari, nottan_gelenler, gecerli_gevsetmeler = nota_gore_sorgu(sorgu, ozel_beklenti)
+for uyari in nlp_uyarilari:
+    st.warning(uyari)
+if gecerli_gevsetmeler:
+    st.caption("Notunuzdaki şu kısıtlar gevşetildi: " + ", ".join(KISIT_ETIKETLERI[alan] for alan in gecerli_gevsetmeler))
+
 # --- KPI METRİKLERİ ---
+olcer.adim('kpi')
 col_kpi1, col_kpi2, col_kpi3 = st.columns(3)
 col_kpi1.metric(
     label="Oluşturulan Kombinasyon Sayısı", 
     value=f"{len(filtreli_df):,}",
-    delta="3x Artış (Donanıma Göre Simülasyon)"
+    delta=f"{len(DONANIM_SEVIYELERI)}x Artış (Donanıma Göre Simülasyon)"
 )
 col_kpi2.metric(
     label="Maksimum Bütçe Sınırı", 
-    value=f"{secilen_fiyat_araligi:,.0f} TL"
+    value=f"{sorgu.butce:,.0f} TL"
 )
 col_kpi3.metric(
     label="Toplam Araç Sayısı (Veri Kaynağı)", 
@@ -322,198 +379,333 @@ col_kpi3.metric(
 st.markdown("---")
 
 
-# Tekli Seçim Filtreleri (Genişletilmiş DF üzerinde)
-filtreli_df = filtreli_df[filtreli_df['fiyat_tl'] <= secilen_fiyat_araligi]
-
-if secilen_marka != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['marka'] == secilen_marka]
-if secilen_model != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['model'] == secilen_model]
-if secilen_motor != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['motor_donanim'] == secilen_motor]
-if secilen_kasa != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['kasa_tipi'] == secilen_kasa]
-if secilen_kullanim != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['kullanim_amaci'].str.contains(secilen_kullanim, case=False, na=False)]
-if secilen_yakit != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['yakit_tipi'] == secilen_yakit]
-if secilen_sanziman != 'Farketmez':
-    filtreli_df = filtreli_df[filtreli_df['sanziman'] == secilen_sanziman]
-    
-# Minimum Skor Filtreleri
-filtreli_df = filtreli_df[filtreli_df['performans_skor'] >= min_performans]
-filtreli_df = filtreli_df[filtreli_df['guvenlik_skor'] >= min_guvenlik]
-# Teknik Filtreler
-filtreli_df = filtreli_df[filtreli_df['beygir_gucu'] >= min_beygir_gucu]
-filtreli_df = filtreli_df[filtreli_df['bagaj_hacmi_lt'] >= min_bagaj_hacmi]
-    
+# Her oturumun kendi artımlı hattı vardır: bir widget değiştiğinde yalnızca o widget'a
+# bağlı aşamalar yeniden hesaplanır (ör. yıllık km → maliyet, adaylar, skorlar, sıralama;
+# karşılaştırma seçimi → hiçbiri). Aynı sorgu başka bir oturumda sorulduysa öneri
+# paylaşılan önbellekten gelir. Önbellekteki DataFrame'ler paylaşıldığı için aşağıda
+# yalnızca kopyaları üzerinde değişiklik yapılır.
+def oturum_hatti():
+    hat = st.session_state.get('boru_hatti')
+    if hat is None or hat.surum != veri_surumu:
+        hat = oneri_hatti(motor, onbellek=anlik.onbellek, surum=veri_surumu)
+        st.session_state['boru_hatti'] = hat
+    return hat
+
+olcer.adim()
+hat = oturum_hatti()
+onerilen_araclar = hat.calistir(sorgu, 'oneri', olcer=olcer)
+hesaplanan_asamalar = hat.hesaplananlar()
+st.caption("Yeniden hesaplanan aşamalar: " + (", ".join(hesaplanan_asamalar) if hesaplanan_asamalar else "yok"))
+
+# --- Kısıt Gevşetme Önerileri ---
+# Sonuç yoksa her aktif kısıtın ihlal maskesi bir kez çıkarılır; tek/çift kısıt
+# kaldırmanın ve en küçük bütçe/eşik değişikliğinin kaç sonuç vereceği bu matristen
+# sayılır. Öneriler widget değerlerini (nottan gelenlerde not gevşetmelerini) değiştirir.
+GEVSETME_HEDEFI = 10
+WIDGET_ANAHTARLARI = {
+    'butce': 'slider_fiyat', 'marka': 'select_marka', 'model': 'select_model', 'motor': 'select_motor',
+    'kasa_tipi': 'select_kasa', 'yakit_tipi': 'select_yakit', 'sanziman': 'select_sanziman',
+    'kullanim_amaci': 'select_kullanim', 'min_performans': 'slider_min_performans',
+    'min_guvenlik': 'slider_min_guvenlik', 'min_beygir_gucu': 'input_min_beygir', 'min_bagaj_hacmi': 'input_min_bagaj',
+}
+# Kısıt kaldırıldığında widget'a ve nota yazılan değerler (seçimlerde FARKETMEZ)
+KISITSIZ_DEGERLER = {'butce': max_fiyat, 'min_performans': 1, 'min_guvenlik': 1, 'min_beygir_gucu': 0, 'min_bagaj_hacmi': 0, 'min_menzil': 0}
+# Eşik önerilerinin oturtulduğu widget adımları
+ESIK_ADIMLARI = {'min_performans': 1, 'min_guvenlik': 1, 'min_beygir_gucu': 10, 'min_bagaj_hacmi': 50, 'min_menzil': 10}
+BIRIMLER = {'butce': ' TL', 'min_beygir_gucu': ' HP', 'min_bagaj_hacmi': ' lt', 'min_menzil': ' km'}
+
+def esigi_yuvarla(alan, deger):
+    if alan == 'butce':
+        return min(max_fiyat, min_fiyat + int(np.ceil((deger - min_fiyat) / 50000)) * 50000)
+    adim = ESIK_ADIMLARI[alan]
+    return int(deger // adim * adim)
+
+def gevsetmeyi_uygula(degisiklikler, gecerli_not, nottan):
+    durum = st.session_state
+    for alan, deger in degisiklikler.items():
+        if alan in WIDGET_ANAHTARLARI:
+            durum[WIDGET_ANAHTARLARI[alan]] = KISITSIZ_DEGERLER.get(alan, FARKETMEZ) if deger is None else deger
+        if alan in nottan:
+            onceki = durum.get('not_gevsetmeleri')
+            degerler = onceki['degerler'] if onceki and onceki['not'] == gecerli_not else {}
+            durum['not_gevsetmeleri'] = {
+                'not': gecerli_not,
+                'degerler': {**degerler, alan: KISITSIZ_DEGERLER.get(alan, FARKETMEZ) if deger is None else deger},
+            }
+    # Marka/model değişince artık seçenekler arasında olmayan alt seçimler sıfırlanır
+    if durum.get('select_model', FARKETMEZ) not in [FARKETMEZ] + secenekler.modeller(durum.get('select_marka', FARKETMEZ)):
+        durum['select_model'] = FARKETMEZ
+    if durum.get('select_motor', FARKETMEZ) not in [FARKETMEZ] + secenekler.motorlar(durum.get('select_marka', FARKETMEZ), durum.get('select_model', FARKETMEZ)):
+        durum['select_motor'] = FARKETMEZ
+
+def kisit_degeri(alan, deger):
+    if alan in ESIK_ADIMLARI or alan == 'butce':
+        return f"{deger:,.0f}{BIRIMLER.get(alan, '')}"
+    return f"'{deger}'"
+
+def oneri_etiketi(oneri):
+    if oneri.tur == 'esik':
+        (alan, deger), = oneri.degisiklikler.items()
+        fiil = "yükseltin" if alan == 'butce' else "düşürün"
+        metin = f"{KISIT_ETIKETLERI[alan]}: {kisit_degeri(alan, getattr(sorgu, alan))} → {kisit_degeri(alan, deger)} olarak {fiil}"
+    else:
+        metin = " ve ".join(
+            f"{KISIT_ETIKETLERI[alan]} ({kisit_degeri(alan, getattr(sorgu, alan))}{', nottan' if alan in nottan_gelenler else ''})"
+            for alan in oneri.degisiklikler
+        ) + (" filtresini" if len(oneri.degisiklikler) == 1 else " filtrelerini") + " kaldırın"
+    return f"{metin} → {oneri.sonuc:,} araç"
 
-if filtreli_df.empty:
+if onerilen_araclar.empty:
     st.header("Seçtiğiniz Kriterlere Uygun Araç Bulunamadı.")
-    st.markdown("Lütfen filtrelerinizi gevşetmeyi veya bütçenizi yükseltmeyi deneyin.")
-    st.stop()
-
-# 2. TOPLAM YILLIK İŞLETME MALİYETİ HESAPLAMA (PHEV ve LPG Desteği Eklendi)
-def hesapla_yakit_maliyeti(row, yillik_km, yakit_fiyat, elektrik_fiyat):
-    
-    # 1. Tam Elektrikli Araçlar
-    if row['yakit_tipi'] == 'Elektrikli':
-        yillik_kwh_tuketim = (yillik_km / 100) * row['tuketim_kwh']
-        return yillik_kwh_tuketim * elektrik_fiyat
-        
-    # 2. Plug-in Hibrit (PHEV) Maliyeti Hesaplama (Elektrikli menzili kullanır)
-    elif row['yakit_tipi'] == 'Plug-in Hibrit':
-        menzil = row['elektrikli_menzil_km']
-        
-        if menzil > 0:
-            # Varsayım: Elektrikli menzili olan araçlar yolun %35'ini elektrikle gidiyor
-            elektrik_km = yillik_km * 0.35 
-            benzin_km = yillik_km * 0.65
-            
-            tuketim_kwh_100km = row['tuketim_kwh'] if row['tuketim_kwh'] > 0 else 15.0 
-            yillik_elektrik_maliyet = (elektrik_km / 100) * tuketim_kwh_100km * elektrik_fiyat
-            
-            yillik_benzin_maliyet = (benzin_km / 100) * row['ortalama_tuketim'] * yakit_fiyat
-            
-            return yillik_elektrik_maliyet + yillik_benzin_maliyet
-        else:
-            # Menzil 0 ise normal benzinli gibi hesapla
-            yillik_tuketim_litre = (yillik_km / 100) * row['ortalama_tuketim']
-            return yillik_tuketim_litre * yakit_fiyat
-
-    # 3. LPG'li Araçlar
-    elif row['yakit_tipi'] == 'LPG':
-        yillik_tuketim_litre = (yillik_km / 100) * row['ortalama_tuketim']
-        lpg_fiyat = yakit_fiyat * 0.70 
-        return yillik_tuketim_litre * lpg_fiyat
-        
-    # 4. Benzin, Dizel, Hibrit (L/100km kullananlar)
+    with olcer.asama('gevsetme', len(motor.indeks)) as gevsetme_olcumu:
+        kisitlar = KisitMatrisi(motor.indeks, sorgu)
+        gevsetme_onerileri = gevsetme_olcumu.cikti(kisitlar.oneriler(GEVSETME_HEDEFI, yuvarla=esigi_yuvarla))
+    if gevsetme_onerileri:
+        st.markdown(f"En az **{GEVSETME_HEDEFI}** sonuç için aşağıdaki değişikliklerden birini tek tıkla uygulayabilirsiniz:")
+        for i, oneri in enumerate(gevsetme_onerileri):
+            st.button(
+                oneri_etiketi(oneri), key=f'gevsetme_{i}', on_click=gevsetmeyi_uygula,
+                args=(oneri.degisiklikler, ozel_beklenti, nottan_gelenler)
+            )
+        with st.expander("Kısıt bazında kalan araç sayıları"):
+            st.dataframe(
+                pd.DataFrame({
+                    'Kısıt': [KISIT_ETIKETLERI[alan] for alan in kisitlar.alanlar],
+                    'Değer': [kisit_degeri(alan, getattr(sorgu, alan)) for alan in kisitlar.alanlar],
+                    'Kaldırılırsa Kalan Araç': [kisitlar.birakinca(alan) for alan in kisitlar.alanlar],
+                }),
+                hide_index=True, use_container_width=True
+            )
     else:
-        yillik_tuketim_litre = (yillik_km / 100) * row['ortalama_tuketim']
-        return yillik_tuketim_litre * yakit_fiyat
-
-filtreli_df['Yillik_Yakit_Maliyeti'] = filtreli_df.apply(
-    lambda row: hesapla_yakit_maliyeti(row, yillik_km, yakit_fiyat_input, elektrik_fiyat_input), axis=1
-)
-
-filtreli_df['Toplam_Isletme_Maliyeti'] = (
-    filtreli_df['Yillik_Yakit_Maliyeti'] + 
-    filtreli_df['yillik_mtv'] + 
-    filtreli_df['yillik_sigorta'] + 
-    filtreli_df['yillik_bakim']
-)
-
-# 3. SKORLAMA MANTIĞI
-filtreli_df['Toplam_Skor'] = 0.0
-
-# Dinamik Performans Skoru Hesaplanması
-max_hizlanma = filtreli_df['hizlanma_0_100s'].replace(0, np.nan).max()
-min_hizlanma = filtreli_df['hizlanma_0_100s'].replace(0, np.nan).min()
-max_tork = filtreli_df['tork_nm'].max()
-
-filtreli_df['Tork_Skor'] = (filtreli_df['tork_nm'] / max_tork) * 5
-filtreli_df.loc[filtreli_df['tork_nm'] == 0, 'Tork_Skor'] = 1 
-
-if max_hizlanma > 0 and min_hizlanma > 0 and max_hizlanma != min_hizlanma:
-    # Hızlanma ters orantılıdır: Düşük saniye = Yüksek Skor
-    filtreli_df['Hizlanma_Skor'] = 5 - (5 * (filtreli_df['hizlanma_0_100s'] - min_hizlanma) / (max_hizlanma - min_hizlanma))
-    filtreli_df.loc[filtreli_df['hizlanma_0_100s'] == 0, 'Hizlanma_Skor'] = 1 
-else:
-    filtreli_df['Hizlanma_Skor'] = 2.5 
-    
-filtreli_df['Hizlanma_Skor'] = np.clip(filtreli_df['Hizlanma_Skor'], 0.5, 5) 
-
-# Performans Skorunun Güncellenmesi (Subjektif + Objektif)
-filtreli_df['Performans_Guncel'] = (filtreli_df['performans_skor'] * 0.5) + ((filtreli_df['Tork_Skor'] + filtreli_df['Hizlanma_Skor']) / 2 * 0.5)
-filtreli_df['Performans_Guncel'] = np.clip(filtreli_df['Performans_Guncel'], 1, 5)
-
-
-# Maliyet Skoru Hesaplaması
-if filtreli_df['Toplam_Isletme_Maliyeti'].max() > 0:
-    max_maliyet = filtreli_df['Toplam_Isletme_Maliyeti'].max()
-    # Maliyet ters orantılıdır: Yüksek maliyet = Düşük Skor
-    filtreli_df['Maliyet_Skor'] = 5 * (1 - (filtreli_df['Toplam_Isletme_Maliyeti'] / max_maliyet))
-    filtreli_df['Maliyet_Skor'] = np.clip(filtreli_df['Maliyet_Skor'], 0, 5) # Skoru 0-5 arasına sınırla
-else:
-    filtreli_df['Maliyet_Skor'] = 2.5
-filtreli_df['Maliyet_Skor'] = filtreli_df['Maliyet_Skor'].fillna(0)
-
-
-# Toplam Skora Ağırlıklandırılmış Puanları Ekle
-filtreli_df['Toplam_Skor'] += filtreli_df['Performans_Guncel'] * onem_performans 
-filtreli_df['Toplam_Skor'] += filtreli_df['ikinci_el_skor'] * onem_ikinci_el
-filtreli_df['Toplam_Skor'] += filtreli_df['guvenlik_skor'] * onem_guvenlik
-filtreli_df['Toplam_Skor'] += filtreli_df['konfor_skor'] * onem_konfor
-filtreli_df['Toplam_Skor'] += filtreli_df['Maliyet_Skor'] * onem_tuketim # Maliyet önemini de ekle
-
-# En iyi 30 aracı seç 
-onerilen_araclar = filtreli_df.sort_values(by='Toplam_Skor', ascending=False).head(30).reset_index(drop=True)
+        st.markdown("Lütfen filtrelerinizi gevşetmeyi veya bütçenizi yükseltmeyi deneyin.")
+    olcumu_bitir()
+    st.stop()
 
 
 # 4. SONUÇLARIN VE GRAFİKLERİN GÖSTERİLMESİ
 st.header(f"Öncelikleriniz Doğrultusunda En İyi {len(onerilen_araclar)} Öneri")
 
 # --- Grafikler ---
+olcer.adim('grafikler', len(onerilen_araclar))
 grafik_araclari = onerilen_araclar.head(10).copy()
-grafik_araclari['Araba'] = grafik_araclari['marka'] + ' ' + grafik_araclari['motor_donanim'] 
+grafik_araclari['Araba'] = grafik_araclari['marka'].astype(str) + ' ' + grafik_araclari['motor_donanim'].astype(str) 
 
 col_grafik1, col_grafik2 = st.columns(2)
 
+# Figürler çizilen veriyle anahtarlanan önbellekten gelir; ilk 10 ve maliyet girdileri
+# değişmedikçe (ör. yalnızca karşılaştırma seçimi değiştiğinde) yeniden kurulmaz
 with col_grafik1:
-    fig_maliyet = px.bar(
-        grafik_araclari, 
-        x='Araba', 
-        y=['fiyat_tl', 'Toplam_Isletme_Maliyeti'], 
-        barmode='group',
-        labels={'value': 'TL', 'variable': 'Maliyet Türü'},
-        title=f'İlk 10 Aracın Satın Alma Fiyatı ve TOPLAM Yıllık İşletme Maliyeti',
-        color_discrete_map={'fiyat_tl': '#1a237e', 'Toplam_Isletme_Maliyeti': '#ff8a65'} # Kurumsal Mavi ve Turuncu Vurgu
-    )
-    st.plotly_chart(fig_maliyet, use_container_width=True)
+    st.plotly_chart(maliyet_grafigi(grafik_araclari), use_container_width=True)
 
 with col_grafik2:
-    radar_df = grafik_araclari.head(3).copy()
-    if len(radar_df) >= 3:
-        radar_data = pd.DataFrame({
-            'Theta': ['Güvenlik', 'Performans', 'Konfor', '2. El Değeri', 'Donanım'],
-            radar_df.iloc[0]['Araba']: [radar_df.iloc[0]['guvenlik_skor'], radar_df.iloc[0]['Performans_Guncel'], radar_df.iloc[0]['konfor_skor'], radar_df.iloc[0]['ikinci_el_skor'], radar_df.iloc[0]['donanim_skor']],
-            radar_df.iloc[1]['Araba']: [radar_df.iloc[1]['guvenlik_skor'], radar_df.iloc[1]['Performans_Guncel'], radar_df.iloc[1]['konfor_skor'], radar_df.iloc[1]['ikinci_el_skor'], radar_df.iloc[1]['donanim_skor']],
-            radar_df.iloc[2]['Araba']: [radar_df.iloc[2]['guvenlik_skor'], radar_df.iloc[2]['Performans_Guncel'], radar_df.iloc[2]['konfor_skor'], radar_df.iloc[2]['ikinci_el_skor'], radar_df.iloc[2]['donanim_skor']]
-        }).melt(id_vars='Theta', var_name='Araç', value_name='Skor')
-        
-        fig_radar = px.line_polar(
-            radar_data, r='Skor', theta='Theta', color='Araç', line_close=True, range_r=[0, 5],
-            title="İlk 3 Aracın Detaylı Skor Karşılaştırması (5 Üzerinden)"
-        )
-        st.plotly_chart(fig_radar, use_container_width=True)
+    if len(grafik_araclari) >= 3:
+        st.plotly_chart(radar_grafigi(grafik_araclari.head(3)), use_container_width=True)
     else:
           st.info("Radar grafiği için en az 3 araç önerisi gereklidir.")
 
 
-# Karşılaştırma Tablosu
-st.subheader("Nihai Karşılaştırma Tablosu (En İyi 30)")
-gosterilecek_sutunlar = [
-    'marka', 'model', 'motor_donanim', 'fiyat_tl', 'Toplam_Isletme_Maliyeti', 'Yillik_Yakit_Maliyeti', 'yakit_tipi', 'sanziman', 
-    'tork_nm', 'hizlanma_0_100s', 'elektrikli_menzil_km', 'bagaj_hacmi_lt',
-    'guvenlik_skor', 'Performans_Guncel', 'ikinci_el_skor' 
-]
+# --- Sıralama Kararlılığı ---
+# Kaydırıcıların alabileceği tüm ağırlık kombinasyonları (5^5) için ilk 10 tek seferde
+# hesaplanır: önerilerin ağırlıklara ne kadar bağlı olduğu ve 1. öneriyi değiştiren en
+# küçük ağırlık değişikliği. Ağırlık değiştirmek analizi yeniden hesaplatmaz.
+olcer.adim('kararlilik_gosterim')
+KARARLILIK_TABLO_SINIRI = 15
+st.subheader("Sıralama Kararlılığı: Ağırlıklar Değişirse Öneriler Değişir mi?")
+duyarlilik, aday_kumesi, sirali = hat.calistir(sorgu, 'duyarlilik', 'adaylar', 'siralama', olcer=olcer)
+mevcut_agirliklar = sorgu.agirliklar()
+birinci = int(sirali.ilk(1)[0])
+oranlar = duyarlilik.oranlar()
+degisim = duyarlilik.en_yakin_degisim(mevcut_agirliklar, birinci)
+
+def arac_adi(konum):
+    arac = aday_kumesi.df.iloc[konum]
+    return f"{arac['marka']} {arac['motor_donanim']}"
+
+col_kararlilik1, col_kararlilik2, col_kararlilik3 = st.columns(3)
+col_kararlilik1.metric(
+    "1. Önerinin İlk Sırada Kaldığı Ağırlık Kombinasyonu",
+    f"%{100 * oranlar['Ilk_1'].get(birinci, 0):.1f}"
+)
+col_kararlilik2.metric("En Az 1 Kez 1. Olan Araç", f"{len(duyarlilik.birinci_olma_adimi(mevcut_agirliklar))}")
+col_kararlilik3.metric("1. Öneriyi Değiştiren En Küçük Değişiklik", f"{degisim[1]} adım" if degisim else "Yok")
+if degisim:
+    yeni_agirliklar, _, yeni_birinci = degisim
+    degisiklikler = ", ".join(
+        f"**{AGIRLIK_ETIKETLERI[alan]}** {eski:.0f} → {yeni:.0f}"
+        for alan, eski, yeni in zip(AGIRLIK_ALANLARI, mevcut_agirliklar, yeni_agirliklar) if eski != yeni
+    )
+    st.markdown(f"{degisiklikler} yapılırsa 1. öneri **{arac_adi(birinci)}** yerine **{arac_adi(yeni_birinci)}** olur.")
+else:
+    st.markdown(f"**{arac_adi(birinci)}** tüm ağırlık kombinasyonlarında 1. sırada kalıyor.")
+
+kararlilik_konumlari = oranlar.index.to_numpy()[:KARARLILIK_TABLO_SINIRI]
+birinci_olma = duyarlilik.birinci_olma_adimi(mevcut_agirliklar)
+kararlilik_tablosu = aday_kumesi.df.iloc[kararlilik_konumlari][['marka', 'model', 'motor_donanim', 'fiyat_tl']].assign(
+    Mevcut_Sira=[sirali.sira(konum) for konum in kararlilik_konumlari],
+    **{sutun: 100 * oranlar[sutun].to_numpy()[:KARARLILIK_TABLO_SINIRI] for sutun in oranlar.columns},
+    Birinci_Olma_Adimi=birinci_olma.reindex(kararlilik_konumlari).to_numpy(),
+)
+st.dataframe(
+    kararlilik_tablosu,
+    column_config={
+        "marka": "Marka", "model": "Model", "motor_donanim": "Motor / Donanım",
+        "fiyat_tl": st.column_config.NumberColumn("Fiyat (TL)", format="%.0f"),
+        "Mevcut_Sira": st.column_config.NumberColumn("Mevcut Sıra", format="%d"),
+        **{
+            sutun: st.column_config.ProgressColumn(f"İlk {sutun.split('_')[1]} (%)", format="%.1f", min_value=0, max_value=100)
+            for sutun in oranlar.columns
+        },
+        "Birinci_Olma_Adimi": st.column_config.NumberColumn(
+            "1. Olması İçin Gereken Adım", format="%d",
+            help="1. sıraya çıkması için ağırlık kaydırıcılarında gereken en az toplam adım (boşsa hiçbir kombinasyonda 1. olmuyor)"
+        ),
+    },
+    hide_index=True,
+    use_container_width=True
+)
+st.caption(
+    f"{len(duyarlilik.izgara):,} ağırlık kombinasyonu × {len(aday_kumesi.df):,} aday. Oranlar, aracın ilgili "
+    "sıralara girdiği kombinasyonların payıdır; \"Sonuçlardan Memnun Kalmadım\" düğmesi bunlardan birine geçer."
+)
 
-karsilastirma_df = onerilen_araclar[gosterilecek_sutunlar].set_index(['marka', 'model', 'motor_donanim'])
 
-karsilastirma_df.columns = [
-    'Fiyat (TL)', 'TOPLAM İşletme Maliyeti (Yıllık, TL)', 'Yıllık Yakıt Maliyeti (TL)', 'Yakıt Tipi', 'Şanzıman', 
-    'Tork (Nm)', '0-100 (s)', 'E-Menzil (km)', 'Bagaj Hacmi (lt)',
-    'Güvenlik Puanı (5)', 'Performans Puanı (5)', '2. El Değeri Puanı (5)'
-]
+# --- Pareto Cephesi ---
+# Tek bir Toplam Skor yerine: seçilen boyutların hiçbirinde başka bir aday tarafından
+# geçilemeyen araçlar. Filtrelenmiş tüm adaylar üzerinde hesaplanır.
+olcer.adim('pareto_gosterim')
+PARETO_TABLO_SINIRI = 200
+st.subheader("Pareto Cephesi: Hiçbir Açıdan Geçilemeyen Araçlar")
+pareto_boyutlari = st.multiselect(
+    "Karşılaştırma boyutları:",
+    list(PARETO_YONLERI),
+    default=list(VARSAYILAN_BOYUTLAR),
+    format_func=lambda col: f"{PARETO_ETIKETLERI[col]} ({'düşük' if PARETO_YONLERI[col] == 'min' else 'yüksek'} iyi)",
+    key='pareto_boyutlari'
+)
+pareto_df, pareto_ornek, aday_sayisi = hat.calistir(sorgu, 'pareto', olcer=olcer, pareto_boyutlari=tuple(pareto_boyutlari))
+olcer.adim('pareto_gosterim', len(pareto_df))
+
+if pareto_boyutlari:
+    eksen_x = pareto_boyutlari[0]
+    eksen_y = pareto_boyutlari[1] if len(pareto_boyutlari) > 1 else 'Toplam_Skor'
+    dagilim = pd.concat([
+        pareto_ornek.assign(Grup='Diğer adaylar'),
+        pareto_df.assign(Grup='Pareto cephesi'),
+    ])
+    col_pareto1, col_pareto2 = st.columns(2)
+    with col_pareto1:
+        fig_pareto = pareto_grafigi(dagilim, eksen_x, eksen_y, f"{len(pareto_df):,} Pareto-optimal araç / {aday_sayisi:,} aday")
+        st.plotly_chart(fig_pareto, use_container_width=True)
+    with col_pareto2:
+        pareto_tablo = pareto_df[['marka', 'model', 'motor_donanim', *pareto_boyutlari]].head(PARETO_TABLO_SINIRI)
+        st.dataframe(
+            pareto_tablo.rename(columns=PARETO_ETIKETLERI).set_index(['marka', 'model', 'motor_donanim']),
+            use_container_width=True
+        )
+        if len(pareto_df) > PARETO_TABLO_SINIRI:
+            st.caption(f"Cephedeki {len(pareto_df):,} aracın ilk {PARETO_TABLO_SINIRI} tanesi gösteriliyor.")
+else:
+    st.info("Pareto cephesi için en az bir boyut seçin.")
+
+
+# --- Çok Yıllık Sahip Olma Maliyeti (TCO) ---
+# Alış fiyatı − ikinci el değeri + MTV/sigorta/bakım + Monte Carlo yakıt/elektrik fiyat
+# senaryolarıyla enerji maliyeti. Bantlar senaryoların P10–P90 aralığıdır.
+olcer.adim('tco_gosterim')
+TCO_ARAC_SAYISI = 10
+TCO_GRAFIK_SAYISI = 5
+st.subheader("Çok Yıllık Toplam Sahip Olma Maliyeti (TCO)")
+with st.expander("Senaryo varsayımları", expanded=False):
+    col_tco1, col_tco2, col_tco3 = st.columns(3)
+    with col_tco1:
+        tco_yil = st.slider("Kullanım süresi (yıl):", 1, 10, 5, key='tco_yil')
+        tco_senaryo = st.selectbox("Senaryo sayısı:", [500, 1000, 2000, 5000], index=2, key='tco_senaryo')
+    with col_tco2:
+        tco_yakit_artis = st.number_input("Yakıt fiyatı yıllık artış (%):", 0.0, 100.0, 25.0, step=5.0, key='tco_yakit_artis')
+        tco_elektrik_artis = st.number_input("Elektrik fiyatı yıllık artış (%):", 0.0, 100.0, 25.0, step=5.0, key='tco_elektrik_artis')
+    with col_tco3:
+        tco_oynaklik = st.number_input("Fiyat oynaklığı (%):", 0.0, 60.0, 15.0, step=5.0, key='tco_oynaklik')
+        tco_enflasyon = st.number_input("MTV/sigorta/bakım yıllık artış (%):", 0.0, 100.0, 25.0, step=5.0, key='tco_enflasyon')
+tco_varsayimlari = TcoVarsayimlari(
+    yil=tco_yil, senaryo=tco_senaryo, yakit_artis=tco_yakit_artis / 100, elektrik_artis=tco_elektrik_artis / 100,
+    oynaklik=tco_oynaklik / 100, enflasyon=tco_enflasyon / 100
+)
+tco, tco_oneri_konumlari, tco_aday_konumlari = hat.calistir(
+    sorgu, 'tco', 'oneri_konumlari', 'satirlar', olcer=olcer, tco_varsayimlari=tco_varsayimlari
+)
 
-karsilastirma_df['Fiyat (TL)'] = karsilastirma_df['Fiyat (TL)'].apply(lambda x: f"{x:,.0f} TL")
-karsilastirma_df['TOPLAM İşletme Maliyeti (Yıllık, TL)'] = karsilastirma_df['TOPLAM İşletme Maliyeti (Yıllık, TL)'].apply(lambda x: f"{x:,.0f} TL")
-karsilastirma_df['Yıllık Yakıt Maliyeti (TL)'] = karsilastirma_df['Yıllık Yakıt Maliyeti (TL)'].apply(lambda x: f"{x:,.0f} TL")
+def tco_tablosu(konumlar):
+    return pd.concat([
+        motor.genis.iloc[konumlar][['marka', 'model', 'motor_donanim', 'yakit_tipi', 'fiyat_tl']].reset_index(drop=True),
+        tco.ozet(konumlar=konumlar),
+    ], axis=1)
+
+tco_sutunlari = {
+    "marka": "Marka", "model": "Model", "motor_donanim": "Motor / Donanım", "yakit_tipi": "Yakıt Tipi",
+    "fiyat_tl": st.column_config.NumberColumn("Fiyat (TL)", format="%.0f"),
+    "TCO_P10": st.column_config.NumberColumn(f"{tco_yil} Yıl TCO P10 (TL)", format="%.0f"),
+    "TCO_Medyan": st.column_config.NumberColumn(f"{tco_yil} Yıl TCO Medyan (TL)", format="%.0f"),
+    "TCO_P90": st.column_config.NumberColumn(f"{tco_yil} Yıl TCO P90 (TL)", format="%.0f"),
+}
+col_tco_grafik, col_tco_tablo = st.columns(2)
+with col_tco_grafik:
+    grafik_konumlari = tco_oneri_konumlari[:TCO_GRAFIK_SAYISI]
+    p10, medyan, p90 = tco.egriler(grafik_konumlari)
+    tco_egrileri = pd.DataFrame({
+        'Araç': np.repeat((motor.genis['marka'].astype(str) + ' ' + motor.genis['motor_donanim'].astype(str)).iloc[grafik_konumlari].to_numpy(), tco_yil),
+        'Yıl': np.tile(tco.yillar, len(grafik_konumlari)),
+        'Medyan': medyan.ravel(), 'P10': p10.ravel(), 'P90': p90.ravel(),
+    })
+    fig_tco = tco_grafigi(tco_egrileri, f"İlk {len(grafik_konumlari)} Önerinin Kümülatif TCO'su (medyan, P10–P90)")
+    st.plotly_chart(fig_tco, use_container_width=True)
+with col_tco_tablo:
+    st.markdown(f"**En İyi {min(TCO_ARAC_SAYISI, len(tco_oneri_konumlari))} Öneri**")
+    st.dataframe(tco_tablosu(tco_oneri_konumlari[:TCO_ARAC_SAYISI]), column_config=tco_sutunlari, hide_index=True, use_container_width=True)
+    # Tüm filtrelenmiş adaylar arasında medyan TCO'su en düşük olanlar
+    aday_medyan = tco.ozet(konumlar=tco_aday_konumlari)['TCO_Medyan'].to_numpy()
+    en_ucuzlar = tco_aday_konumlari[en_iyiler(-aday_medyan, TCO_ARAC_SAYISI)]
+    st.markdown(f"**{len(tco_aday_konumlari):,} Aday Arasında En Düşük Medyan TCO**")
+    st.dataframe(tco_tablosu(en_ucuzlar), column_config=tco_sutunlari, hide_index=True, use_container_width=True)
+st.caption(
+    f"{tco_senaryo:,} fiyat senaryosu. İkinci el değeri 2. el skoruna göre yıllık "
+    f"%8–%20 değer kaybıyla hesaplanır; TCO = alış − {tco_yil}. yıl sonu ikinci el değeri + giderler."
+)
 
-st.dataframe(karsilastirma_df, use_container_width=True)
+
+# Karşılaştırma Tablosu
+# Tüm sıralı aday listesi sayfalanır; tarayıcıya yalnızca görünen sayfa gönderilir.
+# Sayılar sayısal kalır (sıralanabilir), biçimlendirme sütun ayarlarıyla yapılır.
+olcer.adim('tablo_gosterim')
+st.subheader("Nihai Karşılaştırma Tablosu (Tüm Adaylar, Skor Sırasıyla)")
+toplam_aday = len(hat.calistir(sorgu, 'adaylar').df)
+col_sayfa1, col_sayfa2 = st.columns([1, 3])
+with col_sayfa1:
+    sayfa_boyutu = st.selectbox("Sayfa başına araç:", [30, 50, 100], key='tablo_sayfa_boyutu')
+toplam_sayfa = max(1, -(-toplam_aday // sayfa_boyutu))
+# Filtreler daralınca sayfa numarası yeni sayfa sayısına çekilir
+if st.session_state.get('tablo_sayfa', 1) > toplam_sayfa:
+    st.session_state['tablo_sayfa'] = toplam_sayfa
+with col_sayfa2:
+    sayfa_no = st.number_input(f"Sayfa (1-{toplam_sayfa:,}):", min_value=1, max_value=toplam_sayfa, value=1, step=1, key='tablo_sayfa')
+karsilastirma_df = hat.calistir(sorgu, 'tablo', olcer=olcer, sayfa_no=sayfa_no - 1, sayfa_boyutu=sayfa_boyutu)
+olcer.cikti(karsilastirma_df)
+
+st.dataframe(
+    karsilastirma_df,
+    column_config={
+        SIRA_SUTUNU: st.column_config.NumberColumn(SIRA_SUTUNU, format="%d"),
+        SKOR_SUTUNU: st.column_config.NumberColumn(SKOR_SUTUNU, format="%.3f"),
+        **{col: st.column_config.NumberColumn(col, format="%,.0f TL") for col in TL_SUTUNLARI},
+    },
+    use_container_width=True
+)
+sayfa_basi = (sayfa_no - 1) * sayfa_boyutu
+st.caption(f"{toplam_aday:,} adaydan {sayfa_basi + 1:,}–{sayfa_basi + len(karsilastirma_df):,}. sıralar gösteriliyor.")
 
 
 # --- 6. İki Aracı Yan Yana Karşılaştırma Modu (YENİ) ---
+olcer.adim('yan_yana', len(onerilen_araclar))
+BENZER_ARAC_SAYISI = 5
 st.subheader("Seçili Araçları Yan Yana Karşılaştırın")
 
 # Checkbox'ları eklemek için yeni bir Dataframe oluştur
@@ -543,8 +735,9 @@ secilen_araclar = secim_tablosu[secim_tablosu.Seç]
 if len(secilen_araclar) > 0:
     st.markdown("### 🔍 Detaylı Karşılaştırma Raporu")
     
-    # Karşılaştırma için detaylı DF oluştur
-    detay_karsilastirma = secilen_araclar.copy()
+    # Karşılaştırma için detaylı DF oluştur (editördeki satırların tüm sütunları önerilerden alınır;
+    # editörde elle eklenen satırların karşılığı yoktur)
+    detay_karsilastirma = onerilen_araclar.loc[[i for i in secilen_araclar.index if i in onerilen_araclar.index]]
     
     # Sadece 3 araçla sınırlama
     if len(detay_karsilastirma) > 3:
@@ -571,20 +764,55 @@ if len(secilen_araclar) > 0:
         'Performans (1-5)', 'Konfor (1-5)', '2. El (1-5)'
     ]
     
-    # Finansal değerleri formatla
-    try:
-        detay_df.loc['Fiyat (TL)'] = detay_df.loc['Fiyat (TL)'].apply(lambda x: f"{x:,.0f} TL")
-        detay_df.loc['Yıllık İşletme Maliyeti (TL)'] = detay_df.loc['Yıllık İşletme Maliyeti (TL)'].apply(lambda x: f"{x:,.0f} TL")
-    except Exception:
-        pass # Hata olursa formatlama yapmaz
+    # Finansal değerler yalnızca gösterimde biçimlendirilir (veri sayısal kalır)
+    detay_stili = detay_df.style.format("{:,.0f} TL", subset=pd.IndexSlice[['Fiyat (TL)', 'Yıllık İşletme Maliyeti (TL)'], :])
+    st.dataframe(detay_stili, use_container_width=True)
+
+    # --- Benzer Alternatifler ---
+    # Seçili araçlara teknik özellik ve skorlarca en yakın araçlar tüm katalogdan aranır.
+    # Bütçe, kasa/yakıt tipi ve eşikler geçerlidir; farklı markalardan da alternatif
+    # çıkabilmesi için marka/model/motor seçimleri gevşetilir.
+    st.markdown("### 🔁 Benzer Alternatifler")
+    farkli_model = st.checkbox("Aynı modelin diğer donanımlarını gösterme", value=True, key='benzer_farkli_model')
+    benzerlik = anlik.benzerlik
+    benzer_adaylar = motor.indeks.satirlar(**replace(sorgu, marka=FARKETMEZ, model=FARKETMEZ, motor=FARKETMEZ).kisitlar())
+    secilen_konumlar = hat.calistir(sorgu, 'oneri_konumlari')[detay_karsilastirma.index.to_numpy()]
+    komsu_konumlari, komsu_uzakliklari = benzerlik.komsular(
+        secilen_konumlar, BENZER_ARAC_SAYISI, adaylar=benzer_adaylar, farkli_model=farkli_model
+    )
+    _, toplam_maliyet = hat.calistir(sorgu, 'maliyet')
+
+    for (_, arac), konumlar, uzakliklar in zip(detay_karsilastirma.iterrows(), komsu_konumlari, komsu_uzakliklari):
+        gecerli = konumlar >= 0
+        konumlar, uzakliklar = konumlar[gecerli], uzakliklar[gecerli]
+        st.markdown(f"**{arac['marka']} {arac['motor_donanim']}** aracına en çok benzeyenler:")
+        if len(konumlar) == 0:
+            st.info("Aktif filtrelerle benzer araç bulunamadı.")
+            continue
+        benzerler = motor.genis.iloc[konumlar][['marka', 'model', 'motor_donanim', 'yakit_tipi', 'fiyat_tl']].assign(
+            Toplam_Isletme_Maliyeti=toplam_maliyet[konumlar],
+            Fiyat_Farki=motor.genis['fiyat_tl'].to_numpy()[konumlar] - arac['fiyat_tl'],
+            Benzerlik=100 / (1 + uzakliklar),
+        )
+        st.dataframe(
+            benzerler,
+            column_config={
+                "marka": "Marka", "model": "Model", "motor_donanim": "Motor / Donanım", "yakit_tipi": "Yakıt Tipi",
+                "fiyat_tl": st.column_config.NumberColumn("Fiyat (TL)", format="%.0f"),
+                "Toplam_Isletme_Maliyeti": st.column_config.NumberColumn("Yıllık Maliyet (TL)", format="%.0f"),
+                "Fiyat_Farki": st.column_config.NumberColumn("Fiyat Farkı (TL)", format="%+.0f"),
+                "Benzerlik": st.column_config.ProgressColumn("Benzerlik", format="%.0f", min_value=0, max_value=100),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
 
-    st.dataframe(detay_df, use_container_width=True)
-    
 else:
     st.info("Lütfen yukarıdaki tablodan karşılaştırmak istediğiniz araçları işaretleyin.")
 
 
 # 5. AKILLI ANALİZ RAPORU
+olcer.adim('analiz_raporu')
 st.header("Sistem Analiz Raporu")
 
 if ozel_beklenti:
@@ -609,6 +837,8 @@ if ozel_beklenti:
 else:
     st.info("5. bölüme serbest metin girişi yaparak (Kişisel Analiz Notu) sistemden daha kişiselleştirilmiş, metinsel bir analiz alabilir ve metin içindeki bütçe/kasa tipi/yakıt tipi gibi anahtar kelimelerle filtreleri otomatik olarak ayarlayabilirsiniz.")
 
+olcumu_bitir()
+
 
 if __name__ == "__main__":
     pass